@@ -4,7 +4,7 @@ automate.py
 
 This file handles:
 1) Sprint #3: Generating many 15-puzzle scenarios (or reading them from scenarios.csv),
-   running each puzzle with A* using each of the four heuristics (h1..h4),
+   running each puzzle with A* using each of the heuristics (h1..h6),
    and recording metrics (solution depth, expanded nodes, fringe size, execution time).
    Aggregated averages are then printed.
 
@@ -12,21 +12,34 @@ We mark changes with the required special comment blocks.
 """
 
 import csv
-import time
+import functools
+import batch
 import search
 from fifteenpuzzle import (
-    FifteenPuzzleState,
-    FifteenPuzzleSearchProblem,
     createRandomFifteenPuzzle,
+    iterRandomSolvablePuzzles,
+    writeScenarioFile,
     h1_misplacedTiles,
     h2_euclideanDistance,
     h3_manhattanDistance,
-    h4_rowColDifference
+    h4_rowColDifference,
+    h5_linearConflict,
+    h6_walkingDistance
 )
 
 ##############################
 # /*=====Start Change Task 3=====*/
 ##############################
+
+# The heuristics compared in Sprint #3, also used by the benchmark suite.
+HEURISTICS = [
+    (h1_misplacedTiles, "Misplaced Tiles"),
+    (h2_euclideanDistance, "Euclidean Distance"),
+    (h3_manhattanDistance, "Manhattan Distance"),
+    (h4_rowColDifference, "Row/Col Difference"),
+    (h5_linearConflict, "Linear Conflict"),
+    (h6_walkingDistance, "Walking Distance")
+]
 def generateScenariosCSV(filename="scenarios.csv", count=10, shuffle=20):
     """
     (Sprint #3)
@@ -40,77 +53,57 @@ def generateScenariosCSV(filename="scenarios.csv", count=10, shuffle=20):
         writer = csv.writer(fout)
         for _ in range(count):
             puzzle = createRandomFifteenPuzzle(shuffle)
-            flat = [cell for row in puzzle.cells for cell in row]
+            flat = puzzle.tiles()
             writer.writerow(flat)
 
-def runHeuristicsOnScenarios(filename="scenarios.csv"):
+def generateUniformScenarios(filename="scenarios.bin", count=1000, seed=None):
+    """
+    Writes 'count' boards drawn uniformly from all solvable 15-puzzle states.
+    The file is binary (8 bytes per state) unless the name ends in .csv.
+    Boards are streamed, so millions of instances need no extra memory.
+
+    Uniform instances average around 53 moves, far deeper than random walks.
+    """
+    writeScenarioFile(filename, iterRandomSolvablePuzzles(count, seed))
+
+def runHeuristicsOnScenarios(filename="scenarios.csv", searchFn=search.aStarSearch,
+                             workers=None, resultsFile=None, timeout=None, nodeBudget=None,
+                             stateBudget=None, cacheFile=None, profile=False):
     """
     (Sprint #3)
-    Reads each puzzle scenario from 'filename'. For each scenario, runs A* with each of
-    the four heuristics, and records:
+    Reads each puzzle scenario from 'filename' (CSV or binary). For each scenario, runs 'searchFn'
+    (A* by default, or e.g. search.idaStarSearch) with each of the heuristics,
+    and records:
       - The solution depth (length of the path),
       - The number of nodes expanded,
       - The maximum fringe size, and
       - The execution time.
     Aggregates results and prints a summary table.
 
+    The runs are spread over 'workers' processes by batch.runBatch, which also
+    passes the per-run time, node and stored-state limits to the search, and
+    streams results to 'resultsFile' so an interrupted run can be resumed.
+    A 'cacheFile' (cache.py) answers scenarios already solved optimally by an
+    earlier run; the report shows the cache hit rate. profile=True adds a
+    per-heuristic breakdown of search time by phase (search.SearchTracer).
+
     Because all heuristics are admissible, solution depth will be the same for each puzzle.
     The differences show up in expansions, fringe, or time.
     """
-    heuristics = [
-        (h1_misplacedTiles, "Misplaced Tiles"),
-        (h2_euclideanDistance, "Euclidean Distance"),
-        (h3_manhattanDistance, "Manhattan Distance"),
-        (h4_rowColDifference, "Row/Col Difference")
-    ]
-    
-    stats = {name: {"count": 0, "sumDepth": 0, "sumTime": 0.0, 
-                    "sumExp": 0, "sumFringe": 0} for (_, name) in heuristics}
-    
-    with open(filename, "r") as fin:
-        reader = csv.reader(fin)
-        scenario_num = 0
-        for row in reader:
-            scenario_num += 1
-            tiles = [int(x) for x in row]
-            puzzleState = FifteenPuzzleState(tiles)
-            
-            print(f"\nScenario #{scenario_num}, puzzle:")
-            print(puzzleState)
-            
-            for (heur_fn, heur_name) in heuristics:
-                problem = FifteenPuzzleSearchProblem(puzzleState)
-                
-                start_time = time.time()
-                path = search.aStarSearch(problem, heuristic=heur_fn)
-                elapsed = time.time() - start_time
-                
-                if path is None or len(path) == 0:
-                    print(f"  {heur_name}: No solution found or zero moves.")
-                else:
-                    depth = len(path)
-                    expanded = problem.expanded_nodes
-                    fringe = problem.max_fringe
-                    print(f"  {heur_name}: depth={depth}, expansions={expanded}, fringe={fringe}, time={elapsed:.3f}s")
-                    
-                    # Accumulate stats
-                    stats[heur_name]["count"] += 1
-                    stats[heur_name]["sumDepth"] += depth
-                    stats[heur_name]["sumTime"] += elapsed
-                    stats[heur_name]["sumExp"] += expanded
-                    stats[heur_name]["sumFringe"] += fringe
+    heuristics = HEURISTICS
+    strategies = [(functools.partial(searchFn, heuristic=heur_fn), heur_name)
+                  for (heur_fn, heur_name) in heuristics]
+
+    def report(result):
+        print(f"Scenario #{result['scenario']}, {batch.formatResult(result)}")
 
-    print("\n=== Sprint #3: Aggregated Heuristic Results ===")
-    for (_, heur_name) in heuristics:
-        c = stats[heur_name]["count"]
-        if c == 0:
-            print(f" {heur_name}: No solutions found.")
-        else:
-            avg_depth = stats[heur_name]["sumDepth"] / c
-            avg_time = stats[heur_name]["sumTime"] / c
-            avg_exp = stats[heur_name]["sumExp"] / c
-            avg_fringe = stats[heur_name]["sumFringe"] / c
-            print(f" {heur_name}: #Solved={c}, avgDepth={avg_depth:.2f}, avgTime={avg_time:.3f}s, avgExp={avg_exp:.1f}, avgFringe={avg_fringe:.1f}")
+    results = batch.runBatch(filename, strategies, workers=workers, resultsFile=resultsFile,
+                             timeout=timeout, nodeBudget=nodeBudget, stateBudget=stateBudget,
+                             onResult=report, cacheFile=cacheFile, profile=profile)
+    batch.printAggregatedResults("Sprint #3: Aggregated Heuristic Results", results,
+                                 [name for (_, name) in heuristics])
+    if profile:
+        batch.printProfileBreakdown("Sprint #3", results, [name for (_, name) in heuristics])
 ##############################
 # /*=====End Change Task 3=====*/
 ##############################
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+batch.py
+
+Parallel, resumable batch execution for the scenario comparisons in
+automate.py and comp.py.
+
+Every (scenario, strategy) pair is one job, run in a process pool. Each
+job can be limited by wall-clock time, expanded nodes and stored states;
+the limits are handed to the search, which stops cleanly. A job that does
+not return within twice its time limit (plus HARD_TIMEOUT_GRACE seconds),
+e.g. stuck in a heuristic call that never checks the limits, is cut off
+by SIGALRM in the worker where that is available. Results are
+appended to a JSON-lines file as soon as each job finishes, and a re-run
+with the same file skips the pairs that already have a result.
+
+Strategies are (function, name) pairs; the functions are sent to the
+worker processes, so they must be module-level functions or
+functools.partial objects wrapping them, and accept the search.py limit
+keywords maxNodes, maxTime and maxStates (and tracer when profiling).
+
+With a cacheFile (see cache.py), jobs whose start state has a cached
+optimal solution are answered from it. Optimal solutions found by the
+batch are added to the file when it ends, so they serve the next run.
+
+With profile=True each record carries a search.SearchTracer report (phase
+times and counters), and traceDir adds a sampled JSON-lines trace per job.
+"""
+
+import json
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import search
+from cache import SolutionCache
+from fifteenpuzzle import FifteenPuzzleState, FifteenPuzzleSearchProblem, readScenarioFile
+
+STATUS_SOLVED = "solved"
+STATUS_UNSOLVED = "no solution"
+STATUS_TIMEOUT = "timeout"
+STATUS_NODE_BUDGET = "node budget"
+STATUS_STATE_BUDGET = "state budget"
+STATUS_MEMORY_BUDGET = "memory budget"
+STATUS_BUDGET = "budget exceeded"
+
+# SearchResult.limit -> batch status; other limits map to STATUS_BUDGET
+_LIMIT_STATUS = {
+    "time": STATUS_TIMEOUT,
+    "nodes": STATUS_NODE_BUDGET,
+    "states": STATUS_STATE_BUDGET,
+    "memory": STATUS_MEMORY_BUDGET,
+}
+
+# Extra seconds, on top of twice the time limit, before a job is cut off
+HARD_TIMEOUT_GRACE = 1.0
+
+class JobTimeout(Exception):
+    pass
+
+def _raiseTimeout(signum, frame):
+    raise JobTimeout()
+
+# Solution caches loaded by this worker process: filename -> SolutionCache
+_workerCaches = {}
+
+def _workerCache(cacheFile):
+    if cacheFile not in _workerCaches:
+        _workerCaches[cacheFile] = SolutionCache(cacheFile)
+    return _workerCaches[cacheFile]
+
+def runJob(strategy, name, scenario, tiles, timeout=None, nodeBudget=None, stateBudget=None,
+           cacheFile=None, profile=False, traceFile=None, sampleEvery=1000):
+    """
+    Solves one scenario with one strategy and returns a result record:
+    scenario, strategy, tiles, status, depth, expanded, fringe, stored (peak
+    states held in memory), time, and for stopped runs the search's lower
+    bound on the depth.
+
+    With a cacheFile the record also has "cached" (answered from the
+    cache) and, for new optimal solutions, "actions" for runBatch to store.
+    With profile or a traceFile the search runs under a SearchTracer and
+    the record has its report under "profile". The SIGALRM backstop (see
+    the module docstring) reports a cut-off job as a timeout.
+    """
+    state = FifteenPuzzleState(tiles)
+    problem = FifteenPuzzleSearchProblem(state)
+    cached = None
+    tracer = None
+    start_time = time.time()
+    if cacheFile is not None:
+        cached = _workerCache(cacheFile).lookup(state)
+    if cached is not None:
+        path = search.SearchResult(cached, search.SOLVED, optimal=True)
+    else:
+        limits = {"maxNodes": nodeBudget, "maxTime": timeout, "maxStates": stateBudget}
+        use_alarm = timeout is not None and hasattr(signal, "setitimer")
+        if use_alarm:
+            previous = signal.signal(signal.SIGALRM, _raiseTimeout)
+            signal.setitimer(signal.ITIMER_REAL, 2 * timeout + HARD_TIMEOUT_GRACE)
+        try:
+            if profile or traceFile is not None:
+                tracer = search.SearchTracer(traceFile, sampleEvery)
+                try:
+                    path = strategy(problem, tracer=tracer, **limits)
+                finally:
+                    tracer.close()
+            else:
+                path = strategy(problem, **limits)
+        except JobTimeout:
+            path = search.SearchResult([], search.BUDGET_EXHAUSTED, "time")
+        finally:
+            if use_alarm:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+                signal.signal(signal.SIGALRM, previous)
+    elapsed = time.time() - start_time
+
+    status = getattr(path, "status", search.SOLVED if path else search.UNSOLVABLE)
+    if status == search.SOLVED:
+        status = STATUS_SOLVED
+    elif status == search.BUDGET_EXHAUSTED:
+        status = _LIMIT_STATUS.get(getattr(path, "limit", None), STATUS_BUDGET)
+    else:
+        status = STATUS_UNSOLVED
+    record = {
+        "scenario": scenario,
+        "strategy": name,
+        "tiles": list(tiles),
+        "status": status,
+        "depth": len(path) if status == STATUS_SOLVED else None,
+        "bound": getattr(path, "bound", None),
+        "expanded": problem.expanded_nodes,
+        "fringe": problem.max_fringe,
+        "stored": getattr(path, "stored", None),
+        "time": elapsed,
+    }
+    if tracer is not None:
+        record["profile"] = tracer.report()
+    if cacheFile is not None:
+        record["cached"] = cached is not None
+        if cached is None and status == STATUS_SOLVED and getattr(path, "optimal", False):
+            record["actions"] = list(path)
+    return record
+
+def readScenarios(filename):
+    """
+    Returns the scenarios in a CSV or binary scenario file as lists of 16 tiles.
+    """
+    return [state.tiles() for state in readScenarioFile(filename)]
+
+def loadResults(resultsFile):
+    """
+    Reads the result records already streamed to resultsFile. Lines that
+    do not parse (e.g. cut off by a crash mid-write) are skipped.
+    """
+    results = []
+    if resultsFile is None or not os.path.exists(resultsFile):
+        return results
+    with open(resultsFile, "r") as fin:
+        for line in fin:
+            try:
+                results.append(json.loads(line))
+            except ValueError:
+                continue
+    return results
+
+def _trimPartialLine(resultsFile):
+    """
+    Cuts resultsFile back to its last complete line, so that appended
+    records start on a fresh line.
+    """
+    if not os.path.exists(resultsFile):
+        return
+    with open(resultsFile, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+def runBatch(filename, strategies, workers=None, resultsFile=None,
+             timeout=None, nodeBudget=None, stateBudget=None, onResult=None, cacheFile=None,
+             profile=False, traceDir=None, sampleEvery=1000):
+    """
+    Runs every strategy on every scenario of 'filename' in a process pool of
+    'workers' processes (default: one per CPU).
+
+    If resultsFile is given, each result is appended to it as one JSON line
+    as soon as the job finishes, and pairs already recorded there for the
+    same tiles are not run again. onResult(result) is called for each new
+    result in completion order.
+
+    If cacheFile is given, cached scenarios are answered from it and the
+    new optimal solutions are saved to it at the end. profile=True records
+    a phase breakdown per job; traceDir also writes one sampled trace per
+    job, named scenario-<n>-<strategy>.jsonl.
+
+    Returns all results, recorded and new, ordered by scenario and then by
+    the order of 'strategies'.
+    """
+    scenarios = readScenarios(filename)
+    names = [name for (_, name) in strategies]
+    results = [r for r in loadResults(resultsFile)
+               if r["strategy"] in names and 1 <= r["scenario"] <= len(scenarios)
+               and r["tiles"] == scenarios[r["scenario"] - 1]]
+    done = {(r["scenario"], r["strategy"]) for r in results}
+
+    cache = SolutionCache(cacheFile) if cacheFile is not None else None
+    if traceDir is not None:
+        os.makedirs(traceDir, exist_ok=True)
+    out = None
+    if resultsFile is not None:
+        _trimPartialLine(resultsFile)
+        out = open(resultsFile, "a")
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = []
+            for scenario, tiles in enumerate(scenarios, start=1):
+                for (strategy, name) in strategies:
+                    if (scenario, name) not in done:
+                        traceFile = None
+                        if traceDir is not None:
+                            traceFile = os.path.join(traceDir, f"scenario-{scenario}-{_slug(name)}.jsonl")
+                        futures.append(pool.submit(runJob, strategy, name, scenario,
+                                                   tiles, timeout, nodeBudget, stateBudget,
+                                                   cacheFile, profile, traceFile, sampleEvery))
+            for future in as_completed(futures):
+                result = future.result()
+                actions = result.pop("actions", None)
+                if actions is not None:
+                    cache.storePath(FifteenPuzzleState(result["tiles"]), actions)
+                results.append(result)
+                if out is not None:
+                    out.write(json.dumps(result) + "\n")
+                    out.flush()
+                if onResult is not None:
+                    onResult(result)
+    finally:
+        if out is not None:
+            out.close()
+        if cache is not None:
+            cache.save()
+
+    order = {name: idx for idx, name in enumerate(names)}
+    results.sort(key=lambda r: (r["scenario"], order[r["strategy"]]))
+    return results
+
+def _slug(name):
+    return "".join(c if c.isalnum() else "-" for c in name).strip("-").lower()
+
+def formatResult(result):
+    """
+    One report line for a result, in the style of the sprint reports.
+    """
+    name = result["strategy"]
+    if result.get("cached"):
+        return f"{name}: depth={result['depth']}, answered from the solution cache"
+    if result["status"] == STATUS_SOLVED:
+        return (f"{name}: depth={result['depth']}, expansions={result['expanded']}, "
+                f"fringe={result['fringe']}, peak nodes={result.get('stored')}, time={result['time']:.3f}s")
+    if result["status"] == STATUS_UNSOLVED:
+        return f"{name}: unsolvable, search space exhausted after {result['expanded']} expansions."
+    bound = result.get("bound")
+    bound_text = f", depth >= {bound}" if bound else ""
+    return (f"{name}: stopped ({result['status']}) after {result['expanded']} expansions"
+            f"{bound_text}, time={result['time']:.3f}s")
+
+def aggregateResults(results, names):
+    """
+    Per-strategy totals over the solved results, plus how many runs ended
+    in each other status and how many cache lookups were made and hit.
+    Cache hits are left out of the solved totals, which measure searches:
+    {name: {"count", "sumDepth", "sumTime", "sumExp", "sumFringe", "maxStored", "statuses",
+            "lookups", "hits"}}.
+    """
+    stats = {name: {"count": 0, "sumDepth": 0, "sumTime": 0.0, "sumExp": 0, "sumFringe": 0,
+                    "maxStored": 0, "statuses": {}, "lookups": 0, "hits": 0}
+             for name in names}
+    for result in results:
+        entry = stats[result["strategy"]]
+        if "cached" in result:
+            entry["lookups"] += 1
+            if result["cached"]:
+                entry["hits"] += 1
+                continue
+        if result["status"] != STATUS_SOLVED:
+            entry["statuses"][result["status"]] = entry["statuses"].get(result["status"], 0) + 1
+            continue
+        entry["count"] += 1
+        entry["sumDepth"] += result["depth"]
+        entry["sumTime"] += result["time"]
+        entry["sumExp"] += result["expanded"]
+        entry["sumFringe"] += result["fringe"]
+        entry["maxStored"] = max(entry["maxStored"], result.get("stored") or 0)
+    return stats
+
+def printAggregatedResults(title, results, names):
+    """
+    Prints the summary table used by the Sprint #3 and #4 reports.
+    """
+    stats = aggregateResults(results, names)
+    print(f"\n=== {title} ===")
+    for name in names:
+        c = stats[name]["count"]
+        others = ", ".join(f"#{status}={count}" for status, count in
+                           sorted(stats[name]["statuses"].items()))
+        if stats[name]["lookups"]:
+            hits, lookups = stats[name]["hits"], stats[name]["lookups"]
+            others += (", " if others else "") + \
+                f"cacheHits={hits}/{lookups} ({100 * hits / lookups:.0f}%)"
+        if c == 0 and stats[name]["hits"]:
+            print(f" {name}: no searches solved, {others}")
+        elif c == 0:
+            print(f" {name}: No solutions found." + (f" {others}" if others else ""))
+        else:
+            avg_depth = stats[name]["sumDepth"] / c
+            avg_time = stats[name]["sumTime"] / c
+            avg_exp = stats[name]["sumExp"] / c
+            avg_fringe = stats[name]["sumFringe"] / c
+            print(f" {name}: #Solved={c}, avgDepth={avg_depth:.2f}, avgTime={avg_time:.3f}s, avgExp={avg_exp:.1f}, avgFringe={avg_fringe:.1f}"
+                  f", peakNodes={stats[name]['maxStored']}" + (f", {others}" if others else ""))
+
+def printProfileBreakdown(title, results, names):
+    """
+    Prints, per strategy, where the search time went (summed over the
+    profiled results) and the summed tracer counters.
+    """
+    print(f"\n=== {title}: profile ===")
+    for name in names:
+        reports = [r["profile"] for r in results if r["strategy"] == name and "profile" in r]
+        if not reports:
+            print(f" {name}: no profile recorded.")
+            continue
+        total = {"times": {}, "layers": {}}
+        for key in ("expanded", "generated", "duplicates", "reexpanded", "stale"):
+            total[key] = sum(report[key] for report in reports)
+        for report in reports:
+            for phase, seconds in report["times"].items():
+                total["times"][phase] = total["times"].get(phase, 0.0) + seconds
+            for f, count in report["layers"].items():
+                total["layers"][f] = total["layers"].get(f, 0) + count
+        print(f" {name}: {search.formatProfile(total)}")
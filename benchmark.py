@@ -0,0 +1,766 @@
+#!/usr/bin/env python3
+"""
+benchmark.py
+
+Micro- and macro-benchmarks for the data structures in util.py and the
+searches in search.py. Run a single benchmark by name, e.g.:
+
+    python benchmark.py queues --size 1000000
+    python benchmark.py incremental --scenarios scenarios.csv
+    python benchmark.py anytime --deadline 5
+    python benchmark.py sizes
+    python benchmark.py parallel --set tier40 --workers 32
+    python benchmark.py hdastar --set tier20
+    python benchmark.py bfs --set tier20 --budget 256
+    python benchmark.py frontier --scenarios scenarios.csv
+    python benchmark.py fsm --set tier30 --max-depth 14
+    python benchmark.py epea --set tier30
+
+The 'suite' benchmark runs registered solvers on standard instance sets,
+writes the metrics as JSON and can fail on regressions against a stored
+baseline:
+
+    python benchmark.py suite --set tier20 --set tier30 --out run.json
+    python benchmark.py suite --set tier20 --baseline baseline.json --threshold 0.1
+"""
+
+import argparse
+import functools
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import automate
+import comp
+import search
+import util
+from fifteenpuzzle import (
+    FifteenPuzzleSearchProblem,
+    randomWalkFifteenPuzzle,
+    readKorfFile,
+    writeScenarioFile,
+    h1_misplacedTiles,
+    h2_euclideanDistance,
+    h3_manhattanDistance,
+    h4_rowColDifference,
+    h5_linearConflict,
+    h6_walkingDistance,
+    readScenarioFile
+)
+from fsm import defaultFsm, generatedPerDepth
+from parallel import hdaStarSearch, parallelIdaStarSearch
+from slidingpuzzle import SlidingPuzzleSearchProblem, randomWalkPuzzle
+from vectorheuristics import HEURISTIC_NAMES, BatchHeuristics, statesToArray
+
+
+def _rate(count, elapsed):
+    return count / elapsed if elapsed > 0 else float("inf")
+
+def loadScenarios(filename="scenarios.csv"):
+    return list(readScenarioFile(filename))
+
+def _timeSearch(searchFn, states, **kwargs):
+    """
+    Solves every state with searchFn; returns (total expansions, seconds).
+    """
+    expanded = 0
+    elapsed = 0.0
+    for state in states:
+        problem = FifteenPuzzleSearchProblem(state)
+        start = time.perf_counter()
+        searchFn(problem, **kwargs)
+        elapsed += time.perf_counter() - start
+        expanded += problem.expanded_nodes
+    return expanded, elapsed
+
+def benchmarkPriorityQueues(size=10**6):
+    """
+    Pushes 'size' random integer priorities into each open-list structure,
+    then pops them all, and prints the throughput of each phase.
+
+    PriorityQueue.update scans the whole heap, so its decrease-key is only
+    timed on a small queue to show the per-operation cost.
+    """
+    rng = random.Random(0)
+    priorities = [rng.randrange(size) for _ in range(size)]
+
+    print(f"=== Open list push/pop at {size} entries ===")
+
+    pq = util.PriorityQueue()
+    start = time.perf_counter()
+    for i, p in enumerate(priorities):
+        pq.push(i, p)
+    push_time = time.perf_counter() - start
+    start = time.perf_counter()
+    while not pq.isEmpty():
+        pq.pop()
+    pop_time = time.perf_counter() - start
+    print(f" PriorityQueue:        push={_rate(size, push_time):,.0f}/s, pop={_rate(size, pop_time):,.0f}/s")
+
+    ipq = util.IndexedPriorityQueue()
+    start = time.perf_counter()
+    for i, p in enumerate(priorities):
+        ipq.push(i, i, p)
+    push_time = time.perf_counter() - start
+    start = time.perf_counter()
+    while not ipq.isEmpty():
+        ipq.pop()
+    pop_time = time.perf_counter() - start
+    for i, p in enumerate(priorities):
+        ipq.push(i, i, p)
+    start = time.perf_counter()
+    for i, p in enumerate(priorities):
+        ipq.update(i, i, p - 1)
+    update_time = time.perf_counter() - start
+    print(f" IndexedPriorityQueue: push={_rate(size, push_time):,.0f}/s, pop={_rate(size, pop_time):,.0f}/s, "
+          f"decrease-key={_rate(size, update_time):,.0f}/s")
+
+    small = min(size, 2000)
+    pq = util.PriorityQueue()
+    for i in range(small):
+        pq.push(i, priorities[i])
+    start = time.perf_counter()
+    for i in range(small):
+        pq.update(i, priorities[i] - 1)
+    update_time = time.perf_counter() - start
+    print(f" PriorityQueue.update at {small} entries: {_rate(small, update_time):,.0f}/s")
+
+def benchmarkIncrementalHeuristics(filename="scenarios.csv"):
+    """
+    Compares the per-expansion cost of A* and IDA* when child heuristics
+    are derived from the parent by heuristic.delta versus rescored from
+    scratch on all 16 cells.
+    """
+    states = loadScenarios(filename)
+    print(f"=== Incremental heuristic evaluation on {filename} ===")
+    for hfn, name in [(h1_misplacedTiles, "h1_misplaced"),
+                      (h3_manhattanDistance, "h3_manhattan"),
+                      (h4_rowColDifference, "h4_rowCol")]:
+        # Same function without the delta attribute.
+        def scratch(state, problem=None, hfn=hfn):
+            return hfn(state, problem)
+        for searchFn, label in [(search.aStarSearch, "A*"), (search.idaStarSearch, "IDA*")]:
+            exp_full, t_full = _timeSearch(searchFn, states, heuristic=scratch)
+            exp_inc, t_inc = _timeSearch(searchFn, states, heuristic=hfn)
+            us_full = 1e6 * t_full / max(exp_full, 1)
+            us_inc = 1e6 * t_inc / max(exp_inc, 1)
+            print(f" {label:4} {name:13} expansions={exp_inc}, "
+                  f"scratch={us_full:.1f}us/exp, incremental={us_inc:.1f}us/exp, "
+                  f"speedup={us_full / us_inc:.2f}x")
+
+def benchmarkSearchMemory(filename="scenarios.csv", maxDepth=14):
+    """
+    Reports peak traced memory and expansions per second for BFS, UCS and
+    A* (Manhattan). The uninformed searches only get the scenarios whose
+    optimal depth is at most maxDepth. DFS is left out: with a closed set it
+    wanders through most of the reachable space before hitting the goal.
+    """
+    states = loadScenarios(filename)
+    depths = [len(search.aStarSearch(FifteenPuzzleSearchProblem(s), h3_manhattanDistance))
+              for s in states]
+    shallow = [s for s, d in zip(states, depths) if d <= maxDepth]
+    print(f"=== Search memory on {filename} "
+          f"({len(shallow)}/{len(states)} scenarios with depth <= {maxDepth} for BFS/UCS) ===")
+
+    def astar_manhattan(problem):
+        return search.aStarSearch(problem, heuristic=h3_manhattanDistance)
+
+    for searchFn, name, subset in [(search.breadthFirstSearch, "BFS", shallow),
+                                   (search.uniformCostSearch, "UCS", shallow),
+                                   (astar_manhattan, "A* (Manhattan)", states)]:
+        expanded = 0
+        elapsed = 0.0
+        peak = 0
+        for state in subset:
+            problem = FifteenPuzzleSearchProblem(state)
+            tracemalloc.start()
+            start = time.perf_counter()
+            searchFn(problem)
+            elapsed += time.perf_counter() - start
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            expanded += problem.expanded_nodes
+        print(f" {name:15} expansions={expanded}, nodes/sec={_rate(expanded, elapsed):,.0f}, "
+              f"peak memory={peak / 2**20:.1f} MiB")
+
+def benchmarkOpenLists(filename="scenarios.csv"):
+    """
+    Compares A* with the binary-heap and bucket open lists: total
+    expansions, maximum fringe and wall time over all scenarios.
+    """
+    states = loadScenarios(filename)
+    print(f"=== A* open lists on {filename} ===")
+    for hfn, name in [(h2_euclideanDistance, "h2_euclid"),
+                      (h3_manhattanDistance, "h3_manhattan"),
+                      (h5_linearConflict, "h5_linearConflict"),
+                      (h6_walkingDistance, "h6_walkingDist")]:
+        for openList in ("heap", "bucket"):
+            expanded = 0
+            fringe = 0
+            start = time.perf_counter()
+            for state in states:
+                problem = FifteenPuzzleSearchProblem(state)
+                search.aStarSearch(problem, heuristic=hfn, openList=openList)
+                expanded += problem.expanded_nodes
+                fringe = max(fringe, problem.max_fringe)
+            elapsed = time.perf_counter() - start
+            print(f" {name:18} {openList:6} expansions={expanded}, max fringe={fringe}, time={elapsed:.3f}s")
+
+def benchmarkAnytime(filename="scenarios.csv", deadline=10.0):
+    """
+    Weighted A* at several weights, then anytime A* (ARA*) under a
+    per-scenario deadline, both with linear conflict. For ARA* it reports
+    the average time to the first solution, to the first optimal solution
+    and to the proof of optimality, over the scenarios where each happened.
+    Optimal depths come from IDA*.
+    """
+    states = loadScenarios(filename)
+    optimal = [len(search.idaStarSearch(FifteenPuzzleSearchProblem(s), h5_linearConflict))
+               for s in states]
+    print(f"=== Weighted and anytime A* on {filename} (linear conflict) ===")
+
+    for weight in (1, 1.5, 2, 3):
+        expanded = 0
+        excess = 0
+        start = time.perf_counter()
+        for state, best in zip(states, optimal):
+            problem = FifteenPuzzleSearchProblem(state)
+            path = search.weightedAStarSearch(problem, h5_linearConflict, weight=weight)
+            expanded += problem.expanded_nodes
+            excess += len(path) - best
+        elapsed = time.perf_counter() - start
+        print(f" weighted A* w={weight:<4} expansions={expanded}, time={elapsed:.3f}s, "
+              f"avg extra moves={excess / len(states):.2f}")
+
+    first, to_optimal, proved = [], [], []
+    for state, best in zip(states, optimal):
+        result = search.anytimeAStarSearch(FifteenPuzzleSearchProblem(state), h5_linearConflict,
+                                           maxTime=deadline)
+        if result.status != search.SOLVED:
+            continue
+        first.append(result.solutions[0][0])
+        hits = [seconds for (seconds, cost, _, _) in result.solutions if cost == best]
+        if hits:
+            to_optimal.append(hits[0])
+        if result.suboptimality == 1:
+            proved.append(result.elapsed)
+
+    def average(times):
+        return f"{sum(times) / len(times):.3f}s ({len(times)}/{len(states)})" if times else "n/a"
+    print(f" ARA* deadline={deadline}s time-to-first={average(first)}, "
+          f"time-to-optimal={average(to_optimal)}, time-to-proof={average(proved)}")
+
+def benchmarkPuzzleSizes(count=10, walk=30):
+    """
+    A* and IDA* with linear conflict on the 8-, 15- and 24-puzzle, each on
+    'count' seeded random walks of 'walk' moves from the goal. Reports the
+    size of one state, the expansion rates and A*'s peak traced memory per
+    stored node (state, search node and closed/open list entries).
+    """
+    print(f"=== Puzzle sizes: {count} random walks of {walk} moves (linear conflict) ===")
+    for size in (3, 4, 5):
+        rng = random.Random(size)
+        states = [randomWalkPuzzle(size, walk, rng) for _ in range(count)]
+        state_bytes = sys.getsizeof(states[0]) + sys.getsizeof(states[0].packed)
+        rates = []
+        for searchFn in (search.aStarSearch, search.idaStarSearch):
+            expanded = 0
+            start = time.perf_counter()
+            for state in states:
+                expanded += searchFn(SlidingPuzzleSearchProblem(state), h5_linearConflict).expanded
+            rates.append(_rate(expanded, time.perf_counter() - start))
+        peak = 0
+        stored = 0
+        for state in states:
+            tracemalloc.start()
+            result = search.aStarSearch(SlidingPuzzleSearchProblem(state), h5_linearConflict)
+            peak += tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            stored += result.stored
+        print(f" {size * size - 1:2}-puzzle state={state_bytes}B, A* nodes/sec={rates[0]:,.0f}, "
+              f"IDA* nodes/sec={rates[1]:,.0f}, A* memory/node={peak / max(stored, 1):.0f}B")
+
+def benchmarkBatchHeuristics(filename="scenarios.csv", copies=1000):
+    """
+    Boards scored per second by the NumPy batch heuristics versus the
+    scalar h1..h5, then A* against batched A* (linear conflict) on the
+    scenarios. Needs NumPy.
+    """
+    states = loadScenarios(filename)
+    batch = BatchHeuristics()
+    print(f"=== Batch heuristics on {filename} x {copies} ===")
+    boards = statesToArray(states * copies)
+    for name, hfn in zip(HEURISTIC_NAMES, (h1_misplacedTiles, h2_euclideanDistance,
+                                           h3_manhattanDistance, h4_rowColDifference,
+                                           h5_linearConflict)):
+        start = time.perf_counter()
+        getattr(batch, name)(boards)
+        batch_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for state in states * copies:
+            hfn(state)
+        scalar_time = time.perf_counter() - start
+        print(f" {name} batch={_rate(len(boards), batch_time):,.0f} boards/s, "
+              f"scalar={_rate(len(boards), scalar_time):,.0f} boards/s")
+    for searchFn, heuristic, label in [(search.aStarSearch, h5_linearConflict, "A*"),
+                                       (search.batchedAStarSearch, batch, "batched A*")]:
+        expanded, elapsed = _timeSearch(searchFn, states, heuristic=heuristic)
+        print(f" {label:10} expansions={expanded}, nodes/sec={_rate(expanded, elapsed):,.0f}")
+
+
+# Benchmark suite: standard instance sets, registered solvers, JSON results
+# and regression checks against a stored baseline.
+
+INSTANCE_DIR = "instances"
+DEPTH_TIERS = (10, 20, 30, 40)
+TIER_SIZE = 10
+KORF_FILE = os.path.join(INSTANCE_DIR, "korf100.txt")
+
+def tierFilename(depth):
+    return os.path.join(INSTANCE_DIR, f"tier-{depth}.csv")
+
+def generateDepthTier(depth, count=TIER_SIZE, seed=None):
+    """
+    Returns 'count' distinct boards at optimal distance exactly 'depth'
+    from the goal: random walks of about 1.5 * depth moves, kept when IDA*
+    with walking distance confirms the depth. The seed defaults to the
+    depth, so a tier is reproducible.
+    """
+    rng = random.Random(depth if seed is None else seed)
+    walk = depth + 2 * (depth // 4)
+    states = []
+    while len(states) < count:
+        state = randomWalkFifteenPuzzle(walk, rng)
+        if state in states:
+            continue
+        if len(search.idaStarSearch(FifteenPuzzleSearchProblem(state), h6_walkingDistance)) == depth:
+            states.append(state)
+    return states
+
+def writeDepthTiers(depths=DEPTH_TIERS, count=TIER_SIZE):
+    """
+    (Re)generates the tier files in INSTANCE_DIR.
+    """
+    os.makedirs(INSTANCE_DIR, exist_ok=True)
+    for depth in depths:
+        start = time.perf_counter()
+        writeScenarioFile(tierFilename(depth), generateDepthTier(depth, count))
+        print(f" {tierFilename(depth)}: {count} boards at depth {depth}, "
+              f"{time.perf_counter() - start:.1f}s")
+
+def loadInstanceSet(name):
+    """
+    Instance sets by name:
+      scenarios   the bundled scenarios.csv
+      tier<d>     the boards at optimal depth d in INSTANCE_DIR (tier10..tier40)
+      korf100     Korf's 100 random instances, bundled in KORF_FILE in his
+                  file format with the optimal lengths
+    Any other name is read as a scenario file.
+    """
+    if name == "scenarios":
+        return loadScenarios("scenarios.csv")
+    if name == "korf100":
+        return readKorfFile(KORF_FILE)
+    if name.startswith("tier") and name[4:].isdigit():
+        return loadScenarios(tierFilename(int(name[4:])))
+    return loadScenarios(name)
+
+def suiteSolvers():
+    """
+    Registered solvers, name -> search function: the Sprint #4 strategies
+    from comp.py plus A* and IDA* with each Sprint #3 heuristic from
+    automate.py.
+    """
+    solvers = {name: fn for (fn, name) in comp.STRATEGIES}
+    for heuristic, name in automate.HEURISTICS:
+        solvers[f"A* ({name})"] = functools.partial(search.aStarSearch, heuristic=heuristic)
+        solvers[f"IDA* ({name})"] = functools.partial(search.idaStarSearch, heuristic=heuristic)
+    return solvers
+
+def _percentile(values, q):
+    """
+    Nearest-rank percentile of a non-empty list.
+    """
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))]
+
+def _measureSolver(searchFn, states, timeout, memory):
+    """
+    Runs searchFn on every state with a per-run time limit and returns the
+    suite metrics. Peak memory comes from a second, traced pass, so that
+    tracing does not slow down the timed one.
+    """
+    latencies = []
+    expanded = 0
+    solved = 0
+    depth = 0
+    for state in states:
+        problem = FifteenPuzzleSearchProblem(state)
+        start = time.perf_counter()
+        result = searchFn(problem, maxTime=timeout)
+        latencies.append(time.perf_counter() - start)
+        expanded += problem.expanded_nodes
+        if result.status == search.SOLVED:
+            solved += 1
+            depth += len(result)
+    peak = None
+    if memory:
+        peak = 0
+        for state in states:
+            tracemalloc.start()
+            searchFn(FifteenPuzzleSearchProblem(state), maxTime=timeout)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+    seconds = sum(latencies)
+    return {
+        "instances": len(states),
+        "solved": solved,
+        "total_depth": depth,
+        "expansions": expanded,
+        "seconds": seconds,
+        "nodes_per_sec": _rate(expanded, seconds),
+        "latency_p50": _percentile(latencies, 50),
+        "latency_p90": _percentile(latencies, 90),
+        "latency_p99": _percentile(latencies, 99),
+        "peak_memory_mb": peak / 2**20 if peak is not None else None,
+    }
+
+def runSuite(setNames, solverNames, timeout=60.0, memory=True):
+    """
+    Runs every named solver on every named instance set and returns a
+    JSON-serialisable report: {"meta": {...}, "results": {set: {solver: metrics}}}.
+    """
+    solvers = suiteSolvers()
+    unknown = [name for name in solverNames if name not in solvers]
+    if unknown:
+        raise ValueError(f"Unknown solver(s) {unknown}; known: {sorted(solvers)}")
+    report = {
+        "meta": {"python": platform.python_version(), "timeout": timeout,
+                 "date": time.strftime("%Y-%m-%d %H:%M:%S")},
+        "results": {},
+    }
+    for setName in setNames:
+        states = loadInstanceSet(setName)
+        print(f"=== Suite: {setName} ({len(states)} instances) ===")
+        report["results"][setName] = {}
+        for solverName in solverNames:
+            metrics = _measureSolver(solvers[solverName], states, timeout, memory)
+            report["results"][setName][solverName] = metrics
+            memory_text = (f", peak={metrics['peak_memory_mb']:.1f} MiB"
+                           if metrics["peak_memory_mb"] is not None else "")
+            print(f" {solverName:30} solved={metrics['solved']}/{metrics['instances']}, "
+                  f"expansions={metrics['expansions']}, nodes/sec={metrics['nodes_per_sec']:,.0f}, "
+                  f"p50={metrics['latency_p50']:.3f}s, p90={metrics['latency_p90']:.3f}s, "
+                  f"p99={metrics['latency_p99']:.3f}s{memory_text}")
+    return report
+
+# Metrics compared against a baseline: name -> True if higher is better.
+REGRESSION_METRICS = {
+    "solved": True,
+    "expansions": False,
+    "nodes_per_sec": True,
+    "latency_p50": False,
+    "latency_p90": False,
+    "peak_memory_mb": False,
+}
+# Timings below this many seconds are too noisy to compare.
+MIN_COMPARED_SECONDS = 0.005
+
+def compareToBaseline(report, baseline, threshold=0.10):
+    """
+    Returns a description of every metric that got worse than the baseline
+    by more than 'threshold' (a fraction), for the set/solver pairs present
+    in both reports.
+    """
+    regressions = []
+    for setName, solvers in report["results"].items():
+        for solverName, metrics in solvers.items():
+            old_metrics = baseline.get("results", {}).get(setName, {}).get(solverName)
+            if old_metrics is None:
+                continue
+            for metric, higherIsBetter in REGRESSION_METRICS.items():
+                old, new = old_metrics.get(metric), metrics.get(metric)
+                if not old or new is None:
+                    continue
+                if metric.startswith("latency") and max(old, new) < MIN_COMPARED_SECONDS:
+                    continue
+                change = (old - new) / old if higherIsBetter else (new - old) / old
+                if change > threshold:
+                    regressions.append(f"{setName} / {solverName}: {metric} {old:.4g} -> {new:.4g} "
+                                       f"({100 * change:+.1f}% worse)")
+    return regressions
+
+def benchmarkSuite(args):
+    """
+    Command-line entry for the suite. Returns 1 if a regression beyond the
+    threshold was found against --baseline, otherwise 0.
+    """
+    report = runSuite(args.set or ["tier10", "tier20"],
+                      args.solver or ["A* (Manhattan)", "IDA* (Manhattan)"],
+                      args.timeout, not args.no_memory)
+    if args.out:
+        with open(args.out, "w") as fout:
+            json.dump(report, fout, indent=2)
+        print(f"Results written to {args.out}")
+    if args.baseline:
+        with open(args.baseline, "r") as fin:
+            baseline = json.load(fin)
+        regressions = compareToBaseline(report, baseline, args.threshold)
+        if regressions:
+            print(f"REGRESSIONS against {args.baseline} (threshold {100 * args.threshold:.0f}%):")
+            for line in regressions:
+                print(" " + line)
+            return 1
+        print(f"No regressions against {args.baseline} (threshold {100 * args.threshold:.0f}%).")
+    return 0
+
+def benchmarkParallelScaling(setName="tier30", maxWorkers=None):
+    """
+    Scaling curve of parallel IDA* (linear conflict) on an instance set:
+    total wall time with 1, 2, 4, ... up to maxWorkers processes, against
+    sequential IDA*, with speedup and parallel efficiency. Every run must
+    return the sequential solution.
+    """
+    states = loadInstanceSet(setName)
+    maxWorkers = maxWorkers or os.cpu_count() or 1
+    counts = sorted({min(2 ** i, maxWorkers) for i in range(maxWorkers.bit_length() + 1)})
+    print(f"=== Parallel IDA* scaling on {setName} ({len(states)} boards, linear conflict, "
+          f"{os.cpu_count()} CPUs) ===")
+    start = time.perf_counter()
+    sequential = [search.idaStarSearch(FifteenPuzzleSearchProblem(s), h5_linearConflict)
+                  for s in states]
+    base = time.perf_counter() - start
+    print(f" sequential      time={base:.3f}s, expansions={sum(r.expanded for r in sequential)}")
+    for workers in counts:
+        start = time.perf_counter()
+        expanded = 0
+        for state, expected in zip(states, sequential):
+            result = parallelIdaStarSearch(FifteenPuzzleSearchProblem(state), h5_linearConflict,
+                                           workers=workers)
+            if list(result) != list(expected):
+                raise AssertionError(f"parallel IDA* ({workers} workers) differs from IDA*")
+            expanded += result.expanded
+        elapsed = time.perf_counter() - start
+        print(f" {workers:3} worker(s)    time={elapsed:.3f}s, expansions={expanded}, "
+              f"speedup={base / elapsed:.2f}x, efficiency={base / elapsed / workers:.0%}")
+
+def benchmarkHdaStar(setName="tier20", workerCounts=(1, 2, 4, 8)):
+    """
+    Hash-distributed A* (linear conflict) with 1, 2, 4 and 8 workers
+    against sequential A*: wall time, throughput (expansions per second
+    over all workers) and search overhead (expansions relative to A*).
+    """
+    states = loadInstanceSet(setName)
+    print(f"=== HDA* on {setName} ({len(states)} boards, linear conflict, "
+          f"{os.cpu_count()} CPUs) ===")
+    start = time.perf_counter()
+    sequential = [search.aStarSearch(FifteenPuzzleSearchProblem(s), h5_linearConflict)
+                  for s in states]
+    base = time.perf_counter() - start
+    base_expanded = sum(r.expanded for r in sequential)
+    print(f" A*              time={base:.3f}s, expansions={base_expanded}, "
+          f"nodes/sec={_rate(base_expanded, base):,.0f}")
+    for workers in workerCounts:
+        start = time.perf_counter()
+        expanded = 0
+        for state, expected in zip(states, sequential):
+            result = hdaStarSearch(FifteenPuzzleSearchProblem(state), h5_linearConflict,
+                                   workers=workers)
+            if len(result) != len(expected):
+                raise AssertionError(f"HDA* ({workers} workers) returned a non-optimal path")
+            expanded += result.expanded
+        elapsed = time.perf_counter() - start
+        print(f" HDA* {workers:2} worker(s) time={elapsed:.3f}s, expansions={expanded}, "
+              f"nodes/sec={_rate(expanded, elapsed):,.0f}, "
+              f"overhead={expanded / max(base_expanded, 1):.2f}x")
+
+def benchmarkCompactBfs(setName="tier20", budget=256, count=3, maxDepth=14):
+    """
+    Bytes per stored state of plain BFS (traced peak over states stored) and
+    of compactBreadthFirstSearch on the scenarios of depth <= maxDepth, then
+    the compact BFS on the first 'count' boards of an instance set inside a
+    budget of 'budget' MiB.
+    """
+    states = [s for s in loadScenarios()
+              if len(search.aStarSearch(FifteenPuzzleSearchProblem(s), h5_linearConflict)) <= maxDepth]
+    print(f"=== BFS memory on {len(states)} scenarios with depth <= {maxDepth} ===")
+    for searchFn, name in [(search.breadthFirstSearch, "BFS"),
+                           (search.compactBreadthFirstSearch, "compact BFS")]:
+        stored = 0
+        peak = 0
+        elapsed = 0.0
+        for state in states:
+            tracemalloc.start()
+            start = time.perf_counter()
+            result = searchFn(FifteenPuzzleSearchProblem(state))
+            elapsed += time.perf_counter() - start
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            stored = max(stored, result.stored)
+        print(f" {name:12} time={elapsed:.3f}s, peak memory={peak / 2**20:.1f} MiB, "
+              f"bytes/state={peak / max(stored, 1):.1f}")
+    print(f"=== Compact BFS on {setName} (budget {budget} MiB) ===")
+    for state in loadInstanceSet(setName)[:count]:
+        result = search.compactBreadthFirstSearch(FifteenPuzzleSearchProblem(state),
+                                                  maxBytes=budget * 2**20)
+        print(f" {result.status:17} depth={result.bound}, states={result.stored}, "
+              f"memory={result.memory_bytes / 2**20:.1f} MiB, "
+              f"bytes/state={result.bytes_per_state:.1f}, time={result.elapsed:.1f}s")
+
+def benchmarkFrontierSearch(filename="scenarios.csv", maxDepth=14):
+    """
+    Peak traced memory of BFS and A* (Manhattan) against their frontier
+    search versions on the same scenarios (BFS only up to maxDepth), and
+    checks that the depths match.
+    """
+    states = loadScenarios(filename)
+    depths = [len(search.aStarSearch(FifteenPuzzleSearchProblem(s), h5_linearConflict))
+              for s in states]
+    shallow = [(s, d) for s, d in zip(states, depths) if d <= maxDepth]
+    print(f"=== Frontier search on {filename} "
+          f"({len(shallow)}/{len(states)} scenarios with depth <= {maxDepth} for BFS) ===")
+
+    def astar_manhattan(problem):
+        return search.aStarSearch(problem, heuristic=h3_manhattanDistance)
+
+    def frontier_manhattan(problem):
+        return search.frontierSearch(problem, heuristic=h3_manhattanDistance)
+
+    pairs = [("BFS", search.breadthFirstSearch, search.frontierSearch, shallow),
+             ("A* (Manhattan)", astar_manhattan, frontier_manhattan, list(zip(states, depths)))]
+    for name, plainFn, frontierFn, subset in pairs:
+        peaks = []
+        for searchFn in (plainFn, frontierFn):
+            expanded = 0
+            elapsed = 0.0
+            peak = 0
+            for state, depth in subset:
+                problem = FifteenPuzzleSearchProblem(state)
+                tracemalloc.start()
+                start = time.perf_counter()
+                result = searchFn(problem)
+                elapsed += time.perf_counter() - start
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+                if len(result) != depth:
+                    raise AssertionError(f"{name} returned depth {len(result)}, expected {depth}")
+                expanded += problem.expanded_nodes
+            peaks.append(peak)
+            label = name if searchFn is plainFn else "frontier " + name
+            print(f" {label:24} expansions={expanded}, time={elapsed:.3f}s, "
+                  f"peak memory={peak / 2**20:.2f} MiB")
+        print(f" {'':24} memory ratio={peaks[0] / max(peaks[1], 1):.1f}x")
+
+def benchmarkFsmPruning(setName="tier30", maxDepth=14):
+    """
+    Nodes generated per depth from the goal board with parent pruning only
+    and with the duplicate-pruning FSM, then IDA* (linear conflict) on an
+    instance set with and without the FSM.
+    """
+    start = time.perf_counter()
+    fsm = defaultFsm()
+    print(f"=== FSM duplicate pruning ({len(fsm)} states, strings up to {fsm.maxLength} moves, "
+          f"loaded in {time.perf_counter() - start:.1f}s) ===")
+    states = loadInstanceSet(setName)
+    goal = states[0].goal()
+    plain = generatedPerDepth(goal, maxDepth)
+    pruned = generatedPerDepth(goal, maxDepth, fsm)
+    print(f" {'depth':>5} {'parent pruning':>15} {'FSM':>10} {'reduction':>10}")
+    for depth, (a, b) in enumerate(zip(plain, pruned), 1):
+        print(f" {depth:5} {a:15} {b:10} {1 - b / a:10.1%}")
+    for label, kwargs in (("IDA*", {}), ("IDA* + FSM", {"fsm": fsm})):
+        expanded = 0
+        start = time.perf_counter()
+        for state in states:
+            result = search.idaStarSearch(FifteenPuzzleSearchProblem(state), h5_linearConflict,
+                                          **kwargs)
+            expanded += result.expanded
+        elapsed = time.perf_counter() - start
+        print(f" {label:11} expansions={expanded}, time={elapsed:.3f}s")
+
+def benchmarkPartialExpansion(setName="tier30"):
+    """
+    Plain A* against EPEA* (partialExpansionAStarSearch): largest open list,
+    expansions and time, with Manhattan distance (operator-selection table)
+    and linear conflict (scores every child, then drops the ones not needed).
+    """
+    states = loadInstanceSet(setName)
+    print(f"=== Partial-expansion A* on {setName} ({len(states)} boards) ===")
+    for heuristic, hname in [(h3_manhattanDistance, "Manhattan"), (h5_linearConflict, "linear conflict")]:
+        fringes = []
+        depths = None
+        for searchFn, name in [(search.aStarSearch, "A*"),
+                               (search.partialExpansionAStarSearch, "EPEA*")]:
+            max_fringe = 0
+            expanded = 0
+            start = time.perf_counter()
+            results = [searchFn(FifteenPuzzleSearchProblem(state), heuristic) for state in states]
+            elapsed = time.perf_counter() - start
+            for result in results:
+                max_fringe = max(max_fringe, result.max_fringe)
+                expanded += result.expanded
+            lengths = [len(result) for result in results]
+            if depths is not None and lengths != depths:
+                raise AssertionError("EPEA* returned a non-optimal path")
+            depths = lengths
+            fringes.append(max_fringe)
+            print(f" {name + ' (' + hname + ')':26} max fringe={max_fringe}, "
+                  f"expansions={expanded}, time={elapsed:.3f}s")
+        print(f" {'':26} fringe ratio={fringes[0] / max(fringes[1], 1):.1f}x")
+
+
+BENCHMARKS = {
+    "queues": lambda args: benchmarkPriorityQueues(args.size),
+    "incremental": lambda args: benchmarkIncrementalHeuristics(args.scenarios),
+    "memory": lambda args: benchmarkSearchMemory(args.scenarios, args.max_depth),
+    "openlists": lambda args: benchmarkOpenLists(args.scenarios),
+    "anytime": lambda args: benchmarkAnytime(args.scenarios, args.deadline),
+    "sizes": lambda args: benchmarkPuzzleSizes(),
+    "batch": lambda args: benchmarkBatchHeuristics(args.scenarios),
+    "parallel": lambda args: benchmarkParallelScaling((args.set or ["tier30"])[0], args.workers),
+    "hdastar": lambda args: benchmarkHdaStar((args.set or ["tier20"])[0]),
+    "epea": lambda args: benchmarkPartialExpansion((args.set or ["tier30"])[0]),
+    "fsm": lambda args: benchmarkFsmPruning((args.set or ["tier30"])[0], args.max_depth),
+    "frontier": lambda args: benchmarkFrontierSearch(args.scenarios, args.max_depth),
+    "bfs": lambda args: benchmarkCompactBfs((args.set or ["tier20"])[0], args.budget),
+    "suite": benchmarkSuite,
+    "tiers": lambda args: writeDepthTiers(),
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a 15-puzzle benchmark.")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--size", type=int, default=10**6,
+                        help="number of entries for data-structure benchmarks")
+    parser.add_argument("--scenarios", default="scenarios.csv",
+                        help="scenario file for search benchmarks")
+    parser.add_argument("--max-depth", type=int, default=14,
+                        help="deepest scenario given to uninformed searches")
+    parser.add_argument("--deadline", type=float, default=10.0,
+                        help="seconds per scenario for anytime searches")
+    parser.add_argument("--set", action="append",
+                        help="suite instance set (repeatable): scenarios, tier10..tier40, korf100 or a file")
+    parser.add_argument("--solver", action="append",
+                        help="suite solver name (repeatable), e.g. 'A* (Linear Conflict)'")
+    parser.add_argument("--timeout", type=float, default=60.0,
+                        help="suite time limit per instance, in seconds")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the suite's traced peak-memory pass")
+    parser.add_argument("--workers", type=int,
+                        help="largest worker count for the parallel benchmark (default: CPUs)")
+    parser.add_argument("--budget", type=int, default=256,
+                        help="memory budget in MiB for the bfs benchmark")
+    parser.add_argument("--out", help="write suite results to this JSON file")
+    parser.add_argument("--baseline", help="compare suite results with this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative change that counts as a regression")
+    args = parser.parse_args()
+    if BENCHMARKS[args.benchmark](args):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+cache.py
+
+Persistent cache of exact goal distances and optimal solutions for the
+15-puzzle, shared across runs of automate.py, comp.py and the benchmarks.
+
+Entries are keyed by the packed 64-bit state. When an optimal solution is
+stored, every state along it is stored too, since the rest of the path is
+an optimal solution for that state. The cache holds at most maxEntries
+states and evicts the least recently used one when full. save() writes it
+to disk in least- to most-recently-used order, so a reload keeps the LRU
+order.
+
+File format: b"SOL1", then per entry the packed state (<Q), the number of
+moves (<B) and one byte per move: u, d, l or r.
+"""
+
+import os
+import struct
+import time
+from collections import OrderedDict
+import search
+from fifteenpuzzle import FifteenPuzzleSearchProblem, h3_manhattanDistance, readScenarioFile
+
+MAGIC = b"SOL1"
+_RECORD = struct.Struct("<QB")
+_ENCODE = {'up': 'u', 'down': 'd', 'left': 'l', 'right': 'r'}
+_DECODE = {code: move for move, code in _ENCODE.items()}
+
+
+class SolutionCache:
+    """
+    LRU map from packed state to its optimal action sequence. Lookups count
+    hits and misses so reports can show hit rates.
+    """
+
+    def __init__(self, filename=None, maxEntries=200000):
+        self.filename = filename
+        self.maxEntries = maxEntries
+        self.entries = OrderedDict()  # packed -> encoded moves
+        self.hits = 0
+        self.misses = 0
+        if filename is not None and os.path.exists(filename):
+            self.load(filename)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, state):
+        return state.packed in self.entries
+
+    def lookup(self, state):
+        """
+        Returns the cached optimal actions for state, or None. Counts a hit
+        or a miss and marks the entry as recently used.
+        """
+        moves = self.entries.get(state.packed)
+        if moves is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(state.packed)
+        return [_DECODE[code] for code in moves]
+
+    def distance(self, state):
+        """
+        Returns the exact goal distance of state, or None. Does not count
+        towards the hit rate (heuristics call it for every node).
+        """
+        moves = self.entries.get(state.packed)
+        return len(moves) if moves is not None else None
+
+    def storePath(self, state, actions):
+        """
+        Stores an optimal solution for state, and the remaining suffix for
+        every state it passes through.
+        """
+        moves = "".join(_ENCODE[action] for action in actions)
+        for i, action in enumerate(actions):
+            self._put(state.packed, moves[i:])
+            state = state.result(action)
+        self._put(state.packed, "")
+
+    def _put(self, packed, moves):
+        if packed in self.entries:
+            self.entries.move_to_end(packed)
+        self.entries[packed] = moves
+        if len(self.entries) > self.maxEntries:
+            self.entries.popitem(last=False)
+
+    def hitRate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return (f"cache: {len(self.entries)} states, hits={self.hits}, misses={self.misses}, "
+                f"hit rate={100 * self.hitRate():.1f}%")
+
+    def load(self, filename):
+        """
+        Adds the entries of a cache file (oldest first).
+        """
+        with open(filename, "rb") as fin:
+            data = fin.read()
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{filename} is not a solution cache file")
+        offset = len(MAGIC)
+        while offset + _RECORD.size <= len(data):
+            packed, length = _RECORD.unpack_from(data, offset)
+            offset += _RECORD.size
+            self._put(packed, data[offset:offset + length].decode("ascii"))
+            offset += length
+
+    def save(self, filename=None):
+        """
+        Writes the cache to filename (default: the file it was opened with).
+        The file is replaced atomically, so a crash leaves the old copy.
+        """
+        filename = filename or self.filename
+        tmp = filename + ".tmp"
+        with open(tmp, "wb") as fout:
+            fout.write(MAGIC)
+            for packed, moves in self.entries.items():
+                fout.write(_RECORD.pack(packed, len(moves)))
+                fout.write(moves.encode("ascii"))
+        os.replace(tmp, filename)
+
+    def heuristic(self, fallback):
+        """
+        Wraps an admissible heuristic: states in the cache get their exact
+        distance, others the fallback estimate.
+        """
+        def cachedHeuristic(state, problem=None):
+            exact = self.distance(state)
+            return exact if exact is not None else fallback(state, problem)
+        return cachedHeuristic
+
+
+def cachedSearch(searchFn, cache):
+    """
+    Wraps a search function: a start state found in the cache is answered
+    at once, and optimal solutions the search finds are stored.
+    """
+    def run(problem, *args, **kwargs):
+        start_time = time.time()
+        start_state = problem.getStartState()
+        actions = cache.lookup(start_state)
+        if actions is not None:
+            result = search.SearchResult(actions, search.SOLVED, elapsed=time.time() - start_time,
+                                         optimal=True)
+            result.cached = True
+            return result
+        result = searchFn(problem, *args, **kwargs)
+        if getattr(result, "optimal", False):
+            cache.storePath(start_state, result)
+        return result
+    return run
+
+def demoTest():
+    """
+    Solves the bundled scenarios twice through a cache and prints hit rates.
+    """
+    cache = SolutionCache()
+    astar = cachedSearch(search.aStarSearch, cache)
+    for _ in range(2):
+        for state in readScenarioFile("scenarios.csv"):
+            astar(FifteenPuzzleSearchProblem(state), h3_manhattanDistance)
+        print(cache.stats())
+
+if __name__ == "__main__":
+    demoTest()
@@ -9,95 +9,91 @@ it runs:
    - Depth-First Search (DFS)
    - Uniform-Cost Search (UCS)
    - A* search using your best heuristic (here assumed to be h3_manhattanDistance)
+   - IDA* search with the same heuristic
+   - Bidirectional search, uninformed and with Manhattan distance in both directions
+   - SMA* (memory-bounded A*) with Manhattan distance
 It collects and aggregates performance metrics (solution depth, expanded nodes, fringe size, execution time)
 and then prints the results.
 """
 
-import csv
-import time
+import batch
 import search
 from fifteenpuzzle import (
-    FifteenPuzzleState,
-    FifteenPuzzleSearchProblem,
-    createRandomFifteenPuzzle,
-    h3_manhattanDistance  # Assuming Manhattan is the best heuristic
+    h3_manhattanDistance,  # Assuming Manhattan is the best heuristic
+    manhattanHeuristicTo
 )
 
-def compareSearchStrategies(filename="scenarios.csv"):
+# Strategies run in worker processes, so they must be module-level functions.
+# 'limits' are the search.py budget keywords passed on by batch.runJob.
+def astarManhattan(problem, **limits):
+    return search.astar(problem, heuristic=h3_manhattanDistance, **limits)
+
+def idastarManhattan(problem, **limits):
+    return search.idastar(problem, heuristic=h3_manhattanDistance, **limits)
+
+def bidirectionalAStarManhattan(problem, **limits):
+    return search.bidirectional(problem, heuristic=h3_manhattanDistance,
+                                backwardHeuristic=manhattanHeuristicTo(problem.getStartState()),
+                                **limits)
+
+# SMA* node cap when the batch sets no state budget.
+SMA_MEMORY = 100000
+
+def smaStarManhattan(problem, maxStates=None, **limits):
+    # For SMA* the state budget is the memory cap it prunes to, not a stop.
+    return search.smastar(problem, heuristic=h3_manhattanDistance,
+                          maxStates=maxStates if maxStates is not None else SMA_MEMORY, **limits)
+
+STRATEGIES = [
+    (search.bfs, "BFS"),
+    (search.dfs, "DFS"),
+    (search.ucs, "UCS"),
+    (astarManhattan, "A* (Manhattan)"),
+    (idastarManhattan, "IDA* (Manhattan)"),
+    (search.bidirectional, "Bidirectional BFS"),
+    (bidirectionalAStarManhattan, "Bidirectional A* (Manhattan)"),
+    (smaStarManhattan, "SMA* (Manhattan)")
+]
+
+def compareSearchStrategies(filename="scenarios.csv", workers=None, resultsFile=None,
+                            timeout=None, nodeBudget=None, stateBudget=None, cacheFile=None,
+                            profile=False):
     """
     (Sprint #4)
-    Reads puzzle scenarios from 'filename' and compares the following search strategies:
-        - BFS, DFS, UCS, and A* (with the Manhattan heuristic).
+    Reads puzzle scenarios from 'filename' (CSV or binary) and compares the following search strategies:
+        - BFS, DFS, UCS, A* and IDA* (with the Manhattan heuristic),
+        - bidirectional BFS and bidirectional A*,
+        - SMA* (Manhattan) within a fixed node cap.
     For each strategy, it records:
         - Solution depth,
         - Number of expanded nodes,
         - Maximum fringe size,
+        - Peak number of nodes held in memory,
         - Execution time.
     Aggregated results are printed at the end.
-    """
-    from search import bfs, dfs, ucs, astar
 
-    # Define A* with the best heuristic as a lambda
-    def astar_best(problem):
-        return astar(problem, heuristic=h3_manhattanDistance)
+    The runs are spread over 'workers' processes by batch.runBatch. A 'timeout'
+    (seconds), 'nodeBudget' or 'stateBudget' stops a slow or memory-hungry
+    BFS/DFS run cleanly; it is reported as budget-exhausted rather than
+    unsolved. 'resultsFile' lets an interrupted run be resumed, and a
+    'cacheFile' (cache.py) answers scenarios solved optimally by earlier runs.
+    profile=True adds a per-strategy breakdown of search time by phase.
+    """
+    def report(result):
+        print(f"Scenario #{result['scenario']}, {batch.formatResult(result)}")
 
-    strategies = [
-        (bfs, "BFS"),
-        (dfs, "DFS"),
-        (ucs, "UCS"),
-        (astar_best, "A* (Manhattan)")
-    ]
-    
-    # Aggregator for overall stats
-    stats = {name: {"count": 0, "sumDepth": 0, "sumTime": 0.0, "sumExp": 0, "sumFringe": 0}
-             for (_, name) in strategies}
-    
-    with open(filename, "r") as fin:
-        reader = csv.reader(fin)
-        scenario_num = 0
-        for row in reader:
-            scenario_num += 1
-            tiles = [int(x) for x in row]
-            puzzleState = FifteenPuzzleState(tiles)
-            
-            print(f"\nScenario #{scenario_num}, puzzle:")
-            print(puzzleState)
-            
-            for (strategy_fn, strategy_name) in strategies:
-                problem = FifteenPuzzleSearchProblem(puzzleState)
-                start_time = time.time()
-                path = strategy_fn(problem)
-                elapsed = time.time() - start_time
-                
-                if path is None or len(path) == 0:
-                    print(f"  {strategy_name}: No solution found or zero moves.")
-                else:
-                    depth = len(path)
-                    expanded = problem.expanded_nodes
-                    fringe = problem.max_fringe
-                    print(f"  {strategy_name}: depth={depth}, expansions={expanded}, fringe={fringe}, time={elapsed:.3f}s")
-                    
-                    stats[strategy_name]["count"] += 1
-                    stats[strategy_name]["sumDepth"] += depth
-                    stats[strategy_name]["sumTime"] += elapsed
-                    stats[strategy_name]["sumExp"] += expanded
-                    stats[strategy_name]["sumFringe"] += fringe
-    
-    # Print aggregated results
-    print("\n=== Sprint #4: Aggregated Search Strategy Results ===")
-    for (_, name) in strategies:
-        count = stats[name]["count"]
-        if count == 0:
-            print(f" {name}: No solutions found.")
-        else:
-            avg_depth = stats[name]["sumDepth"] / count
-            avg_time = stats[name]["sumTime"] / count
-            avg_exp = stats[name]["sumExp"] / count
-            avg_fringe = stats[name]["sumFringe"] / count
-            print(f" {name}: #Solved={count}, avgDepth={avg_depth:.2f}, avgTime={avg_time:.3f}s, avgExp={avg_exp:.1f}, avgFringe={avg_fringe:.1f}")
+    results = batch.runBatch(filename, STRATEGIES, workers=workers, resultsFile=resultsFile,
+                             timeout=timeout, nodeBudget=nodeBudget, stateBudget=stateBudget,
+                             onResult=report, cacheFile=cacheFile, profile=profile)
+    batch.printAggregatedResults("Sprint #4: Aggregated Search Strategy Results", results,
+                                 [name for (_, name) in STRATEGIES])
+    if profile:
+        batch.printProfileBreakdown("Sprint #4", results, [name for (_, name) in STRATEGIES])
 
 def main():
-    compareSearchStrategies("scenarios.csv")
+    # Cap each run so an exhaustive BFS/DFS cannot stall the whole comparison
+    # or exhaust memory.
+    compareSearchStrategies("scenarios.csv", timeout=60, stateBudget=5 * 10**6)
 
 if __name__ == "__main__":
     main()
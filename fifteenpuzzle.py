@@ -8,16 +8,34 @@ Blank tile is 0, located in bottom-right for the goal state.
 We mark each sprint's changes using special comment blocks.
 """
 
+import csv
+import mmap
+import os
 import random
 import search
+import struct
 import time
+from slidingpuzzle import (
+    OPPOSITE_MOVES,
+    SlidingPuzzleBoard,
+    SlidingPuzzleSearchProblem,
+    SlidingPuzzleState,
+    geometryFor,
+    registerPuzzleClass,
+)
 
 ########################
 # /*=====Start Change Task 1=====*/
 ########################
 # SPRINT #1: Convert from 8-puzzle to 15-puzzle, blank in bottom-right.
 
-class FifteenPuzzleState:
+# The board tables live in slidingpuzzle.PuzzleGeometry; the 15-puzzle
+# classes below only fix the size to 4.
+GEOMETRY = geometryFor(4)
+GOAL_PACKED = GEOMETRY.goalPacked
+
+
+class FifteenPuzzleState(SlidingPuzzleState):
     """
     Represents a 4x4 sliding puzzle with tiles 1..15 plus blank=0.
     The goal state is:
@@ -25,106 +43,27 @@ class FifteenPuzzleState:
        5   6   7   8
        9  10  11  12
       13  14  15   0
+
+    The board is stored as a single int holding 16 nibbles: the tile at
+    row-major index i lives in bits 4*i .. 4*i+3. The packed int doubles as
+    hash and equality key, and the blank index is cached so moves never
+    rescan the board.
     """
 
-    def __init__(self, numbers):
-        """
-        numbers: list or tuple of length 16, containing numbers 0..15.
-        """
-        if len(numbers) != 16:
-            raise ValueError("FifteenPuzzleState needs exactly 16 numbers (0..15).")
-        self.size = 4
-        self.cells = []
-        idx = 0
-        for r in range(self.size):
-            row_list = []
-            for c in range(self.size):
-                row_list.append(numbers[idx])
-                idx += 1
-            self.cells.append(row_list)
-
-        # locate the blank tile (0)
-        for r in range(self.size):
-            for c in range(self.size):
-                if self.cells[r][c] == 0:
-                    self.blankLocation = (r, c)
-                    break
-
-    def isGoal(self):
-        """
-        Checks whether the puzzle is in the goal configuration.
-        Goal: 1..15 in row-major order with 0 in the bottom-right.
-        """
-        correct_val = 1
-        for r in range(self.size):
-            for c in range(self.size):
-                if (r, c) == (self.size - 1, self.size - 1):
-                    if self.cells[r][c] != 0:
-                        return False
-                else:
-                    if self.cells[r][c] != correct_val:
-                        return False
-                    correct_val += 1
-        return True
-
-    def legalMoves(self):
-        """
-        Returns a list of legal moves: 'up', 'down', 'left', and 'right'.
-        """
-        moves = []
-        r, c = self.blankLocation
-        if r > 0:
-            moves.append('up')
-        if r < self.size - 1:
-            moves.append('down')
-        if c > 0:
-            moves.append('left')
-        if c < self.size - 1:
-            moves.append('right')
-        return moves
-
-    def result(self, move):
-        """
-        Returns a new FifteenPuzzleState with the blank moved in the given direction.
-        """
-        r, c = self.blankLocation
-        if move == 'up':
-            nr, nc = r - 1, c
-        elif move == 'down':
-            nr, nc = r + 1, c
-        elif move == 'left':
-            nr, nc = r, c - 1
-        elif move == 'right':
-            nr, nc = r, c + 1
-        else:
-            raise ValueError("Invalid move: " + move)
-
-        # Flatten the cells for easy swapping
-        flat = [cell for row in self.cells for cell in row]
-        blank_idx = r * self.size + c
-        swap_idx = nr * self.size + nc
-        flat[blank_idx], flat[swap_idx] = flat[swap_idx], flat[blank_idx]
-        return FifteenPuzzleState(flat)
-
-    def __eq__(self, other):
-        return self.cells == other.cells
-
-    def __hash__(self):
-        return hash(tuple(tuple(row) for row in self.cells))
-
-    def __str__(self):
-        lines = []
-        lines.append("-" * 19)
-        for row in self.cells:
-            row_str = []
-            for val in row:
-                if val == 0:
-                    row_str.append("  ")
-                else:
-                    row_str.append(f"{val:2d}")
-            lines.append("| " + " ".join(row_str) + " |")
-        lines.append("-" * 19)
-        return "\n".join(lines)
+    __slots__ = ()
+    geometry = GEOMETRY
+    size = 4
+
+class FifteenPuzzleBoard(SlidingPuzzleBoard, FifteenPuzzleState):
+    """
+    Mutable board for depth-first searches: apply() and undo() slide a tile
+    in place, so a whole search tree can be walked with a single object.
+    Do not use it as a dict key while it is being changed.
+    """
+
+    __slots__ = ()
+
+registerPuzzleClass(FifteenPuzzleState, FifteenPuzzleBoard)
 
 def createRandomFifteenPuzzle(moves=50):
     """
@@ -142,33 +81,172 @@ def createRandomFifteenPuzzle(moves=50):
         puzzle = puzzle.result(chosen)
     return puzzle
 
-class FifteenPuzzleSearchProblem(search.SearchProblem):
+class FifteenPuzzleSearchProblem(SlidingPuzzleSearchProblem):
     """
     Wraps a FifteenPuzzleState into a search problem.
     Also maintains counters for expanded nodes and maximum fringe size.
     """
-    def __init__(self, puzzleState):
-        self.startState = puzzleState
-        self.expanded_nodes = 0
-        self.max_fringe = 0
+########################
+# /*=====End Change Task 1=====*/
+########################
 
-    def getStartState(self):
-        return self.startState
 
-    def isGoalState(self, state):
-        return state.isGoal()
+########################
+# /*=====Start Change Task 15=====*/
+########################
+# Permutation ranking, uniform solvable instances and scenario files.
 
-    def getSuccessors(self, state):
-        succs = []
-        for move in state.legalMoves():
-            next_state = state.result(move)
-            succs.append((next_state, move, 1))  # Each move costs 1
-        return succs
+def rankState(state):
+    """
+    Lehmer-code rank of the board (read row-major, blank as 0) among all
+    16! arrangements, in [0, 16!).
+    """
+    packed = state.packed
+    rank = 0
+    used = 0
+    for idx in range(16):
+        tile = (packed >> (4 * idx)) & 0xF
+        rank = rank * (16 - idx) + tile - (used & ((1 << tile) - 1)).bit_count()
+        used |= 1 << tile
+    return rank
+
+def unrankState(rank):
+    """
+    Inverse of rankState.
+    """
+    digits = [0] * 16
+    for idx in range(15, -1, -1):
+        rank, digits[idx] = divmod(rank, 16 - idx)
+    remaining = list(range(16))
+    return FifteenPuzzleState([remaining.pop(digit) for digit in digits])
+
+def isSolvable(tiles):
+    """
+    Parity test for a 4x4 board given as a flat row-major tile list; see
+    PuzzleGeometry.isSolvable.
+    """
+    return GEOMETRY.isSolvable(tiles)
+
+def randomSolvableFifteenPuzzle(rng=random):
+    """
+    Draws a board uniformly from the 16!/2 solvable states: a uniform
+    shuffle, with the first two tiles swapped if that lands on the
+    unsolvable half (the swap is a bijection between the halves).
+    """
+    tiles = list(range(16))
+    rng.shuffle(tiles)
+    if not isSolvable(tiles):
+        first, second = [idx for idx, tile in enumerate(tiles) if tile != 0][:2]
+        tiles[first], tiles[second] = tiles[second], tiles[first]
+    return FifteenPuzzleState(tiles)
+
+def iterRandomSolvablePuzzles(count, seed=None):
+    """
+    Yields 'count' independent uniform solvable boards without holding
+    them in memory.
+    """
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield randomSolvableFifteenPuzzle(rng)
 
-    def getCostOfActions(self, actions):
-        return len(actions)
+# Binary scenario files hold one little-endian 64-bit packed board per state.
+_SCENARIO_RECORD = struct.Struct("<Q")
+
+def writeScenarioFile(filename, states):
+    """
+    Writes states to 'filename': CSV (16 numbers per row) if the name ends
+    in .csv, otherwise the fixed-width binary format. 'states' may be any
+    iterable, e.g. iterRandomSolvablePuzzles(...).
+    """
+    if filename.endswith(".csv"):
+        with open(filename, "w", newline="") as fout:
+            writer = csv.writer(fout)
+            for state in states:
+                writer.writerow(state.tiles())
+    else:
+        with open(filename, "wb") as fout:
+            for state in states:
+                fout.write(_SCENARIO_RECORD.pack(state.packed))
+
+def readScenarioFile(filename):
+    """
+    Yields the states stored in a .csv or binary scenario file. Binary files
+    are memory-mapped and decoded lazily, one record at a time.
+    """
+    if filename.endswith(".csv"):
+        with open(filename, "r") as fin:
+            for row in csv.reader(fin):
+                if row:
+                    yield FifteenPuzzleState([int(x) for x in row])
+        return
+    with open(filename, "rb") as fin:
+        if os.fstat(fin.fileno()).st_size == 0:
+            return
+        data = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        if len(data) % _SCENARIO_RECORD.size:
+            raise ValueError(f"{filename} is not a binary scenario file")
+        for offset in range(0, len(data), _SCENARIO_RECORD.size):
+            yield FifteenPuzzleState.fromPacked(_SCENARIO_RECORD.unpack_from(data, offset)[0])
+    finally:
+        data.close()
 ########################
-# /*=====End Change Task 1=====*/
+# /*=====End Change Task 15=====*/
+########################
+
+
+########################
+# /*=====Start Change Task 21=====*/
+########################
+# Standard instance sets: Korf's instance file format and goal-anchored walks.
+
+def readKorfFile(filename):
+    """
+    Reads instances in the format of Korf's 100 random 15-puzzle instances
+    (Korf 1985): one per line, an optional instance number, 16 numbers and
+    optionally further columns such as the optimal length. Lines starting
+    with '#' are skipped.
+
+    Korf's goal has the blank in the top-left corner and tile t in cell t.
+    Turning the board by 180 degrees and relabelling tile t as 16 - t maps
+    it onto this repo's goal and keeps every optimal solution length, so
+    each board is converted that way.
+    """
+    states = []
+    with open(filename, "r") as fin:
+        for line in fin:
+            if line.startswith("#"):
+                continue
+            numbers = [int(x) for x in line.replace(",", " ").split()]
+            if not numbers:
+                continue
+            if len(numbers) >= 17 and sorted(numbers[1:17]) == list(range(16)):
+                numbers = numbers[1:17]
+            else:
+                numbers = numbers[:16]
+            if sorted(numbers) != list(range(16)):
+                raise ValueError(f"{filename}: not a 15-puzzle instance: {line.strip()}")
+            tiles = [0] * 16
+            for pos, tile in enumerate(numbers):
+                tiles[15 - pos] = 16 - tile if tile else 0
+            states.append(FifteenPuzzleState(tiles))
+    return states
+
+def randomWalkFifteenPuzzle(moves, rng=random):
+    """
+    Applies 'moves' random moves to the goal, never undoing the previous
+    move. The optimal distance is at most 'moves' and has the same parity.
+    """
+    puzzle = FifteenPuzzleState(list(range(1, 16)) + [0])
+    previous = None
+    for _ in range(moves):
+        possible = [move for move in puzzle.legalMoves() if move != OPPOSITE_MOVES.get(previous)]
+        previous = rng.choice(possible)
+        puzzle = puzzle.result(previous)
+    return puzzle
+
+########################
+# /*=====End Change Task 21=====*/
 ########################
 
 
@@ -177,36 +255,58 @@ class FifteenPuzzleSearchProblem(search.SearchProblem):
 ########################
 # SPRINT #2: Implement four admissible heuristics (h1, h2, h3, h4).
 
+def _tileTable(cost, geometry=GEOMETRY):
+    """
+    Builds table[tile][pos] = cost(tile, goal_r, goal_c, r, c) for every
+    tile (0 = blank) and position of the board (4x4 by default).
+    """
+    return geometry.tileTable(cost)
+
+# Per-tile-per-position contributions of h1, h3 and h4.
+def _misplacedCost(t, gr, gc, r, c):
+    return int((r, c) != (gr, gc))
+
+def _manhattanCost(t, gr, gc, r, c):
+    return abs(r - gr) + abs(c - gc) if t else 0
+
+def _rowColCost(t, gr, gc, r, c):
+    return int(r != gr) + int(c != gc) if t else 0
+
+MISPLACED_TABLE = _tileTable(_misplacedCost)
+MANHATTAN_TABLE = _tileTable(_manhattanCost)
+ROWCOL_TABLE = _tileTable(_rowColCost)
+
+def _tableSum(table, state):
+    geometry = state.geometry
+    bits = geometry.bits
+    mask = geometry.mask
+    packed = state.packed
+    total = 0
+    for pos in range(geometry.cells):
+        total += table[(packed >> (bits * pos)) & mask][pos]
+    return total
+
 def h1_misplacedTiles(state, problem=None):
     """
     h1: Counts the number of tiles not in the correct position.
     """
-    size = 4
-    count = 0
-    goal_val = 1
-    for r in range(size):
-        for c in range(size):
-            if r == size - 1 and c == size - 1:
-                if state.cells[r][c] != 0:
-                    count += 1
-            else:
-                if state.cells[r][c] != goal_val:
-                    count += 1
-                goal_val += 1
-    return count
+    tables = _SIZE_TABLES.get(state.size) or heuristicTables(state.geometry)
+    return _tableSum(tables.misplaced, state)
 
 def h2_euclideanDistance(state, problem=None):
     """
     h2: Returns the sum of Euclidean distances of each tile from its goal position.
     """
     dist_sum = 0
-    size = 4
+    geometry = state.geometry
+    size = geometry.size
+    tiles = state.tiles()
     for r in range(size):
         for c in range(size):
-            val = state.cells[r][c]
+            val = tiles[r * size + c]
             if val != 0:
-                goal_r = (val - 1) // size
-                goal_c = (val - 1) % size
+                goal_r = geometry.goalRow[val]
+                goal_c = geometry.goalCol[val]
                 dist_sum += ((r - goal_r)**2 + (c - goal_c)**2)**0.5
     return dist_sum
 
@@ -214,40 +314,298 @@ def h3_manhattanDistance(state, problem=None):
     """
     h3: Returns the sum of Manhattan distances of each tile from its goal position.
     """
-    dist_sum = 0
-    size = 4
-    for r in range(size):
-        for c in range(size):
-            val = state.cells[r][c]
-            if val != 0:
-                goal_r = (val - 1) // size
-                goal_c = (val - 1) % size
-                dist_sum += abs(r - goal_r) + abs(c - goal_c)
-    return dist_sum
+    tables = _SIZE_TABLES.get(state.size) or heuristicTables(state.geometry)
+    return _tableSum(tables.manhattan, state)
 
 def h4_rowColDifference(state, problem=None):
     """
     h4: Returns the number of tiles out of their correct row plus those out of their correct column.
     """
-    size = 4
-    out_row = 0
-    out_col = 0
-    for r in range(size):
-        for c in range(size):
-            val = state.cells[r][c]
-            if val != 0:
-                goal_r = (val - 1) // size
-                goal_c = (val - 1) % size
-                if r != goal_r:
-                    out_row += 1
-                if c != goal_c:
-                    out_col += 1
-    return out_row + out_col
+    tables = _SIZE_TABLES.get(state.size) or heuristicTables(state.geometry)
+    return _tableSum(tables.rowCol, state)
 ########################
 # /*=====End Change Task 2=====*/
 ########################
 
 
+########################
+# /*=====Start Change Task 9=====*/
+########################
+# Incremental heuristics: a heuristic may expose
+#     heuristic.delta(parent_h, moved_tile, from_pos, to_pos) -> child_h
+# where moved_tile slides from from_pos into the blank at to_pos (so the
+# blank goes from to_pos to from_pos). Searches that see a delta use
+# getSuccessorsWithHeuristic instead of rescoring all 16 cells per child.
+
+def _tableDelta(table):
+    blank_row = table[0]
+    def delta(parent_h, tile, from_pos, to_pos):
+        row = table[tile]
+        return (parent_h + row[to_pos] - row[from_pos]
+                + blank_row[from_pos] - blank_row[to_pos])
+    return delta
+
+h1_misplacedTiles.delta = _tableDelta(MISPLACED_TABLE)
+h3_manhattanDistance.delta = _tableDelta(MANHATTAN_TABLE)
+h4_rowColDifference.delta = _tableDelta(ROWCOL_TABLE)
+########################
+# /*=====End Change Task 9=====*/
+########################
+
+
+########################
+# /*=====Start Change Task 10=====*/
+########################
+# Linear conflict and walking distance, both read precomputed lookup tables.
+
+def _lineConflictCost(codes):
+    """
+    Extra moves needed by the tiles of one line that belong in it: 2 for
+    every tile that must leave the line so the rest are in goal order.
+    codes[i] is the goal index along the line of the tile in cell i, or
+    None if that tile belongs elsewhere.
+    """
+    order = [code for code in codes if code is not None]
+    # Longest increasing subsequence of the goal indexes.
+    longest = [1] * len(order)
+    for i in range(len(order)):
+        for j in range(i):
+            if order[j] < order[i] and longest[j] + 1 > longest[i]:
+                longest[i] = longest[j] + 1
+    return 2 * (len(order) - max(longest, default=0))
+
+# A line of n cells is keyed by one base-(n+1) digit per cell: the goal
+# index along the line of a tile that belongs to it, or n otherwise.
+def _lineConflictTable(size):
+    base = size + 1
+    table = []
+    for key in range(base ** size):
+        digits = [(key // base ** i) % base for i in range(size)]
+        table.append(_lineConflictCost([d if d < size else None for d in digits]))
+    return table
+
+# ROW_LINE_KEY[tile][pos]: the tile's contribution to the key of its row.
+def _lineKeyTables(geometry):
+    size = geometry.size
+    base = size + 1
+    rows = _tileTable(lambda t, gr, gc, r, c: (gc if t and r == gr else size) * base ** c, geometry)
+    cols = _tileTable(lambda t, gr, gc, r, c: (gr if t and c == gc else size) * base ** r, geometry)
+    return rows, cols
+
+LINE_CONFLICT_TABLE = _lineConflictTable(4)
+ROW_LINE_KEY, COL_LINE_KEY = _lineKeyTables(GEOMETRY)
+
+def h5_linearConflict(state, problem=None):
+    """
+    h5: Manhattan distance plus 2 for each tile that must leave its goal row
+    or column to let the other tiles in that line pass.
+    """
+    tables = _SIZE_TABLES.get(state.size) or heuristicTables(state.geometry)
+    manhattan = tables.manhattan
+    row_line_key = tables.rowLineKey
+    col_line_key = tables.colLineKey
+    line_conflict = tables.lineConflict
+    size = state.size
+    bits = state.geometry.bits
+    mask = state.geometry.mask
+    packed = state.packed
+    row_keys = [0] * size
+    col_keys = [0] * size
+    dist_sum = 0
+    for pos in range(size * size):
+        tile = (packed >> (bits * pos)) & mask
+        dist_sum += manhattan[tile][pos]
+        row_keys[pos // size] += row_line_key[tile][pos]
+        col_keys[pos % size] += col_line_key[tile][pos]
+    for key in row_keys:
+        dist_sum += line_conflict[key]
+    for key in col_keys:
+        dist_sum += line_conflict[key]
+    return dist_sum
+
+# Walking distance (Takahashi): for the vertical part a state is the 4x4
+# matrix "how many tiles in row r belong to goal row g" plus the blank's
+# row; a move carries one tile from the blank's neighbouring row into the
+# blank's row. The minimum number of such moves to reach the goal matrix is
+# a lower bound on vertical moves. Columns are symmetric, so one table
+# serves both. Each count (0..4) takes 3 bits; the blank row sits above.
+_WD_BLANK_SHIFT = 48
+WD_ROW_KEY = _tileTable(lambda t, gr, gc, r, c: 1 << (3 * (4 * r + gr)) if t else 0)
+WD_COL_KEY = _tileTable(lambda t, gr, gc, r, c: 1 << (3 * (4 * c + gc)) if t else 0)
+_walking_distance_table = None
+
+def _buildWalkingDistanceTable():
+    """
+    Breadth-first search over row-count matrices from the goal matrix.
+    Returns {key: moves}.
+    """
+    goal = sum(1 << (3 * (4 * g + g)) for g in range(4) for _ in range(4 if g < 3 else 3))
+    goal |= 3 << _WD_BLANK_SHIFT
+    table = {goal: 0}
+    layer = [goal]
+    depth = 0
+    while layer:
+        depth += 1
+        next_layer = []
+        for key in layer:
+            blank_row = key >> _WD_BLANK_SHIFT
+            counts = key & ((1 << _WD_BLANK_SHIFT) - 1)
+            for other in (blank_row - 1, blank_row + 1):
+                if not 0 <= other < 4:
+                    continue
+                for g in range(4):
+                    if (counts >> (3 * (4 * other + g))) & 7:
+                        moved = counts - (1 << (3 * (4 * other + g))) + (1 << (3 * (4 * blank_row + g)))
+                        new_key = moved | (other << _WD_BLANK_SHIFT)
+                        if new_key not in table:
+                            table[new_key] = depth
+                            next_layer.append(new_key)
+        layer = next_layer
+    return table
+
+def walkingDistanceTable():
+    """
+    Returns the walking distance table, building it on first use.
+    """
+    global _walking_distance_table
+    if _walking_distance_table is None:
+        _walking_distance_table = _buildWalkingDistanceTable()
+    return _walking_distance_table
+
+def h6_walkingDistance(state, problem=None):
+    """
+    h6: Walking distance, the vertical plus horizontal lower bounds read
+    from the precomputed row-count table. 4x4 boards only.
+    """
+    if state.size != 4:
+        raise ValueError("h6_walkingDistance only has tables for the 4x4 board.")
+    table = _walking_distance_table or walkingDistanceTable()
+    packed = state.packed
+    row_key = 0
+    col_key = 0
+    for pos in range(16):
+        tile = (packed >> (4 * pos)) & 0xF
+        row_key += WD_ROW_KEY[tile][pos]
+        col_key += WD_COL_KEY[tile][pos]
+    blank = state.blank
+    return (table[row_key | ((blank >> 2) << _WD_BLANK_SHIFT)]
+            + table[col_key | ((blank & 3) << _WD_BLANK_SHIFT)])
+########################
+# /*=====End Change Task 10=====*/
+########################
+
+
+########################
+# /*=====Start Change Task 13=====*/
+########################
+# Heuristics towards an arbitrary target, for the backward half of
+# bidirectional search (which heads for the start state, not the goal).
+
+def manhattanHeuristicTo(target):
+    """
+    Returns a heuristic (state, problem) -> sum of Manhattan distances of
+    each tile from its cell in 'target'. It supports incremental deltas.
+    """
+    geometry = target.geometry
+    target_r = [0] * geometry.cells
+    target_c = [0] * geometry.cells
+    for pos, tile in enumerate(target.tiles()):
+        target_r[tile], target_c[tile] = divmod(pos, geometry.size)
+    table = _tileTable(lambda t, gr, gc, r, c:
+                       abs(r - target_r[t]) + abs(c - target_c[t]) if t else 0, geometry)
+
+    def heuristic(state, problem=None):
+        return _tableSum(table, state)
+    heuristic.delta = _tableDelta(table)
+    return heuristic
+########################
+# /*=====End Change Task 13=====*/
+########################
+
+
+########################
+# /*=====Start Change Task 22=====*/
+########################
+# Heuristic tables for every board size. h1..h5 read the tables of the
+# state's size from here, so they work on the 8-, 15- and 24-puzzle alike.
+# A size-specific delta is picked by heuristic.deltaFor(geometry).
+
+class HeuristicTables:
+    """
+    Lookup tables of h1..h5 and the incremental deltas of h1, h3 and h4
+    for one board size. Use heuristicTables(geometry) to get them.
+    """
+
+    def __init__(self, geometry):
+        self.geometry = geometry
+        self.misplaced = _tileTable(_misplacedCost, geometry)
+        self.manhattan = _tileTable(_manhattanCost, geometry)
+        self.rowCol = _tileTable(_rowColCost, geometry)
+        self.lineConflict = _lineConflictTable(geometry.size)
+        self.rowLineKey, self.colLineKey = _lineKeyTables(geometry)
+        self.deltas = {
+            h1_misplacedTiles: _tableDelta(self.misplaced),
+            h3_manhattanDistance: _tableDelta(self.manhattan),
+            h4_rowColDifference: _tableDelta(self.rowCol),
+        }
+
+_SIZE_TABLES = {}
+
+def heuristicTables(geometry):
+    """
+    Returns the HeuristicTables of a board size, building them once.
+    """
+    tables = _SIZE_TABLES.get(geometry.size)
+    if tables is None:
+        tables = _SIZE_TABLES[geometry.size] = HeuristicTables(geometry)
+    return tables
+
+def _deltaFor(heuristic):
+    return lambda geometry: heuristicTables(geometry).deltas[heuristic]
+
+for _heuristic in (h1_misplacedTiles, h3_manhattanDistance, h4_rowColDifference):
+    _heuristic.deltaFor = _deltaFor(_heuristic)
+heuristicTables(GEOMETRY)
+########################
+# /*=====End Change Task 22=====*/
+########################
+
+########################
+# /*=====Start Change Task 29=====*/
+########################
+# Operator-selection tables for partial-expansion A*: the f change of
+# every move, per tile, without generating the child.
+
+def operatorTable(delta, geometry):
+    """
+    osf[blank]: (move, swap cell, df) for every legal move, where df[tile]
+    is 1 + the change in h when that tile slides into the blank. Needs an
+    additive delta (a table lookup, as h3 and h4 have).
+    """
+    return [tuple((move, swap, tuple(1 + delta(0, tile, swap, blank)
+                                     for tile in range(geometry.cells)))
+                  for move, swap in geometry.moveTargets[blank].items())
+            for blank in range(geometry.cells)]
+
+_OPERATOR_TABLES = {}
+
+def _operatorTableFor(heuristic):
+    def operatorTableFor(geometry):
+        key = (heuristic, geometry.size)
+        if key not in _OPERATOR_TABLES:
+            _OPERATOR_TABLES[key] = operatorTable(heuristic.deltaFor(geometry), geometry)
+        return _OPERATOR_TABLES[key]
+    return operatorTableFor
+
+# Not h1: it counts the blank, so a move can lower f and the table's
+# single df per move would miss children. EPEA* scores h1 children directly.
+for _heuristic in (h3_manhattanDistance, h4_rowColDifference):
+    _heuristic.operatorTableFor = _operatorTableFor(_heuristic)
+########################
+# /*=====End Change Task 29=====*/
+########################
+
+
 def demoTest():
     puzzle = createRandomFifteenPuzzle(moves=50)
     print("Random 15-puzzle (harder):\n", puzzle)
@@ -258,7 +616,9 @@ def demoTest():
         (h1_misplacedTiles, "h1_misplaced"),
         (h2_euclideanDistance, "h2_euclid"),
         (h3_manhattanDistance, "h3_manhattan"),
-        (h4_rowColDifference, "h4_rowCol")
+        (h4_rowColDifference, "h4_rowCol"),
+        (h5_linearConflict, "h5_linearConflict"),
+        (h6_walkingDistance, "h6_walkingDist")
     ]
 
     for (hfn, name) in heuristics:
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+fsm.py
+
+Finite-state machine duplicate pruning for depth-first searches on the
+sliding puzzles (Taylor and Korf).
+
+A breadth-first enumeration of blank move strings on an unbounded board
+finds the "forbidden" strings: those with the same effect as a shorter
+string, or as a lexicographically smaller one of the same length, whose
+blank stays inside the rows and columns the forbidden string visits (so
+the replacement is legal wherever the forbidden string is). Every path
+through a forbidden string can be swapped for a smaller one, so pruning
+them keeps at least one optimal path to every state.
+
+The forbidden strings are compiled into an Aho-Corasick automaton and
+stored as a transition table: table[state][move] is the next state, or
+-1 when the move completes a forbidden string. A search keeps one FSM
+state per node and looks up one entry per move, with no closed list.
+Only searches without a closed list (IDA*) may use it: with one, the
+state a duplicate is dropped at keeps the FSM state of the first path to
+reach it, and states only reachable through the other path can be lost.
+
+The enumeration takes about a minute for 12-move strings, so the table
+is built offline and shipped as fsm.json, which defaultFsm() loads.
+Rebuild it with:
+    python fsm.py build --length 12 --out fsm.json
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import deque
+
+MOVES = ('up', 'down', 'left', 'right')
+STEPS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+DEFAULT_LENGTH = 12
+DEFAULT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fsm.json")
+
+
+def forbiddenStrings(maxLength=DEFAULT_LENGTH):
+    """
+    Minimal forbidden move strings of up to maxLength moves, as tuples of
+    indices into MOVES. No proper substring of one is itself forbidden.
+    """
+    # Each string is (moves, blank, displaced tiles: cell -> home cell,
+    # bounding box of the blank's path). Tiles are named by home cell.
+    seen = {((0, 0), frozenset()): [(0, 0, 0, 0)]}
+    forbidden = set()
+    layer = [((), (0, 0), {}, (0, 0, 0, 0))]
+    for _ in range(maxLength):
+        next_layer = []
+        for moves, blank, board, box in layer:
+            for move, (dr, dc) in enumerate(STEPS):
+                string = moves + (move,)
+                # Strings ending in a forbidden one are already pruned.
+                if any(string[i:] in forbidden for i in range(1, len(string) - 1)):
+                    continue
+                target = (blank[0] + dr, blank[1] + dc)
+                child = dict(board)
+                tile = child.pop(target, target)
+                if tile != blank:
+                    child[blank] = tile
+                child_box = (min(box[0], target[0]), max(box[1], target[0]),
+                             min(box[2], target[1]), max(box[3], target[1]))
+                key = (target, frozenset(child.items()))
+                boxes = seen.setdefault(key, [])
+                if any(b[0] >= child_box[0] and b[1] <= child_box[1]
+                       and b[2] >= child_box[2] and b[3] <= child_box[3] for b in boxes):
+                    forbidden.add(string)
+                    continue
+                boxes.append(child_box)
+                next_layer.append((string, target, child, child_box))
+        layer = next_layer
+    return sorted(forbidden, key=lambda s: (len(s), s))
+
+
+class PruningFsm:
+    """
+    Transition table over MOVES built from forbidden strings. State 0 is
+    the start; step(state, move) returns the next state or -1.
+    """
+
+    def __init__(self, table, maxLength=None):
+        self.table = table
+        self.maxLength = maxLength
+        self.moveIndex = {move: idx for idx, move in enumerate(MOVES)}
+
+    @classmethod
+    def fromStrings(cls, strings, maxLength=None):
+        """
+        Aho-Corasick automaton of 'strings', with the states that end a
+        forbidden string removed and the rest renumbered.
+        """
+        goto = [[-1] * len(MOVES)]
+        dead = [False]
+        for string in strings:
+            node = 0
+            for move in string:
+                if goto[node][move] < 0:
+                    goto[node][move] = len(goto)
+                    goto.append([-1] * len(MOVES))
+                    dead.append(False)
+                node = goto[node][move]
+            dead[node] = True
+
+        # Breadth-first over the trie: fill missing transitions from the
+        # failure state, which is shallower and so already complete.
+        fail = [0] * len(goto)
+        queue = deque()
+        for move in range(len(MOVES)):
+            child = goto[0][move]
+            if child < 0:
+                goto[0][move] = 0
+            else:
+                queue.append(child)
+        while queue:
+            node = queue.popleft()
+            dead[node] = dead[node] or dead[fail[node]]
+            for move in range(len(MOVES)):
+                child = goto[node][move]
+                if child < 0:
+                    goto[node][move] = goto[fail[node]][move]
+                else:
+                    fail[child] = goto[fail[node]][move]
+                    queue.append(child)
+
+        # Keep the live states reachable from the start.
+        number = {0: 0}
+        order = [0]
+        for node in order:
+            for move in range(len(MOVES)):
+                child = goto[node][move]
+                if not dead[child] and child not in number:
+                    number[child] = len(order)
+                    order.append(child)
+        table = [[number[child] if not dead[child] else -1 for child in goto[node]]
+                 for node in order]
+        return cls(table, maxLength)
+
+    @classmethod
+    def build(cls, maxLength=DEFAULT_LENGTH):
+        return cls.fromStrings(forbiddenStrings(maxLength), maxLength)
+
+    def step(self, state, move):
+        """
+        Next FSM state after the named move, or -1 if the move is pruned.
+        """
+        return self.table[state][self.moveIndex[move]]
+
+    def run(self, moves, state=0):
+        """
+        FSM state after a sequence of moves (-1 once one is pruned).
+        """
+        for move in moves:
+            if state < 0:
+                break
+            state = self.step(state, move)
+        return state
+
+    def __len__(self):
+        return len(self.table)
+
+    def save(self, filename):
+        with open(filename, "w") as f:
+            json.dump({"moves": MOVES, "maxLength": self.maxLength, "table": self.table}, f)
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename) as f:
+            data = json.load(f)
+        if tuple(data["moves"]) != MOVES:
+            raise ValueError(filename + " was built for a different move order.")
+        return cls(data["table"], data.get("maxLength"))
+
+
+_DEFAULT = {}
+
+def defaultFsm(filename=DEFAULT_FILE):
+    """
+    The prebuilt FSM in 'filename', loaded on first use and shared
+    afterwards. If the file is missing it is built (DEFAULT_LENGTH) and
+    saved there, so only the first run pays for the enumeration.
+    """
+    if filename not in _DEFAULT:
+        if os.path.exists(filename):
+            _DEFAULT[filename] = PruningFsm.load(filename)
+        else:
+            fsm = PruningFsm.build(DEFAULT_LENGTH)
+            try:
+                fsm.save(filename)
+            except OSError:
+                pass
+            _DEFAULT[filename] = fsm
+    return _DEFAULT[filename]
+
+
+def generatedPerDepth(state, depth, fsm=None):
+    """
+    Nodes generated at each depth 1..depth by a depth-first enumeration
+    from 'state' that only skips the move undoing the last one, or, with an
+    fsm, every move the FSM prunes.
+    """
+    counts = [0] * (depth + 1)
+    opposite = {'up': 'down', 'down': 'up', 'left': 'right', 'right': 'left'}
+
+    def visit(board, g, skip, fsm_state):
+        if g == depth:
+            return
+        for move in board.legalMoves():
+            if fsm is not None:
+                next_state = fsm.step(fsm_state, move)
+                if next_state < 0:
+                    continue
+            elif move == skip:
+                continue
+            else:
+                next_state = 0
+            counts[g + 1] += 1
+            visit(board.result(move), g + 1, opposite[move], next_state)
+
+    visit(state, 0, None, 0)
+    return counts[1:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the duplicate-pruning FSM.")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--length", type=int, default=DEFAULT_LENGTH,
+                        help="longest move string enumerated")
+    parser.add_argument("--out", default="fsm.json")
+    args = parser.parse_args()
+    start = time.time()
+    strings = forbiddenStrings(args.length)
+    fsm = PruningFsm.fromStrings(strings, args.length)
+    fsm.save(args.out)
+    print(f"{len(strings)} forbidden strings, {len(fsm)} states, "
+          f"{time.time() - start:.1f}s -> {args.out}")
+
+if __name__ == "__main__":
+    main()
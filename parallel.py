@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+"""
+parallel.py
+
+Parallel searches for single hard instances: IDA* with the tree split
+across a process pool, and hash-distributed A* (HDA*, further down).
+
+The root is expanded depth-first to a split depth, in the move order the
+sequential search uses, and the nodes at that depth become subtrees. Every
+iteration hands the subtrees that fit under the current f-bound to a
+process pool as separate jobs; idle workers pick up the next one, so long
+and short subtrees balance out. Each worker runs the ordinary IDA* contour
+(search._idaContour) below its subtree root.
+
+The f-bound is shared by the coordinator: an iteration ends when every
+subtree has finished, and the next bound is the smallest f that exceeded
+the current one anywhere. A goal found under bound B is optimal (no cheaper
+one existed under the previous bound), so the search stops in that
+iteration. Workers share the index of the leftmost subtree that found a
+goal and abandon any subtree to its right, while subtrees to its left run
+to the end; the returned path is therefore the first solution in the
+sequential depth-first order, the same one idaStarSearch returns.
+"""
+
+import multiprocessing
+import os
+import queue
+import time
+from concurrent.futures import ProcessPoolExecutor
+import search
+import util
+from slidingpuzzle import SlidingPuzzleSearchProblem, puzzleClass
+
+# Aim for this many subtrees per worker when the split depth is automatic.
+SUBTREES_PER_WORKER = 16
+_NONE_FOUND = 2 ** 31 - 1
+
+# Per-process state set by _initWorker.
+_worker = {}
+
+
+class _SubtreeLimits:
+    """
+    search.SearchLimits stand-in for one subtree job: stops it when a
+    subtree to its left has found a goal, or when the node budget or the
+    deadline is reached. The shared flag and the clock are read every 1024
+    expansions.
+    """
+    def __init__(self, index, found, maxNodes, deadline):
+        self.index = index
+        self.found = found
+        self.maxNodes = maxNodes
+        self.deadline = deadline
+        self.calls = 0
+
+    def exceeded(self, expanded, stored):
+        if self.maxNodes is not None and expanded >= self.maxNodes:
+            return "nodes"
+        self.calls += 1
+        if (self.calls & 1023) == 1:
+            if self.found.value < self.index:
+                return "stopped"
+            if self.deadline is not None and time.time() >= self.deadline:
+                return "time"
+        return None
+
+def _initWorker(size, heuristic, found):
+    _worker["size"] = size
+    _worker["heuristic"] = heuristic
+    _worker["found"] = found
+
+def _searchSubtree(index, packed, blank, path, bound, maxNodes, deadline):
+    """
+    Runs one IDA* contour below a subtree root. Returns (index, next_bound,
+    expanded, deepest, solution, limit): solution is the full action list
+    if a goal was found, limit the name of the limit that stopped the job.
+    """
+    cls = puzzleClass(_worker["size"])
+    problem = SlidingPuzzleSearchProblem(cls.fromPacked(packed, blank))
+    board = problem.getMutableStartState()
+    path = list(path)
+    found = _worker["found"]
+    limits = _SubtreeLimits(index, found, maxNodes, deadline)
+    try:
+        next_bound, expanded, deepest = search._idaContour(
+            problem, board, _worker["heuristic"], bound, len(path), path, limits)
+    except search._LimitReached as stop:
+        return index, None, stop.expanded, stop.deepest, None, stop.limit
+    if next_bound is not None:
+        return index, next_bound, expanded, deepest, None, None
+    with found.get_lock():
+        if index < found.value:
+            found.value = index
+    return index, None, expanded, deepest, path, None
+
+
+def splitRoot(problem, heuristic, depth):
+    """
+    Depth-first expansion of the start state to 'depth' moves, skipping
+    moves that undo the previous one, as IDA* does. Returns the subtree
+    roots in depth-first order as (path, packed, blank, fs), where fs are
+    the f-values along the path from the start (inclusive). A goal above
+    the split depth becomes a root of its own, since IDA* stops there.
+    """
+    board = problem.getMutableStartState()
+    inverse = problem.inverseAction
+    roots = []
+    path = []
+    fs = []
+
+    def walk(g):
+        fs.append(g + heuristic(board, problem))
+        if g == depth or problem.isGoalState(board):
+            roots.append((list(path), board.packed, board.blank, list(fs)))
+        else:
+            skip = inverse(path[-1]) if path else None
+            for action in board.legalMoves():
+                if action == skip:
+                    continue
+                board.apply(action)
+                path.append(action)
+                walk(g + 1)
+                path.pop()
+                board.undo(action)
+        fs.pop()
+
+    walk(0)
+    return roots
+
+def _autoSplitDepth(problem, heuristic, workers):
+    """
+    The smallest depth whose subtree count reaches SUBTREES_PER_WORKER per
+    worker.
+    """
+    depth = 0
+    while len(splitRoot(problem, heuristic, depth)) < SUBTREES_PER_WORKER * workers and depth < 12:
+        depth += 1
+    return depth
+
+def parallelIdaStarSearch(problem, heuristic=search.nullHeuristic, workers=None, splitDepth=None,
+                          maxNodes=None, maxTime=None, maxStates=None, tracer=None):
+    """
+    IDA* with the subtrees below splitDepth searched in 'workers'
+    processes (default: one per CPU). splitDepth defaults to the smallest
+    depth that gives SUBTREES_PER_WORKER subtrees per worker.
+
+    Takes the same limits as the other searches: maxTime and maxNodes stop
+    all workers (each contour splits the remaining node budget evenly
+    across its subtree jobs),
+    maxStates caps the number of subtree roots plus the deepest path.
+    The heuristic is sent to the worker processes, so it must pickle: a
+    module-level function or an object such as PatternDatabaseHeuristic.
+    Returns a search.SearchResult whose path equals idaStarSearch's; its
+    expansion count covers the nodes below the split depth.
+    """
+    workers = workers or os.cpu_count() or 1
+    start_time = time.time()
+    deadline = None if maxTime is None else start_time + maxTime
+    start = problem.getStartState()
+    if splitDepth is None:
+        splitDepth = _autoSplitDepth(problem, heuristic, workers)
+    roots = splitRoot(problem, heuristic, splitDepth)
+    bound = roots[0][3][0]
+    total = 0
+    max_fringe = 0
+    if maxStates is not None and len(roots) > maxStates:
+        return search._finish(problem, [], search.BUDGET_EXHAUSTED, start_time, 0, 0, len(roots),
+                              "states", bound=bound)
+
+    found = multiprocessing.Value('i', _NONE_FOUND)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_initWorker,
+                             initargs=(start.size, heuristic, found)) as pool:
+        while True:
+            next_bound = float("inf")
+            ready = []
+            for index, (path, packed, blank, fs) in enumerate(roots):
+                over = [f for f in fs if f > bound]
+                if over:
+                    # Sequential IDA* would cut this path at its first f over the bound.
+                    next_bound = min(next_bound, over[0])
+                    continue
+                ready.append((index, path, packed, blank))
+            # Each job gets an equal share of the remaining node budget, so a
+            # contour cannot overrun maxNodes by running all jobs at once.
+            budget = None if maxNodes is None else max((maxNodes - total) // max(len(ready), 1), 1)
+            jobs = [(index, pool.submit(_searchSubtree, index, packed, blank, path, bound,
+                                        budget, deadline))
+                    for index, path, packed, blank in ready]
+
+            solutions = {}
+            limit = None
+            contour = 0
+            for index, job in jobs:
+                if job.cancelled():
+                    continue
+                _, job_bound, expanded, deepest, solution, job_limit = job.result()
+                contour += expanded
+                max_fringe = max(max_fringe, deepest + 1)
+                if solution is not None:
+                    solutions[index] = solution
+                elif job_bound is not None:
+                    next_bound = min(next_bound, job_bound)
+                if job_limit in ("nodes", "time"):
+                    limit = job_limit
+                if maxNodes is not None and total + contour >= maxNodes and not solutions:
+                    limit = "nodes"
+                # Jobs right of a solution, or any left once a limit is hit, are not needed.
+                stop_after = -1 if limit is not None else found.value
+                for other, pending in jobs:
+                    if other > stop_after:
+                        pending.cancel()
+            total += contour
+            problem.expanded_nodes += contour
+            if tracer is not None:
+                tracer.expanded += contour
+                tracer.layers[bound] = contour
+
+            if solutions:
+                path = solutions[min(solutions)]
+                return search._finish(problem, path, search.SOLVED, start_time, total, max_fringe,
+                                      len(roots) + max_fringe, optimal=True)
+            if limit is not None:
+                return search._finish(problem, [], search.BUDGET_EXHAUSTED, start_time, total,
+                                      max_fringe, len(roots) + max_fringe, limit, bound=bound)
+            if next_bound == float("inf"):
+                return search._finish(problem, [], search.UNSOLVABLE, start_time, total,
+                                      max_fringe, len(roots) + max_fringe)
+            bound = next_bound
+
+
+# Hash-distributed A* (HDA*): every state has an owner process, chosen by a
+# hash of its packed board. Each worker keeps the open and closed lists of
+# the states it owns, expands its own best nodes and sends the children it
+# does not own to their owners in batches. A goal a worker expands becomes
+# the incumbent once the coordinator has broadcast its cost; workers then
+# drop nodes with f >= incumbent.
+#
+# Termination (Mattern's four-counter method): the coordinator sends probe
+# waves; each worker answers with whether it is idle (nothing left below
+# the incumbent, all batches sent) and how many batches it has sent and
+# received. When two waves in a row find every worker idle and the same,
+# equal sent and received totals, no batch is in flight and no worker
+# holds a node that could beat the incumbent, so the incumbent is optimal.
+
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+def hashOwner(packed, workers):
+    """
+    The worker that owns a packed state: a multiplicative hash, so owners
+    do not depend on a single cell.
+    """
+    folded = (packed ^ (packed >> 64)) & _MASK64
+    return (((folded * _HASH_MULTIPLIER) & _MASK64) >> 32) % workers
+
+def _hdaWorker(wid, workers, size, heuristic, inboxes, results, batchSize):
+    """
+    Worker process loop. Messages in: ("nodes", [node, ...]), ("incumbent",
+    cost), ("probe", wave), ("parent", packed) and ("stop",). A node is
+    (packed, blank, g, h, parent_packed, action).
+    """
+    cls = puzzleClass(size)
+    geometry = cls.geometry
+    bits = geometry.bits
+    mask = geometry.mask
+    goal = geometry.goalPacked
+    moveTargets = geometry.moveTargets
+    problem = SlidingPuzzleSearchProblem(cls.goal())
+    delta = search.heuristicDelta(heuristic, problem)
+    frontier = util.IndexedPriorityQueue()
+    closed = {}    # packed -> g
+    parents = {}   # packed -> (parent packed, action)
+    outgoing = [[] for _ in range(workers)]
+    inbox = inboxes[wid]
+    incumbent = float("inf")
+    sent = received = expanded = 0
+    max_open = max_stored = 0
+
+    def add(node):
+        packed, blank, g, h, parent, action = node
+        if g + h >= incumbent:
+            return
+        old = closed.get(packed)
+        if old is not None:
+            if old <= g:
+                return
+            del closed[packed]  # reached more cheaply: reopen
+        elif packed in frontier and frontier.priority(packed) <= g + h:
+            return
+        frontier.update(packed, (packed, blank, g, h), g + h)
+        parents[packed] = (parent, action)
+
+    def flush():
+        nonlocal sent
+        for owner, batch in enumerate(outgoing):
+            if batch:
+                inboxes[owner].put(("nodes", batch))
+                outgoing[owner] = []
+                sent += 1
+
+    def isIdle():
+        return frontier.isEmpty() or frontier.peekPriority() >= incumbent
+
+    while True:
+        # Handle the messages waiting in the inbox; block if there is no work.
+        while True:
+            idle = isIdle()
+            if idle:
+                flush()
+                message = inbox.get()
+            else:
+                try:
+                    message = inbox.get_nowait()
+                except queue.Empty:
+                    break
+            kind = message[0]
+            if kind == "nodes":
+                received += 1
+                for node in message[1]:
+                    add(node)
+            elif kind == "incumbent":
+                incumbent = min(incumbent, message[1])
+            elif kind == "probe":
+                results.put(("probe", message[1], wid, isIdle(), sent, received, expanded,
+                             len(closed) + frontier.size()))
+            elif kind == "parent":
+                results.put(("parent", message[1]) + parents[message[1]])
+            elif kind == "stop":
+                results.put(("stats", wid, expanded, max_open, max_stored))
+                return
+
+        # Expand up to batchSize nodes, then send what was generated.
+        for _ in range(batchSize):
+            if frontier.isEmpty() or frontier.peekPriority() >= incumbent:
+                break
+            open_size = frontier.size()
+            if open_size > max_open:
+                max_open = open_size
+            if open_size + len(closed) > max_stored:
+                max_stored = open_size + len(closed)
+            packed, blank, g, h = frontier.pop()
+            closed[packed] = g
+            expanded += 1
+            if packed == goal:
+                if g < incumbent:
+                    incumbent = g
+                    results.put(("goal", g, packed))
+                continue
+            for action, swap_idx in moveTargets[blank].items():
+                tile = (packed >> (bits * swap_idx)) & mask
+                child = packed ^ (tile << (bits * swap_idx)) ^ (tile << (bits * blank))
+                if delta is not None:
+                    child_h = delta(h, tile, swap_idx, blank)
+                else:
+                    child_h = heuristic(cls.fromPacked(child, swap_idx), problem)
+                node = (child, swap_idx, g + 1, child_h, packed, action)
+                owner = hashOwner(child, workers)
+                if owner == wid:
+                    add(node)
+                else:
+                    outgoing[owner].append(node)
+        flush()
+
+def hdaStarSearch(problem, heuristic=search.nullHeuristic, workers=None, batchSize=64,
+                  maxNodes=None, maxTime=None, maxStates=None, tracer=None):
+    """
+    Hash-distributed A* over 'workers' processes (default: one per CPU).
+    Same inputs and result as aStarSearch: the path is optimal for an
+    admissible heuristic, and expanded, max_fringe and stored add up the
+    workers' counts (the fringe and stored peaks are summed per worker, an
+    upper bound on the simultaneous total). batchSize is the number of
+    expansions between inbox checks and message flushes.
+
+    maxNodes, maxTime and maxStates are checked at every termination wave.
+    The heuristic must pickle, as for parallelIdaStarSearch.
+    """
+    workers = workers or os.cpu_count() or 1
+    start_time = time.time()
+    deadline = None if maxTime is None else start_time + maxTime
+    start = problem.getStartState()
+    context = multiprocessing.get_context()
+    inboxes = [context.Queue() for _ in range(workers)]
+    results = context.Queue()
+    processes = [context.Process(target=_hdaWorker, daemon=True,
+                                 args=(wid, workers, start.size, heuristic, inboxes, results,
+                                       batchSize))
+                 for wid in range(workers)]
+    for process in processes:
+        process.start()
+
+    start_h = heuristic(start, problem)
+    inboxes[hashOwner(start.packed, workers)].put(
+        ("nodes", [(start.packed, start.blank, 0, start_h, None, None)]))
+    incumbent = float("inf")
+    goal_packed = None
+    previous = None
+    wave = 0
+    limit = None
+    expanded = 0
+    stored = 0
+    try:
+        while True:
+            wave += 1
+            for inbox in inboxes:
+                inbox.put(("probe", wave))
+            replies = []
+            while len(replies) < workers:
+                message = results.get()
+                if message[0] == "goal" and message[1] < incumbent:
+                    incumbent, goal_packed = message[1], message[2]
+                    for inbox in inboxes:
+                        inbox.put(("incumbent", incumbent))
+                elif message[0] == "probe" and message[1] == wave:
+                    replies.append(message)
+            expanded = sum(reply[6] for reply in replies)
+            stored = sum(reply[7] for reply in replies)
+            # The coordinator sent the start node: one batch.
+            counts = (1 + sum(reply[4] for reply in replies), sum(reply[5] for reply in replies))
+            if all(reply[3] for reply in replies) and counts[0] == counts[1]:
+                if counts == previous:
+                    break
+                previous = counts
+            else:
+                previous = None
+            if maxNodes is not None and expanded >= maxNodes:
+                limit = "nodes"
+            elif maxStates is not None and stored > maxStates:
+                limit = "states"
+            elif deadline is not None and time.time() >= deadline:
+                limit = "time"
+            if limit is not None:
+                break
+            time.sleep(0.001)
+
+        path = []
+        if limit is None and goal_packed is not None:
+            # Follow the parent links back through the owners of each state.
+            packed = goal_packed
+            while packed != start.packed:
+                inboxes[hashOwner(packed, workers)].put(("parent", packed))
+                message = results.get()
+                while message[0] != "parent":
+                    message = results.get()
+                packed = message[2]
+                path.append(message[3])
+            path.reverse()
+
+        for inbox in inboxes:
+            inbox.put(("stop",))
+        max_fringe = 0
+        max_stored = 0
+        expanded = 0
+        for _ in range(workers):
+            message = results.get()
+            while message[0] != "stats":
+                message = results.get()
+            expanded += message[2]
+            max_fringe += message[3]
+            max_stored += message[4]
+    finally:
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+    problem.expanded_nodes += expanded
+    if tracer is not None:
+        tracer.expanded += expanded
+    if limit is not None:
+        return search._finish(problem, [], search.BUDGET_EXHAUSTED, start_time, expanded,
+                              max_fringe, max_stored, limit)
+    if goal_packed is None:
+        return search._finish(problem, [], search.UNSOLVABLE, start_time, expanded, max_fringe,
+                              max_stored)
+    return search._finish(problem, path, search.SOLVED, start_time, expanded, max_fringe,
+                          max_stored, optimal=True)
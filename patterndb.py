@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+patterndb.py
+
+Additive disjoint pattern databases for the 15-puzzle.
+
+The tiles are split into disjoint groups (the default 6-6-3 partition is
+{1,5,6,9,10,13}, {7,8,11,12,14,15}, {2,3,4}). For each group a table stores,
+for every placement of its tiles, the minimum number of moves of *those
+tiles* needed to bring them home. Blank moves that slide other tiles are
+free, so the per-group values can be summed and stay admissible.
+
+Tables are filled by a backward breadth-first search from the goal and
+written one byte per placement. The loader memory-maps the files, so
+several solver processes share one copy through the page cache.
+
+Build the default tables with:
+    python patterndb.py build --out pdb
+"""
+
+import argparse
+import mmap
+import os
+import time
+from array import array
+
+SIZE = 4
+CELLS = SIZE * SIZE
+DEFAULT_PARTITION = ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4))
+UNREACHED = 255
+MAGIC = b"PDB1"
+
+_FULL = (1 << CELLS) - 1
+_NOT_COL0 = sum(1 << i for i in range(CELLS) if i % SIZE != 0)
+_NOT_COL3 = sum(1 << i for i in range(CELLS) if i % SIZE != SIZE - 1)
+_NEIGHBORS = []
+for _cell in range(CELLS):
+    _r, _c = divmod(_cell, SIZE)
+    _NEIGHBORS.append(tuple(nr * SIZE + nc for nr, nc in
+                            ((_r - 1, _c), (_r + 1, _c), (_r, _c - 1), (_r, _c + 1))
+                            if 0 <= nr < SIZE and 0 <= nc < SIZE))
+
+
+def _falling(n, k):
+    result = 1
+    for i in range(k):
+        result *= n - i
+    return result
+
+def _placements(k):
+    """
+    Number of ways to place k distinct tiles on the 16 cells.
+    """
+    return _falling(CELLS, k)
+
+def _rankWeights(k):
+    """
+    Mixed-radix weights for rankPlacement: weight i is the number of ways to
+    place the remaining k-1-i tiles on the cells still free.
+    """
+    return [_falling(CELLS - 1 - i, k - 1 - i) for i in range(k)]
+
+def rankPlacement(positions, weights):
+    """
+    Maps a tuple of distinct cell indices to a dense index in
+    [0, 16! / (16-k)!). A cell's digit is its index among the cells not
+    used by earlier tiles.
+    """
+    rank = 0
+    used = 0
+    for pos, weight in zip(positions, weights):
+        rank += (pos - (used & ((1 << pos) - 1)).bit_count()) * weight
+        used |= 1 << pos
+    return rank
+
+def unrankPlacement(rank, weights):
+    """
+    Inverse of rankPlacement.
+    """
+    positions = []
+    used = 0
+    for i, weight in enumerate(weights):
+        digit, rank = divmod(rank, weight)
+        pos = -1
+        while digit >= 0:
+            pos += 1
+            if not (used >> pos) & 1:
+                digit -= 1
+        positions.append(pos)
+        used |= 1 << pos
+    return positions
+
+def _blankRegion(start, free):
+    """
+    Bitmask of the free cells connected to 'start' (a single-bit mask).
+    """
+    region = start
+    while True:
+        grown = (region | (region << SIZE) | (region >> SIZE)
+                 | ((region << 1) & _NOT_COL0) | ((region >> 1) & _NOT_COL3)) & free
+        grown |= start
+        if grown == region:
+            return region
+        region = grown
+
+
+def buildPatternTable(pattern, verbose=False):
+    """
+    Backward breadth-first search from the goal over placements of the
+    pattern tiles. Returns a bytearray with one distance per placement rank.
+
+    An abstract state is a placement plus the blank cell. All placements
+    reachable by blank moves alone cost nothing, so when a state is expanded
+    its whole blank region is marked at once and only moves of pattern tiles
+    into that region start the next layer.
+    """
+    k = len(pattern)
+    weights = _rankWeights(k)
+    table = bytearray([UNREACHED]) * _placements(k)
+    seen = array('H', bytes(2 * _placements(k)))  # rank -> blank cells covered
+
+    goal = [tile - 1 for tile in pattern]
+    layer = array('Q', [rankPlacement(goal, weights) * CELLS + (CELLS - 1)])
+    depth = 0
+    start_time = time.time()
+
+    while layer:
+        next_layer = array('Q')
+        for code in layer:
+            rank, blank = divmod(code, CELLS)
+            if (seen[rank] >> blank) & 1:
+                continue
+            positions = unrankPlacement(rank, weights)
+            occupied = 0
+            for pos in positions:
+                occupied |= 1 << pos
+            region = _blankRegion(1 << blank, _FULL & ~occupied)
+            seen[rank] |= region
+            if table[rank] == UNREACHED:
+                table[rank] = depth
+
+            for i, pos in enumerate(positions):
+                for target in _NEIGHBORS[pos]:
+                    if (region >> target) & 1:
+                        positions[i] = target
+                        new_rank = rankPlacement(positions, weights)
+                        if not (seen[new_rank] >> pos) & 1:
+                            next_layer.append(new_rank * CELLS + pos)
+                positions[i] = pos
+        if verbose:
+            print(f"  pattern {pattern}: depth {depth} done, "
+                  f"{len(next_layer)} states queued, {time.time() - start_time:.1f}s")
+        layer = next_layer
+        depth += 1
+    return table
+
+def patternFilename(directory, pattern):
+    return os.path.join(directory, "pdb-" + "-".join(str(t) for t in pattern) + ".bin")
+
+def writePatternTable(filename, pattern, table):
+    """
+    File format: b"PDB1", one byte k, k tile bytes, then one byte per
+    placement rank.
+    """
+    with open(filename, "wb") as fout:
+        fout.write(MAGIC + bytes([len(pattern)]) + bytes(pattern))
+        fout.write(table)
+
+def buildPatternDatabase(directory="pdb", partition=DEFAULT_PARTITION, verbose=True):
+    """
+    Builds and writes the table for every group of the partition.
+    """
+    os.makedirs(directory, exist_ok=True)
+    for pattern in partition:
+        if verbose:
+            print(f"Building pattern {pattern} ...")
+        table = buildPatternTable(pattern, verbose)
+        writePatternTable(patternFilename(directory, pattern), pattern, table)
+
+
+class PatternDatabaseHeuristic:
+    """
+    Additive pattern database heuristic. Call it like the h1..h4 functions:
+    heuristic(state, problem) with a FifteenPuzzleState or board.
+
+    The tables are memory-mapped read-only, so processes that load the same
+    files share them.
+    """
+
+    def __init__(self, directory="pdb", partition=DEFAULT_PARTITION):
+        self.directory = directory
+        self.partition = tuple(tuple(pattern) for pattern in partition)
+        tiles = [tile for pattern in self.partition for tile in pattern]
+        if len(tiles) != len(set(tiles)) or not set(tiles) <= set(range(1, CELLS)):
+            raise ValueError("Pattern groups must be disjoint sets of tiles 1..15.")
+        self.tables = []
+        for pattern in self.partition:
+            self.tables.append(self._load(patternFilename(directory, pattern), pattern))
+
+    def __reduce__(self):
+        # Pickled by directory and partition: a copy sent to a worker
+        # process maps the same files instead of shipping the tables.
+        return (PatternDatabaseHeuristic, (self.directory, self.partition))
+
+    @staticmethod
+    def _load(filename, pattern):
+        header = MAGIC + bytes([len(pattern)]) + bytes(pattern)
+        with open(filename, "rb") as fin:
+            data = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+        if data[:len(header)] != header:
+            raise ValueError(f"{filename} is not a pattern database for tiles {pattern}")
+        if len(data) != len(header) + _placements(len(pattern)):
+            raise ValueError(f"{filename} has the wrong size")
+        return (pattern, _rankWeights(len(pattern)), len(header), data)
+
+    def __call__(self, state, problem=None):
+        packed = state.packed
+        where = [0] * CELLS
+        for pos in range(CELLS):
+            where[(packed >> (4 * pos)) & 0xF] = pos
+        total = 0
+        for pattern, weights, offset, data in self.tables:
+            rank = 0
+            used = 0
+            for tile, weight in zip(pattern, weights):
+                pos = where[tile]
+                rank += (pos - (used & ((1 << pos) - 1)).bit_count()) * weight
+                used |= 1 << pos
+            total += data[offset + rank]
+        return total
+
+def parsePartition(text):
+    """
+    Parses '1,5,6/7,8,11/...' into a partition, or a shape name such as
+    '6-6-3' for the default.
+    """
+    if text == "6-6-3":
+        return DEFAULT_PARTITION
+    return tuple(tuple(int(t) for t in group.split(",")) for group in text.split("/"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build 15-puzzle pattern databases.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="build the tables by backward BFS")
+    build.add_argument("--out", default="pdb", help="output directory")
+    build.add_argument("--partition", default="6-6-3",
+                       help="'6-6-3' or explicit groups like '1,2,3,4/5,6,7,8/...'")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        buildPatternDatabase(args.out, parsePartition(args.partition))
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,10 @@ extended from an 8-puzzle example.
 We'll mark changes for Sprints with comment blocks.
 """
 
+import json
+import time
 import util
+from array import array
 
 class SearchProblem:
     """
@@ -27,6 +30,35 @@ class SearchProblem:
     def getCostOfActions(self, actions):
         util.raiseNotDefined()
 
+    def getMutableStartState(self):
+        """
+        Optional (used by IDA*): returns a mutable copy of the start state
+        offering legalMoves(), apply(action) and undo(action), which change
+        the board in place. apply() returns the moved tile and the board
+        exposes its blank position, for incremental heuristics.
+        """
+        util.raiseNotDefined()
+
+    def getGoalState(self):
+        """
+        Optional (used by bidirectional search): returns the single goal state.
+        """
+        util.raiseNotDefined()
+
+    def getPredecessors(self, state):
+        """
+        Optional (used by bidirectional search): returns (pred, action, cost)
+        triples such that taking 'action' in 'pred' leads to 'state'.
+        """
+        util.raiseNotDefined()
+
+    def inverseAction(self, action):
+        """
+        Optional: returns the action that undoes 'action', or None if the
+        problem has no such notion.
+        """
+        return None
+
 
 def tinyMazeSearch(problem):
     """
@@ -34,165 +66,1830 @@ def tinyMazeSearch(problem):
     """
     return []
 
+#############################
+# /*=====Start Change Task 16=====*/
+#############################
+# Search budgets: optional node, time and stored-state limits, and a result
+# that says why a search stopped.
+
+SOLVED = "solved"
+BUDGET_EXHAUSTED = "budget exhausted"
+UNSOLVABLE = "unsolvable"
+
+class SearchResult(list):
+    """
+    The action list returned by every search, with the outcome attached.
+    It is still a list, so callers that only use the path keep working.
+
+      status      SOLVED, BUDGET_EXHAUSTED or UNSOLVABLE
+      limit       the limit that stopped the search ("nodes", "time",
+                  "states", or "memory" for compactBreadthFirstSearch), or None
+      expanded    nodes expanded by this call
+      max_fringe  largest frontier held
+      stored      most states held at once (frontier plus closed set)
+      elapsed     wall-clock seconds
+      partial     when stopped: actions to the node with the lowest h, if
+                  the search has a heuristic
+      bound       when stopped: a proven lower bound on the solution cost
+      optimal     True when the search guarantees the path is optimal (for
+                  A*-style searches: given an admissible heuristic)
+    """
+    def __init__(self, actions=(), status=SOLVED, limit=None, expanded=0, max_fringe=0,
+                 stored=0, elapsed=0.0, partial=None, bound=None, optimal=False):
+        list.__init__(self, actions)
+        self.status = status
+        self.limit = limit
+        self.expanded = expanded
+        self.max_fringe = max_fringe
+        self.stored = stored
+        self.elapsed = elapsed
+        self.partial = partial
+        self.bound = bound
+        self.optimal = optimal
+
+    def __repr__(self):
+        return f"SearchResult({list.__repr__(self)}, status={self.status!r})"
+
+class SearchLimits:
+    """
+    Caps for one search call; None means unlimited. maxTime is in seconds.
+    exceeded() is called once per expansion and reads the clock only every
+    256 calls.
+    """
+    def __init__(self, maxNodes=None, maxTime=None, maxStates=None):
+        self.maxNodes = maxNodes
+        self.maxStates = maxStates
+        self.deadline = None if maxTime is None else time.time() + maxTime
+        self.calls = 0
+
+    def exceeded(self, expanded, stored):
+        """
+        Returns the name of the limit reached, or None.
+        """
+        if self.maxNodes is not None and expanded >= self.maxNodes:
+            return "nodes"
+        if self.maxStates is not None and stored > self.maxStates:
+            return "states"
+        if self.deadline is not None:
+            self.calls += 1
+            if (self.calls & 255) == 1 and time.time() >= self.deadline:
+                return "time"
+        return None
+
+def _makeLimits(maxNodes, maxTime, maxStates):
+    """
+    A SearchLimits, or None when nothing is limited so the searches can skip
+    the check entirely.
+    """
+    if maxNodes is None and maxTime is None and maxStates is None:
+        return None
+    return SearchLimits(maxNodes, maxTime, maxStates)
+
+def _finish(problem, actions, status, start_time, expanded, max_fringe, stored,
+            limit=None, partial=None, bound=None, optimal=False):
+    """
+    Records max_fringe on the problem and builds the SearchResult.
+    """
+    problem.max_fringe = max(problem.max_fringe, max_fringe)
+    return SearchResult(actions, status, limit, expanded, max_fringe, stored,
+                        time.time() - start_time, partial, bound, optimal)
+
+#############################
+# /*=====End Change Task 16=====*/
+#############################
+
+#############################
+# /*=====Start Change Task 19=====*/
+#############################
+# Search instrumentation: opt-in per-phase timers, counters and sampled traces.
+
+class SearchTracer:
+    """
+    Instrumentation for one search call: pass tracer=SearchTracer() to a
+    search, then read report() or summary(). Without a tracer the searches
+    run their plain code; the only cost is an 'is None' test per expansion.
+
+    Phase timers (exclusive seconds): successors, heuristic, goal test,
+    open list, closed list. Counters:
+      expanded    nodes expanded
+      generated   successors generated
+      duplicates  successors dropped because the state was already known
+                  at an equal or lower cost
+      reexpanded  states expanded again after their g improved
+      stale       frontier entries skipped because the state was expanded
+      layers      expansions per f-value (per contour bound for IDA*)
+
+    With traceFile and sampleEvery=N, every Nth expansion appends one JSON
+    line to traceFile: expanded, generated, duplicates, open, closed, f, g,
+    h and seconds since the start. Call close() when done.
+    """
+    PHASES = ("successors", "heuristic", "goal test", "open list", "closed list")
+
+    def __init__(self, traceFile=None, sampleEvery=1000):
+        self.times = dict.fromkeys(self.PHASES, 0.0)
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.reexpanded = 0
+        self.stale = 0
+        self.layers = {}
+        self.sampleEvery = sampleEvery
+        self.out = open(traceFile, "w") if traceFile is not None else None
+        self.start = time.perf_counter()
+        self._nested = 0.0  # time of timed calls inside the current timed call
+
+    def timed(self, fn, phase):
+        """
+        Wraps fn so its running time, minus that of timed calls it makes,
+        is added to the given phase.
+        """
+        times = self.times
+        perf = time.perf_counter
+        def traced(*args):
+            start = perf()
+            outer = self._nested
+            self._nested = 0.0
+            try:
+                return fn(*args)
+            finally:
+                elapsed = perf() - start
+                times[phase] += elapsed - self._nested
+                self._nested = outer + elapsed
+        return traced
+
+    def begin(self):
+        """
+        Starts timing an inline section of a search loop, for searches that
+        generate children without a function call; pass the result to end().
+        """
+        mark = (time.perf_counter(), self._nested)
+        self._nested = 0.0
+        return mark
+
+    def end(self, phase, mark):
+        """
+        Adds the time since begin(), minus that of timed calls made in
+        between, to the given phase.
+        """
+        start, outer = mark
+        elapsed = time.perf_counter() - start
+        self.times[phase] += elapsed - self._nested
+        self._nested = outer + elapsed
+
+    def heuristic(self, heuristic):
+        """
+        Timed copy of a heuristic that keeps its incremental delta.
+        """
+        traced = self.timed(heuristic, "heuristic")
+        delta = getattr(heuristic, "delta", None)
+        if delta is not None:
+            traced.delta = self.timed(delta, "heuristic")
+        deltaFor = getattr(heuristic, "deltaFor", None)
+        if deltaFor is not None:
+            traced.deltaFor = lambda geometry: self.timed(deltaFor(geometry), "heuristic")
+        return traced
+
+    def successors(self, fn):
+        """
+        Timed copy of a successor function that also counts the children.
+        """
+        timed = self.timed(fn, "successors")
+        def traced(*args):
+            children = timed(*args)
+            self.generated += len(children)
+            return children
+        return traced
+
+    def instrument(self, frontier, closed, isGoal, successors):
+        """
+        Returns timed versions of a search's open list, closed set or dict,
+        goal test and successor function.
+        """
+        if isinstance(closed, dict):
+            closed = _TracedDict(self)
+        elif closed is not None:
+            closed = _TracedSet(self)
+        return (_TracedQueue(frontier, self), closed,
+                self.timed(isGoal, "goal test"), self.successors(successors))
+
+    def expand(self, f, g, h, openSize, closedSize, reexpanded=False):
+        """
+        Records one expansion; called by the searches.
+        """
+        self.expanded += 1
+        self.layers[f] = self.layers.get(f, 0) + 1
+        if reexpanded:
+            self.reexpanded += 1
+        if self.out is not None and self.expanded % self.sampleEvery == 0:
+            self.out.write(json.dumps({
+                "expanded": self.expanded, "generated": self.generated,
+                "duplicates": self.duplicates, "open": openSize, "closed": closedSize,
+                "f": f, "g": g, "h": h,
+                "seconds": round(time.perf_counter() - self.start, 6)}) + "\n")
+
+    def close(self):
+        if self.out is not None:
+            self.out.close()
+            self.out = None
+
+    def report(self):
+        """
+        The counters and timers as a JSON-serialisable dict. 'other' is the
+        time spent outside the timed phases.
+        """
+        total = time.perf_counter() - self.start
+        times = dict(self.times)
+        times["other"] = max(0.0, total - sum(self.times.values()))
+        return {
+            "expanded": self.expanded, "generated": self.generated,
+            "duplicates": self.duplicates, "reexpanded": self.reexpanded,
+            "stale": self.stale, "seconds": total, "times": times,
+            "layers": {str(f): count for f, count in sorted(self.layers.items())},
+        }
+
+    def summary(self):
+        return formatProfile(self.report())
+
+def formatProfile(report):
+    """
+    One-line phase breakdown for a SearchTracer report.
+    """
+    total = sum(report["times"].values()) or 1.0
+    phases = ", ".join(f"{phase} {100 * seconds / total:.0f}%"
+                       for phase, seconds in report["times"].items() if seconds > 0)
+    return (f"expanded={report['expanded']}, generated={report['generated']}, "
+            f"duplicates={report['duplicates']}, reexpanded={report['reexpanded']}, "
+            f"stale={report['stale']}, f-layers={len(report['layers'])} | {phases}")
+
+class _TracedQueue:
+    """
+    Open list proxy that times every operation as "open list".
+    """
+    def __init__(self, queue, tracer):
+        self.queue = queue
+        for name in ("push", "pop", "update", "remove", "isEmpty", "size", "peekPriority", "item"):
+            if hasattr(queue, name):
+                setattr(self, name, tracer.timed(getattr(queue, name), "open list"))
+
+    def __contains__(self, key):
+        return key in self.queue
+
+class _TracedDict(dict):
+    """
+    Closed list (state -> g) that times lookups and stores as "closed list".
+    """
+    def __init__(self, tracer):
+        dict.__init__(self)
+        self._contains = tracer.timed(dict.__contains__, "closed list")
+        self._getitem = tracer.timed(dict.__getitem__, "closed list")
+        self._setitem = tracer.timed(dict.__setitem__, "closed list")
+
+    def __contains__(self, key):
+        return self._contains(self, key)
+
+    def __getitem__(self, key):
+        return self._getitem(self, key)
+
+    def __setitem__(self, key, value):
+        self._setitem(self, key, value)
+
+class _TracedSet(set):
+    """
+    Closed set that times lookups and inserts as "closed list".
+    """
+    def __init__(self, tracer):
+        set.__init__(self)
+        self._contains = tracer.timed(set.__contains__, "closed list")
+        self._add = tracer.timed(set.add, "closed list")
+
+    def __contains__(self, key):
+        return self._contains(self, key)
+
+    def add(self, key):
+        self._add(self, key)
+
+#############################
+# /*=====End Change Task 19=====*/
+#############################
+
 #############################
 # /*=====Start Change Task 4=====*/
 #############################
 # We'll unify BFS, DFS, and A*, and in #4 compare them with the best heuristic.
 
-def depthFirstSearch(problem):
+def depthFirstSearch(problem, maxNodes=None, maxTime=None, maxStates=None, tracer=None):
     """
     DFS (LIFO) stack
+
+    Every search takes optional maxNodes, maxTime (seconds) and maxStates
+    limits and returns a SearchResult. Pass tracer=SearchTracer() to
+    profile a call.
     """
+    limits = _makeLimits(maxNodes, maxTime, maxStates)
+    start_time = time.time()
+    expanded = 0
     frontier = util.Stack()
     visited = set()
+    isGoal = problem.isGoalState
+    getSuccessors = problem.getSuccessors
+    if tracer is not None:
+        frontier, visited, isGoal, getSuccessors = tracer.instrument(frontier, visited, isGoal,
+                                                                     getSuccessors)
 
-    # Start node: (state, path)
+    # Start node: no parent, no action
     start_state = problem.getStartState()
-    start_node = (start_state, [])
-    frontier.push(start_node)
+    frontier.push(util.SearchNode(start_state))
     max_fringe = 0
+    max_stored = 0
 
     while not frontier.isEmpty():
         # Track max fringe size
         current_size = frontier.size()
         if current_size > max_fringe:
             max_fringe = current_size
+        stored = current_size + len(visited)
+        if stored > max_stored:
+            max_stored = stored
+        if limits is not None:
+            limit = limits.exceeded(expanded, stored)
+            if limit is not None:
+                return _finish(problem, [], BUDGET_EXHAUSTED, start_time, expanded, max_fringe,
+                               max_stored, limit)
 
-        state, path = frontier.pop()
+        node = frontier.pop()
+        state = node.state
         # Each pop is a node expansion
         problem.expanded_nodes += 1
+        expanded += 1
 
-        if problem.isGoalState(state):
-            # Update the problem's max_fringe if needed
-            problem.max_fringe = max(problem.max_fringe, max_fringe)
-            return path
+        if isGoal(state):
+            return _finish(problem, node.path(), SOLVED, start_time, expanded, max_fringe, max_stored)
 
         if state not in visited:
+            if tracer is not None:
+                tracer.expand(node.g, node.g, 0, current_size, len(visited))
             visited.add(state)
-            for (succ, action, cost) in problem.getSuccessors(state):
+            for (succ, action, cost) in getSuccessors(state):
                 if succ not in visited:
-                    new_path = path + [action]
-                    frontier.push((succ, new_path))
+                    frontier.push(util.SearchNode(succ, node, action, node.g + 1))
+                elif tracer is not None:
+                    tracer.duplicates += 1
+        elif tracer is not None:
+            tracer.stale += 1
 
-    # Update final max fringe
-    problem.max_fringe = max(problem.max_fringe, max_fringe)
-    return []  # No solution found
+    # Search space exhausted: no solution
+    return _finish(problem, [], UNSOLVABLE, start_time, expanded, max_fringe, max_stored)
 
-def breadthFirstSearch(problem):
+def breadthFirstSearch(problem, maxNodes=None, maxTime=None, maxStates=None, tracer=None):
     """
     BFS (FIFO) queue
     """
-    from collections import deque
+    limits = _makeLimits(maxNodes, maxTime, maxStates)
+    start_time = time.time()
+    expanded = 0
     frontier = util.Queue()
     visited = set()
+    isGoal = problem.isGoalState
+    getSuccessors = problem.getSuccessors
+    if tracer is not None:
+        frontier, visited, isGoal, getSuccessors = tracer.instrument(frontier, visited, isGoal,
+                                                                     getSuccessors)
 
-    # Start node: (state, path)
+    # Start node: no parent, no action
     start_state = problem.getStartState()
-    start_node = (start_state, [])
-    frontier.push(start_node)
+    frontier.push(util.SearchNode(start_state))
     max_fringe = 0
+    max_stored = 0
+    depth = 0  # nodes leave the queue in depth order
 
     while not frontier.isEmpty():
         current_size = frontier.size()
         if current_size > max_fringe:
             max_fringe = current_size
+        stored = current_size + len(visited)
+        if stored > max_stored:
+            max_stored = stored
+        if limits is not None:
+            limit = limits.exceeded(expanded, stored)
+            if limit is not None:
+                return _finish(problem, [], BUDGET_EXHAUSTED, start_time, expanded, max_fringe,
+                               max_stored, limit, bound=depth)
 
-        state, path = frontier.pop()
+        node = frontier.pop()
+        state = node.state
         problem.expanded_nodes += 1
+        expanded += 1
+        depth = node.g
 
-        if problem.isGoalState(state):
-            problem.max_fringe = max(problem.max_fringe, max_fringe)
-            return path
+        if isGoal(state):
+            return _finish(problem, node.path(), SOLVED, start_time, expanded, max_fringe, max_stored,
+                           optimal=True)
 
         if state not in visited:
+            if tracer is not None:
+                tracer.expand(node.g, node.g, 0, current_size, len(visited))
             visited.add(state)
-            for (succ, action, cost) in problem.getSuccessors(state):
+            for (succ, action, cost) in getSuccessors(state):
                 if succ not in visited:
-                    new_path = path + [action]
-                    frontier.push((succ, new_path))
+                    frontier.push(util.SearchNode(succ, node, action, node.g + 1))
+                elif tracer is not None:
+                    tracer.duplicates += 1
+        elif tracer is not None:
+            tracer.stale += 1
 
-    problem.max_fringe = max(problem.max_fringe, max_fringe)
-    return []
+    return _finish(problem, [], UNSOLVABLE, start_time, expanded, max_fringe, max_stored)
 
-def uniformCostSearch(problem):
+def uniformCostSearch(problem, maxNodes=None, maxTime=None, maxStates=None, tracer=None):
     """
     UCS: priority queue ordered by path cost.
     """
-    frontier = util.PriorityQueue()
+    limits = _makeLimits(maxNodes, maxTime, maxStates)
+    start_time = time.time()
+    expanded = 0
+    frontier = util.IndexedPriorityQueue()
     visited = {}  # state -> best cost so far
+    isGoal = problem.isGoalState
+    getSuccessors = problem.getSuccessors
+    if tracer is not None:
+        frontier, visited, isGoal, getSuccessors = tracer.instrument(frontier, visited, isGoal,
+                                                                     getSuccessors)
 
     start_state = problem.getStartState()
-    start_node = (start_state, [], 0)  # (state, path, cost_so_far)
-    frontier.push(start_node, 0)
+    frontier.push(start_state, util.SearchNode(start_state), 0)
     max_fringe = 0
+    max_stored = 0
+    bound = 0  # largest g expanded: no solution is cheaper
 
     while not frontier.isEmpty():
         current_size = frontier.size()
         if current_size > max_fringe:
             max_fringe = current_size
+        stored = current_size + len(visited)
+        if stored > max_stored:
+            max_stored = stored
+        if limits is not None:
+            limit = limits.exceeded(expanded, stored)
+            if limit is not None:
+                return _finish(problem, [], BUDGET_EXHAUSTED, start_time, expanded, max_fringe,
+                               max_stored, limit, bound=bound)
 
-        state, path, cost_so_far = frontier.pop()
+        node = frontier.pop()
+        state = node.state
+        cost_so_far = node.g
         problem.expanded_nodes += 1
+        expanded += 1
+        if cost_so_far > bound:
+            bound = cost_so_far
 
-        if problem.isGoalState(state):
-            problem.max_fringe = max(problem.max_fringe, max_fringe)
-            return path
+        if isGoal(state):
+            return _finish(problem, node.path(), SOLVED, start_time, expanded, max_fringe, max_stored,
+                           optimal=True)
 
         if (state not in visited) or (cost_so_far < visited[state]):
+            if tracer is not None:
+                tracer.expand(cost_so_far, cost_so_far, 0, current_size, len(visited),
+                              state in visited)
             visited[state] = cost_so_far
-            for (succ, action, step_cost) in problem.getSuccessors(state):
-                new_path = path + [action]
+            for (succ, action, step_cost) in getSuccessors(state):
                 new_cost = cost_so_far + step_cost
                 if (succ not in visited) or (new_cost < visited[succ]):
-                    frontier.update((succ, new_path, new_cost), new_cost)
+                    frontier.update(succ, util.SearchNode(succ, node, action, new_cost), new_cost)
+                elif tracer is not None:
+                    tracer.duplicates += 1
+        elif tracer is not None:
+            tracer.stale += 1
 
-    problem.max_fringe = max(problem.max_fringe, max_fringe)
-    return []
+    return _finish(problem, [], UNSOLVABLE, start_time, expanded, max_fringe, max_stored)
 
 def nullHeuristic(state, problem=None):
     return 0
 
-def aStarSearch(problem, heuristic=nullHeuristic):
+def heuristicDelta(heuristic, problem):
+    """
+    Returns the incremental delta of a heuristic for the problem's board,
+    or None. Heuristics that serve several board sizes pick it with
+    deltaFor(geometry); others expose a single delta.
+    """
+    deltaFor = getattr(heuristic, "deltaFor", None)
+    if deltaFor is not None:
+        return deltaFor(problem.getStartState().geometry)
+    return getattr(heuristic, "delta", None)
+
+def _successorsWithHeuristic(problem, heuristic):
+    """
+    Returns a function state, h -> [(succ, action, cost, succ_h)]. If the
+    heuristic exposes an incremental delta and the problem supports it, the
+    child h values come from the parent's h; otherwise each child is scored
+    from scratch.
+    """
+    delta = heuristicDelta(heuristic, problem)
+    if delta is not None and hasattr(problem, "getSuccessorsWithHeuristic"):
+        return lambda state, h: problem.getSuccessorsWithHeuristic(state, h, delta)
+    return lambda state, h: [(succ, action, cost, heuristic(succ, problem))
+                             for (succ, action, cost) in problem.getSuccessors(state)]
+
+def aStarSearch(problem, heuristic=nullHeuristic, openList="heap", weight=1,
+                maxNodes=None, maxTime=None, maxStates=None, tracer=None):
     """
     A* = UCS + heuristic
+
+    openList selects the frontier: "heap" (binary heap, any priorities) or
+    "bucket" (one LIFO bucket per integer f, O(1) push/pop, ties go to the
+    deepest node). "bucket" falls back to the heap if the heuristic does not
+    return integers, e.g. h2_euclideanDistance.
+
+    weight > 1 orders the frontier by g + weight * h (weighted A*): fewer
+    expansions, and with an admissible h the solution costs at most
+    'weight' times the optimum.
+
+    When a limit stops the search, the result's partial path leads to the
+    expanded node with the lowest h, and its bound is the largest f
+    expanded divided by the weight (a lower bound on the optimal cost for
+    an admissible h).
     """
-    frontier = util.PriorityQueue()
+    if openList not in ("heap", "bucket"):
+        raise ValueError("Unknown open list: " + str(openList))
+    limits = _makeLimits(maxNodes, maxTime, maxStates)
+    start_time = time.time()
+    expanded = 0
+    if tracer is not None:
+        heuristic = tracer.heuristic(heuristic)
+    successors = _successorsWithHeuristic(problem, heuristic)
     visited = {}
     start_state = problem.getStartState()
-    start_node = (start_state, [], 0)  # (state, path, cost_g)
-    frontier.push(start_node, 0)
+    start_h = heuristic(start_state, problem)
+    if openList == "bucket" and isinstance(start_h, int) and isinstance(weight, int):
+        frontier = util.BucketPriorityQueue()
+    else:
+        frontier = util.IndexedPriorityQueue()
+    isGoal = problem.isGoalState
+    if tracer is not None:
+        frontier, visited, isGoal, successors = tracer.instrument(frontier, visited, isGoal,
+                                                                  successors)
+    frontier.push(start_state, util.SearchNode(start_state, h=start_h), weight * start_h)
     max_fringe = 0
+    max_stored = 0
+    best_node = None
+    max_f = weight * start_h
 
     while not frontier.isEmpty():
         current_size = frontier.size()
         if current_size > max_fringe:
             max_fringe = current_size
+        stored = current_size + len(visited)
+        if stored > max_stored:
+            max_stored = stored
+        if limits is not None:
+            limit = limits.exceeded(expanded, stored)
+            if limit is not None:
+                partial = best_node.path() if best_node is not None else []
+                return _finish(problem, [], BUDGET_EXHAUSTED, start_time, expanded, max_fringe,
+                               max_stored, limit, partial, max_f / weight if weight != 1 else max_f)
 
-        state, path, cost_g = frontier.pop()
+        node = frontier.pop()
+        state = node.state
+        cost_g = node.g
         problem.expanded_nodes += 1
+        expanded += 1
+        if cost_g + weight * node.h > max_f:
+            max_f = cost_g + weight * node.h
+        if best_node is None or node.h < best_node.h:
+            best_node = node
 
-        if problem.isGoalState(state):
-            problem.max_fringe = max(problem.max_fringe, max_fringe)
-            return path
+        if isGoal(state):
+            return _finish(problem, node.path(), SOLVED, start_time, expanded, max_fringe, max_stored,
+                           optimal=weight == 1)
 
         if (state not in visited) or (cost_g < visited[state]):
+            if tracer is not None:
+                tracer.expand(cost_g + weight * node.h, cost_g, node.h, current_size,
+                              len(visited), state in visited)
             visited[state] = cost_g
-            for (succ, action, step_cost) in problem.getSuccessors(state):
-                new_path = path + [action]
+            for (succ, action, step_cost, succ_h) in successors(state, node.h):
                 new_g = cost_g + step_cost
-                new_f = new_g + heuristic(succ, problem)
+                new_f = new_g + weight * succ_h
                 if (succ not in visited) or (new_g < visited[succ]):
-                    frontier.update((succ, new_path, new_g), new_f)
+                    frontier.update(succ, util.SearchNode(succ, node, action, new_g, succ_h), new_f)
+                elif tracer is not None:
+                    tracer.duplicates += 1
+        elif tracer is not None:
+            tracer.stale += 1
 
-    problem.max_fringe = max(problem.max_fringe, max_fringe)
-    return []
+    return _finish(problem, [], UNSOLVABLE, start_time, expanded, max_fringe, max_stored)
 
 #############################
 # /*=====End Change Task 4=====*/
 #############################
 
+#############################
+# /*=====Start Change Task 7=====*/
+#############################
+# IDA*: memory linear in the solution depth, for scrambles A* cannot hold.
+
+class _LimitReached(Exception):
+    """
+    Raised inside an IDA* contour when a search limit is hit.
+    """
+    def __init__(self, limit, expanded, deepest):
+        Exception.__init__(self, limit)
+        self.limit = limit
+        self.expanded = expanded
+        self.deepest = deepest
+
+def _idaContour(problem, board, heuristic, bound, g, path, limits=None, expandedBefore=0,
+                fsm=None, tracer=None):
+    """
+    Depth-first search below 'board' (reached from the start by 'path', at
+    cost g) that only visits nodes with f <= bound. The board and path are
+    changed in place and restored on the way back, except when a goal is
+    found: then they are left at the goal.
+
+    Returns (next_bound, expanded, deepest) where next_bound is None if a
+    goal was found, otherwise the smallest f that exceeded the bound.
+    Raises _LimitReached if 'limits' (counting expandedBefore earlier
+    expansions) stops the contour. With an fsm (fsm.PruningFsm), moves that
+    complete a redundant move string are skipped; otherwise only the move
+    undoing the last one is. A tracer times the moves as successors and
+    counts every move made as generated and every FSM-pruned one as a
+    duplicate.
+    """
+    inverse = problem.inverseAction
+    isGoal = problem.isGoalState
+    legalMoves = board.legalMoves
+    apply = board.apply
+    undo = board.undo
+    if tracer is not None:
+        heuristic = tracer.heuristic(heuristic)
+        isGoal = tracer.timed(isGoal, "goal test")
+        legalMoves = tracer.timed(legalMoves, "successors")
+        timedApply = tracer.timed(apply, "successors")
+        undo = tracer.timed(undo, "successors")
+        def apply(action):
+            tracer.generated += 1
+            return timedApply(action)
+    delta = heuristicDelta(heuristic, problem)
+    expanded = 0
+    deepest = len(path)
+
+    def dfs(g, h, skip, fsm_state):
+        nonlocal expanded, deepest
+        f = g + h
+        if f > bound:
+            return f
+        expanded += 1
+        if len(path) > deepest:
+            deepest = len(path)
+        if limits is not None:
+            limit = limits.exceeded(expandedBefore + expanded, len(path) + 1)
+            if limit is not None:
+                raise _LimitReached(limit, expanded, deepest)
+        if isGoal(board):
+            return None
+        minimum = float("inf")
+        for action in legalMoves():
+            if fsm is not None:
+                next_state = fsm.step(fsm_state, action)
+                if next_state < 0:
+                    if tracer is not None:
+                        tracer.duplicates += 1
+                    continue
+            # Never undo the move that led here.
+            elif action == skip:
+                continue
+            else:
+                next_state = 0
+            old_blank = board.blank
+            tile = apply(action)
+            path.append(action)
+            if delta is not None:
+                child_h = delta(h, tile, board.blank, old_blank)
+            else:
+                child_h = heuristic(board, problem)
+            t = dfs(g + 1, child_h, inverse(action), next_state)
+            if t is None:
+                return None
+            path.pop()
+            undo(action)
+            if t < minimum:
+                minimum = t
+        return minimum
+
+    skip = inverse(path[-1]) if path else None
+    fsm_state = 0
+    if fsm is not None:
+        fsm_state = fsm.run(path)
+        if fsm_state < 0:
+            # The path so far is itself redundant.
+            return float("inf"), 0, deepest
+    next_bound = dfs(g, heuristic(board, problem), skip, fsm_state)
+    return next_bound, expanded, deepest
+
+def idaStarSearch(problem, heuristic=nullHeuristic, maxNodes=None, maxTime=None, maxStates=None,
+                  tracer=None, fsm=None):
+    """
+    IDA*: repeated depth-first contours with an f-bound that grows to the
+    smallest f that exceeded it. Works on one mutable board from
+    problem.getMutableStartState() and assumes unit step costs.
+
+    max_fringe is the deepest recursion path held in memory. When a limit
+    stops the search, the result's bound is the f-bound of the unfinished
+    contour: every cheaper solution would have been found already.
+    A tracer records the expansions of each contour as its f-layer, and
+    times and counts the moves, heuristic and goal tests (see _idaContour).
+    Pass fsm=fsm.defaultFsm() to prune redundant move strings (see fsm.py).
+    """
+    limits = _makeLimits(maxNodes, maxTime, maxStates)
+    start_time = time.time()
+    total = 0
+    board = problem.getMutableStartState()
+    bound = heuristic(board, problem)
+    path = []
+    max_fringe = 0
+
+    while True:
+        try:
+            next_bound, expanded, deepest = _idaContour(problem, board, heuristic, bound, 0, path,
+                                                        limits, total, fsm, tracer)
+        except _LimitReached as stop:
+            problem.expanded_nodes += stop.expanded
+            total += stop.expanded
+            if tracer is not None:
+                tracer.expanded += stop.expanded
+                tracer.layers[bound] = stop.expanded
+            max_fringe = max(max_fringe, stop.deepest + 1)
+            return _finish(problem, [], BUDGET_EXHAUSTED, start_time, total, max_fringe,
+                           max_fringe, stop.limit, bound=bound)
+        problem.expanded_nodes += expanded
+        total += expanded
+        if tracer is not None:
+            tracer.expanded += expanded
+            tracer.layers[bound] = expanded
+        max_fringe = max(max_fringe, deepest + 1)
+
+        if next_bound is None:
+            return _finish(problem, list(path), SOLVED, start_time, total, max_fringe, max_fringe,
+                           optimal=True)
+        if next_bound == float("inf"):
+            break
+        bound = next_bound
+
+    return _finish(problem, [], UNSOLVABLE, start_time, total, max_fringe, max_fringe)
+
+#############################
+# /*=====End Change Task 7=====*/
+#############################
+
+#############################
+# /*=====Start Change Task 13=====*/
+#############################
+# Bidirectional search: forward from the start, backward from the goal.
+
+class _SearchDirection:
+    """
+    One half of a bidirectional search: its open list, best g per state and
+    parent links (state -> (neighbour it was reached from, action)).
+    """
+    def __init__(self, root, expand, heuristic):
+        self.open = util.IndexedPriorityQueue()
+        self.open.push(root, root, 0)
+        self.g = {root: 0}
+        self.parent = {root: None}
+        self.expand = expand
+        self.heuristic = heuristic
+
+def bidirectionalSearch(problem, heuristic=None, backwardHeuristic=None,
+                        maxNodes=None, maxTime=None, maxStates=None, tracer=None):
+    """
+    Best-first search from both ends, always expanding the side with the
+    smaller open list, until the two frontiers meet with a proven-optimal
+    cost. Needs problem.getGoalState() and problem.getPredecessors().
+
+    Without heuristics this is bidirectional uniform-cost search (BFS for
+    unit costs) and stops once the cheapest meeting cost is no greater than
+    the sum of the two smallest open g-values. With heuristic (estimating
+    the distance to the goal) and/or backwardHeuristic (estimating the
+    distance to the start) it is front-to-end bidirectional A* and stops
+    once the meeting cost is no greater than either side's smallest f.
+    When a limit stops it, the result's bound is the last such lower bound.
+    A tracer times the successor and predecessor generation and counts
+    expansions by lower bound.
+    """
+    limits = _makeLimits(maxNodes, maxTime, maxStates)
+    start_time = time.time()
+    expanded = 0
+    informed = heuristic is not None or backwardHeuristic is not None
+    start_state = problem.getStartState()
+    goal_state = problem.getGoalState()
+    if start_state == goal_state:
+        return _finish(problem, [], SOLVED, start_time, 0, 0, 1, optimal=True)
+
+    forward = _SearchDirection(start_state, problem.getSuccessors, heuristic or nullHeuristic)
+    backward = _SearchDirection(goal_state, problem.getPredecessors, backwardHeuristic or nullHeuristic)
+    if tracer is not None:
+        for side in (forward, backward):
+            side.expand = tracer.successors(side.expand)
+            side.heuristic = tracer.heuristic(side.heuristic)
+    best_cost = float("inf")
+    meeting = None
+    max_fringe = 0
+    max_stored = 0
+
+    while not forward.open.isEmpty() and not backward.open.isEmpty():
+        current_size = forward.open.size() + backward.open.size()
+        if current_size > max_fringe:
+            max_fringe = current_size
+        stored = len(forward.g) + len(backward.g)
+        if stored > max_stored:
+            max_stored = stored
+
+        forward_min = forward.open.peekPriority()
+        backward_min = backward.open.peekPriority()
+        if informed:
+            lower_bound = max(forward_min, backward_min)
+        else:
+            lower_bound = forward_min + backward_min
+        if best_cost <= lower_bound:
+            break
+        if limits is not None:
+            limit = limits.exceeded(expanded, stored)
+            if limit is not None:
+                return _finish(problem, [], BUDGET_EXHAUSTED, start_time, expanded, max_fringe,
+                               max_stored, limit, bound=lower_bound)
+
+        if forward.open.size() <= backward.open.size():
+            side, other = forward, backward
+        else:
+            side, other = backward, forward
+        state = side.open.pop()
+        problem.expanded_nodes += 1
+        expanded += 1
+        cost_g = side.g[state]
+        if tracer is not None:
+            tracer.expand(lower_bound, cost_g, 0, current_size, stored)
+
+        for (neighbour, action, step_cost) in side.expand(state):
+            new_g = cost_g + step_cost
+            if new_g < side.g.get(neighbour, float("inf")):
+                side.g[neighbour] = new_g
+                side.parent[neighbour] = (state, action)
+                side.open.update(neighbour, neighbour, new_g + side.heuristic(neighbour, problem))
+                if neighbour in other.g and new_g + other.g[neighbour] < best_cost:
+                    best_cost = new_g + other.g[neighbour]
+                    meeting = neighbour
+
+    if meeting is None:
+        return _finish(problem, [], UNSOLVABLE, start_time, expanded, max_fringe, max_stored)
+
+    path = []
+    state = meeting
+    while forward.parent[state] is not None:
+        state, action = forward.parent[state]
+        path.append(action)
+    path.reverse()
+    state = meeting
+    while backward.parent[state] is not None:
+        state, action = backward.parent[state]
+        path.append(action)
+    return _finish(problem, path, SOLVED, start_time, expanded, max_fringe, max_stored,
+                   optimal=True)
+
+#############################
+# /*=====End Change Task 13=====*/
+#############################
+
+#############################
+# /*=====Start Change Task 17=====*/
+#############################
+# Weighted and anytime A*: a fast first answer, then better ones while time remains.
+
+def weightedAStarSearch(problem, heuristic=nullHeuristic, weight=2.0,
+                        maxNodes=None, maxTime=None, maxStates=None):
+    """
+    A* on g + weight * h. With an admissible heuristic the solution costs at
+    most 'weight' times the optimum.
+    """
+    return aStarSearch(problem, heuristic, weight=weight,
+                       maxNodes=maxNodes, maxTime=maxTime, maxStates=maxStates)
+
+def anytimeAStarSearch(problem, heuristic=nullHeuristic, weight=3.0, step=0.5, onSolution=None,
+                       maxNodes=None, maxTime=None, maxStates=None, tracer=None):
+    """
+    Anytime repairing A* (ARA*). A weighted A* with the given weight finds a
+    first solution quickly; then the weight is lowered by 'step' and the
+    search repairs the previous one (re-queuing only the states whose g
+    improved after they were expanded) rather than starting over, until
+    the weight reaches 1 or a limit is hit. Needs an admissible heuristic.
+
+    Each improvement is recorded as (seconds, cost, suboptimality, actions)
+    in result.solutions, where suboptimality is a proven bound on
+    cost / optimal cost, and passed to onSolution(...) if given.
+
+    The result holds the best solution found. It is SOLVED even when a
+    limit cut the search short (result.limit is then set and
+    result.suboptimality may exceed 1); bound is the proven lower bound on
+    the optimal cost. A tracer counts expansions (a state expanded again in
+    a later pass counts as re-expanded) and times successor generation.
+    """
+    limits = _makeLimits(maxNodes, maxTime, maxStates)
+    start_time = time.time()
+    expanded = 0
+    if tracer is not None:
+        heuristic = tracer.heuristic(heuristic)
+    successors = _successorsWithHeuristic(problem, heuristic)
+    if tracer is not None:
+        successors = tracer.successors(successors)
+    expanded_once = set() if tracer is not None else None
+    start_state = problem.getStartState()
+    g = {start_state: 0}
+    h = {start_state: heuristic(start_state, problem)}
+    parent = {start_state: None}  # state -> (previous state, action, step cost)
+    best_cost = float("inf")
+    best_state = None
+    if problem.isGoalState(start_state):
+        best_cost = 0
+        best_state = start_state
+
+    open_list = util.IndexedPriorityQueue()
+    open_list.push(start_state, start_state, weight * h[start_state])
+    closed = set()
+    incons = set()  # improved after expansion; re-queued with the next weight
+    eps = weight
+    solutions = []
+    max_fringe = 0
+    limit = None
+    lower_bound = 0
+    reported = float("inf")
+
+    def pathTo(state):
+        """
+        Actions and cost along the current parent links. Parents may have
+        improved since 'state' was reached, so this can beat g[state].
+        """
+        actions = []
+        cost = 0
+        while parent[state] is not None:
+            state, action, step_cost = parent[state]
+            actions.append(action)
+            cost += step_cost
+        actions.reverse()
+        return actions, cost
+
+    while True:
+        # Improve the current solution under weight eps.
+        while not open_list.isEmpty() and best_cost > open_list.peekPriority():
+            current_size = open_list.size()
+            if current_size > max_fringe:
+                max_fringe = current_size
+            if limits is not None:
+                limit = limits.exceeded(expanded, len(g))
+                if limit is not None:
+                    break
+            state = open_list.pop()
+            closed.add(state)
+            problem.expanded_nodes += 1
+            expanded += 1
+            cost_g = g[state]
+            if tracer is not None:
+                tracer.expand(cost_g + eps * h[state], cost_g, h[state], current_size, len(g),
+                              state in expanded_once)
+                expanded_once.add(state)
+            for (succ, action, step_cost, succ_h) in successors(state, h[state]):
+                new_g = cost_g + step_cost
+                if new_g < g.get(succ, float("inf")):
+                    g[succ] = new_g
+                    h[succ] = succ_h
+                    parent[succ] = (state, action, step_cost)
+                    if new_g < best_cost and problem.isGoalState(succ):
+                        best_cost = new_g
+                        best_state = succ
+                    if succ in closed:
+                        incons.add(succ)
+                    else:
+                        open_list.update(succ, succ, new_g + eps * succ_h)
+
+        # Nothing cheaper than the smallest g + h still waiting can exist.
+        waiting = [g[s] + h[s] for s in open_list.entries]
+        waiting.extend(g[s] + h[s] for s in incons)
+        lower_bound = min(best_cost, min(waiting, default=float("inf")))
+        if best_state is not None and best_cost < reported:
+            actions, best_cost = pathTo(best_state)
+            reported = best_cost
+            lower_bound = min(lower_bound, best_cost)
+            suboptimality = best_cost / lower_bound if lower_bound > 0 else 1.0
+            if limit is None:
+                # A completed pass under weight eps is eps-suboptimal.
+                suboptimality = min(eps, suboptimality)
+            solution = (time.time() - start_time, best_cost, suboptimality, actions)
+            solutions.append(solution)
+            if onSolution is not None:
+                onSolution(*solution)
+
+        if limit is not None or lower_bound >= best_cost or eps <= 1:
+            break
+        if best_state is None and open_list.isEmpty() and not incons:
+            break
+
+        # Lower the weight and requeue everything open or inconsistent.
+        eps = max(1.0, eps - step)
+        waiting_states = list(open_list.entries) + list(incons)
+        open_list = util.IndexedPriorityQueue()
+        for state in waiting_states:
+            open_list.update(state, state, g[state] + eps * h[state])
+        incons.clear()
+        closed.clear()
+
+    if best_state is None:
+        status = BUDGET_EXHAUSTED if limit is not None else UNSOLVABLE
+        return _finish(problem, [], status, start_time, expanded, max_fringe, len(g),
+                       limit, bound=lower_bound)
+    result = _finish(problem, solutions[-1][3], SOLVED, start_time, expanded, max_fringe,
+                     len(g), limit, bound=lower_bound)
+    result.solutions = solutions
+    result.suboptimality = best_cost / lower_bound if lower_bound > 0 else 1.0
+    result.optimal = result.suboptimality == 1
+    return result
+
+#############################
+# /*=====End Change Task 17=====*/
+#############################
+
+#############################
+# /*=====Start Change Task 18=====*/
+#############################
+# SMA*: best-first search that never holds more than a fixed number of nodes.
+
+class _MemoryNode(util.SearchNode):
+    """
+    SMA* tree node. f is the backed-up f-value (the lowest f among the
+    children, once expanded), forgotten the lowest f among children that
+    were pruned from memory.
+    """
+    __slots__ = ('f', 'depth', 'children', 'forgotten')
+
+    def __init__(self, state, parent=None, action=None, g=0, h=0, f=0, depth=0):
+        util.SearchNode.__init__(self, state, parent, action, g, h)
+        self.f = f
+        self.depth = depth
+        self.children = []
+        self.forgotten = float("inf")
+
+def smaStarSearch(problem, heuristic=nullHeuristic, maxStates=100000, maxNodes=None, maxTime=None,
+                  tracer=None):
+    """
+    Simplified memory-bounded A* (SMA*). Holds at most maxStates search tree
+    nodes (None: no cap). When an expansion goes over the cap, the leaf with
+    the highest f (shallowest on ties) is dropped and its f is remembered in
+    its parent. A parent with forgotten children stays a candidate under the
+    lowest forgotten f: when that is the best f in the tree, the forgotten
+    children are regenerated. A parent whose children are all gone becomes
+    a leaf again.
+
+    A tree search: only the move back to the parent is pruned, so repeated
+    states cost memory. Optimal with an admissible heuristic whenever the
+    cap can hold the optimal path; if it cannot, the result is
+    BUDGET_EXHAUSTED with limit "states". stored is the peak node count.
+    With a tracer, regenerating a pruned subtree counts as re-expansion.
+    """
+    cap = maxStates if maxStates is not None else float("inf")
+    if cap < 2:
+        raise ValueError("SMA* needs room for at least two nodes.")
+    limits = _makeLimits(maxNodes, maxTime, None)
+    start_time = time.time()
+    expanded = 0
+    if tracer is not None:
+        heuristic = tracer.heuristic(heuristic)
+    successors = _successorsWithHeuristic(problem, heuristic)
+    isGoal = problem.isGoalState
+    if tracer is not None:
+        successors = tracer.successors(successors)
+        isGoal = tracer.timed(isGoal, "goal test")
+        expanded_once = set()
+    infinity = float("inf")
+
+    start_state = problem.getStartState()
+    start_h = heuristic(start_state, problem)
+    root = _MemoryNode(start_state, h=start_h, f=start_h)
+    # best: leaves by f, and parents with forgotten children by their
+    # lowest forgotten f (deepest on ties) first. worst: leaves only,
+    # highest f (shallowest on ties) first.
+    best = util.IndexedPriorityQueue()
+    worst = util.IndexedPriorityQueue()
+
+    def addLeaf(node):
+        best.push(node, node, (node.f, -node.depth))
+        worst.push(node, node, (-node.f, node.depth))
+
+    def addForgotten(node):
+        # Keep a partly pruned parent in the running for regeneration.
+        if node.children and node.forgotten < infinity:
+            best.push(node, node, (node.forgotten, -node.depth))
+
+    def backup(node):
+        # Raise f-values up the tree to the lowest f below each node.
+        while node is not None and node.children:
+            f = min(node.forgotten, min(child.f for child in node.children))
+            if f <= node.f:
+                break
+            node.f = f
+            node = node.parent
+
+    def pruneWorstLeaf():
+        node = worst.pop()
+        best.remove(node)
+        parent = node.parent
+        parent.children.remove(node)
+        parent.forgotten = min(parent.forgotten, node.f)
+        if not parent.children:
+            addLeaf(parent)
+        else:
+            addForgotten(parent)
+
+    addLeaf(root)
+    stored = 1
+    max_stored = 1
+    max_fringe = 1
+    bound = start_h
+
+    while not best.isEmpty():
+        current_size = best.size()
+        if current_size > max_fringe:
+            max_fringe = current_size
+        if limits is not None:
+            limit = limits.exceeded(expanded, stored)
+            if limit is not None:
+                return _finish(problem, [], BUDGET_EXHAUSTED, start_time, expanded, max_fringe,
+                               max_stored, limit, bound=bound)
+
+        f_best = best.peekPriority()[0]
+        node = best.pop()
+        is_leaf = not node.children
+        if is_leaf:
+            worst.remove(node)
+        if f_best == infinity:
+            # Every remaining path is too deep for the cap.
+            return _finish(problem, [], BUDGET_EXHAUSTED, start_time, expanded, max_fringe,
+                           max_stored, "states", bound=bound)
+        if f_best > bound:
+            bound = f_best
+        problem.expanded_nodes += 1
+        expanded += 1
+        if tracer is not None:
+            tracer.expand(f_best, node.g, node.h, current_size, stored,
+                          node.state in expanded_once)
+            expanded_once.add(node.state)
+
+        if is_leaf and isGoal(node.state):
+            return _finish(problem, node.path(), SOLVED, start_time, expanded, max_fringe, max_stored,
+                           optimal=True)
+
+        # A leaf holds no children, so (re)generate all of them; a parent
+        # popped for its forgotten f regenerates only the missing ones,
+        # whose f is at least that forgotten f.
+        floor_f = node.f if is_leaf else node.forgotten
+        node.forgotten = infinity
+        back = node.parent.state if node.parent is not None else None
+        present = {child.state for child in node.children}
+        depth = node.depth + 1
+        children = []
+        for (succ, action, step_cost, succ_h) in successors(node.state, node.h):
+            if succ == back or succ in present:
+                continue
+            new_g = node.g + step_cost
+            if depth + 2 > cap and not isGoal(succ):
+                f = infinity  # no room to go below this child
+            else:
+                f = max(floor_f, new_g + succ_h)
+            children.append(_MemoryNode(succ, node, action, new_g, succ_h, f, depth))
+
+        # Make room before storing them, so the cap is never exceeded.
+        while stored + len(children) > cap and not worst.isEmpty():
+            pruneWorstLeaf()
+            stored -= 1
+        if node in worst:
+            # Its own older children were pruned, so it came back as a leaf.
+            worst.remove(node)
+            best.remove(node)
+        if stored + len(children) > cap:
+            children.sort(key=lambda child: child.f)
+            for child in children[cap - stored:]:
+                node.forgotten = min(node.forgotten, child.f)
+            children = children[:cap - stored]
+        for child in children:
+            node.children.append(child)
+            addLeaf(child)
+        stored += len(children)
+        if stored > max_stored:
+            max_stored = stored
+
+        if node.children:
+            backup(node)
+            addForgotten(node)
+        else:
+            node.f = node.forgotten
+            addLeaf(node)
+            backup(node.parent)
+
+    return _finish(problem, [], UNSOLVABLE, start_time, expanded, max_fringe, max_stored)
+
+#############################
+# /*=====End Change Task 18=====*/
+#############################
+
+#############################
+# /*=====Start Change Task 23=====*/
+#############################
+# Batched A*: children of a group of frontier nodes are generated and
+# scored in one call, e.g. by vectorheuristics.BatchHeuristics.
+
+def batchedAStarSearch(problem, heuristic=nullHeuristic, batchSize=256,
+                       maxNodes=None, maxTime=None, maxStates=None, tracer=None):
+    """
+    A* that pops up to batchSize nodes of the lowest f at a time and
+    expands them together. If the heuristic has
+        heuristic.batchSuccessors(states, hs) -> [[(succ, action, cost, succ_h)], ...]
+    all their children come from that one call; otherwise each node is
+    expanded as in aStarSearch. Only nodes of equal (lowest) f share a
+    batch, so the first goal popped is still optimal for an admissible h.
+    """
+    limits = _makeLimits(maxNodes, maxTime, maxStates)
+    start_time = time.time()
+    expanded = 0
+    batchSuccessors = getattr(heuristic, "batchSuccessors", None)
+    if tracer is not None:
+        heuristic = tracer.heuristic(heuristic)
+    if batchSuccessors is None:
+        successors = _successorsWithHeuristic(problem, heuristic)
+        def batchSuccessors(states, hs):
+            return [successors(state, h) for state, h in zip(states, hs)]
+    visited = {}
+    start_state = problem.getStartState()
+    start_h = heuristic(start_state, problem)
+    frontier = util.IndexedPriorityQueue()
+    isGoal = problem.isGoalState
+    if tracer is not None:
+        frontier, visited, isGoal, _ = tracer.instrument(frontier, visited, isGoal, None)
+        batchSuccessors = tracer.timed(batchSuccessors, "successors")
+    frontier.push(start_state, util.SearchNode(start_state, h=start_h), start_h)
+    max_fringe = 0
+    max_stored = 0
+    best_node = None
+    max_f = start_h
+
+    while not frontier.isEmpty():
+        batch = []
+        lowest_f = frontier.peekPriority()
+        while (len(batch) < batchSize and not frontier.isEmpty()
+               and frontier.peekPriority() == lowest_f):
+            current_size = frontier.size()
+            if current_size > max_fringe:
+                max_fringe = current_size
+            stored = current_size + len(visited)
+            if stored > max_stored:
+                max_stored = stored
+            if limits is not None:
+                limit = limits.exceeded(expanded, stored)
+                if limit is not None:
+                    partial = best_node.path() if best_node is not None else []
+                    return _finish(problem, [], BUDGET_EXHAUSTED, start_time, expanded, max_fringe,
+                                   max_stored, limit, partial, max_f)
+
+            node = frontier.pop()
+            state = node.state
+            problem.expanded_nodes += 1
+            expanded += 1
+            max_f = lowest_f
+            if best_node is None or node.h < best_node.h:
+                best_node = node
+
+            if isGoal(state):
+                return _finish(problem, node.path(), SOLVED, start_time, expanded, max_fringe,
+                               max_stored, optimal=True)
+
+            if (state not in visited) or (node.g < visited[state]):
+                if tracer is not None:
+                    tracer.expand(lowest_f, node.g, node.h, current_size, len(visited),
+                                  state in visited)
+                visited[state] = node.g
+                batch.append(node)
+            elif tracer is not None:
+                tracer.stale += 1
+
+        if not batch:
+            continue
+        children = batchSuccessors([node.state for node in batch], [node.h for node in batch])
+        for node, succs in zip(batch, children):
+            if tracer is not None:
+                tracer.generated += len(succs)
+            for (succ, action, step_cost, succ_h) in succs:
+                new_g = node.g + step_cost
+                if (succ not in visited) or (new_g < visited[succ]):
+                    frontier.update(succ, util.SearchNode(succ, node, action, new_g, succ_h),
+                                    new_g + succ_h)
+                elif tracer is not None:
+                    tracer.duplicates += 1
+
+    return _finish(problem, [], UNSOLVABLE, start_time, expanded, max_fringe, max_stored)
+
+#############################
+# /*=====End Change Task 23=====*/
+#############################
+
+#############################
+# /*=====Start Change Task 26=====*/
+#############################
+# Compact BFS for the sliding puzzles: packed-int frontier, duplicates
+# dropped when generated, and a PackedStateSet closed set.
+
+COMPACT_MOVES = ('up', 'down', 'left', 'right')
+
+def _packedMoveTable(geometry):
+    """
+    table[blank]: (move code, swapped cell, its shift, the blank's shift)
+    for every legal move; code i + 1 stands for COMPACT_MOVES[i].
+    """
+    bits = geometry.bits
+    return [tuple((COMPACT_MOVES.index(move) + 1, swap, bits * swap, bits * blank)
+                  for move, swap in geometry.moveTargets[blank].items())
+            for blank in range(geometry.cells)]
+
+def compactBreadthFirstSearch(problem, maxBytes=256 * 2**20, maxNodes=None, maxTime=None,
+                              maxStates=None, tracer=None):
+    """
+    BFS over packed states of a sliding puzzle whose packed form fits in
+    64 bits (up to the 15-puzzle). The frontier is one array('Q') of packed
+    states per depth, plus their blank cells. A state is looked up when it
+    is generated; the closed set keeps it with a one-byte move code, which
+    is enough to walk the path back from the goal. Everything fits in
+    maxBytes: 3/4 of it at most for the set (see PackedStateSet.forBudget),
+    the rest for the two frontier layers; running out stops the search with
+    limit "memory".
+
+    The result also carries memory_bytes (set plus peak frontier) and
+    bytes_per_state. With a tracer, closed set inserts are timed as the
+    closed list and the rest of each expansion's child loop (including the
+    inline goal comparison) as successors.
+    """
+    limits = _makeLimits(maxNodes, maxTime, maxStates)
+    start_time = time.time()
+    start_state = problem.getStartState()
+    geometry = start_state.geometry
+    if geometry.bits * geometry.cells > 64:
+        raise ValueError("compactBreadthFirstSearch needs a packed state of at most 64 bits.")
+    bits = geometry.bits
+    mask = geometry.mask
+    goal = problem.getGoalState().packed
+    targets = _packedMoveTable(geometry)
+
+    seen = util.PackedStateSet.forBudget(maxBytes * 3 // 4)
+    max_frontier = (maxBytes - seen.maxSlots * 9 * 3 // 2) // 9
+    add = seen.add
+    if tracer is not None:
+        add = tracer.timed(add, "closed list")
+    seen.add(start_state.packed, 0)
+    layer = array('Q', [start_state.packed])
+    blanks = array('B', [start_state.blank])
+    expanded = 0
+    max_fringe = 1
+    depth = 0
+
+    def finish(actions, status, limit=None):
+        result = _finish(problem, actions, status, start_time, expanded, max_fringe,
+                         len(seen), limit, bound=depth, optimal=status == SOLVED)
+        result.memory_bytes = seen.nbytes() + 9 * max_fringe
+        result.bytes_per_state = result.memory_bytes / len(seen)
+        return result
+
+    if start_state.packed == goal:
+        return finish([], SOLVED)
+
+    while layer:
+        next_layer = array('Q')
+        next_blanks = array('B')
+        for i in range(len(layer)):
+            current_size = len(layer) - i + len(next_layer)
+            if current_size > max_fringe:
+                max_fringe = current_size
+                if current_size > max_frontier:
+                    return finish([], BUDGET_EXHAUSTED, "memory")
+            if limits is not None:
+                limit = limits.exceeded(expanded, len(seen))
+                if limit is not None:
+                    return finish([], BUDGET_EXHAUSTED, limit)
+            packed = layer[i]
+            blank = blanks[i]
+            problem.expanded_nodes += 1
+            expanded += 1
+            if tracer is not None:
+                tracer.expand(depth, depth, 0, current_size, len(seen))
+                tracer.generated += len(targets[blank])
+                mark = tracer.begin()
+            for code, swap, swap_shift, blank_shift in targets[blank]:
+                tile = (packed >> swap_shift) & mask
+                child = packed ^ (tile << swap_shift) ^ (tile << blank_shift)
+                try:
+                    fresh = add(child, code)
+                except MemoryError:
+                    return finish([], BUDGET_EXHAUSTED, "memory")
+                if fresh:
+                    if child == goal:
+                        depth += 1
+                        return finish(_compactPath(problem, seen, child, swap), SOLVED)
+                    next_layer.append(child)
+                    next_blanks.append(swap)
+                elif tracer is not None:
+                    tracer.duplicates += 1
+            if tracer is not None:
+                tracer.end("successors", mark)
+        layer = next_layer
+        blanks = next_blanks
+        depth += 1
+
+    return finish([], UNSOLVABLE)
+
+def _compactPath(problem, seen, packed, blank):
+    """
+    Walks the move codes in 'seen' back from (packed, blank) to the start.
+    """
+    actions = []
+    state = problem.getStartState().stateClass.fromPacked(packed, blank)
+    code = seen.get(state.packed)
+    while code:
+        move = COMPACT_MOVES[code - 1]
+        actions.append(move)
+        state = state.result(problem.inverseAction(move))
+        code = seen.get(state.packed)
+    actions.reverse()
+    return actions
+
+#############################
+# /*=====End Change Task 26=====*/
+#############################
+
+#############################
+# /*=====Start Change Task 27=====*/
+#############################
+# Frontier search: BFS and A* that keep only the open nodes. Each node has
+# a bitmask of the moves that lead back to neighbours already generated,
+# so no closed list is needed; the path is recovered by divide and conquer.
+
+FRONTIER_OPPOSITE = (0, 2, 1, 4, 3)  # move code -> code of the move undoing it
+
+class _FrontierSearch:
+    """
+    Shared state of one frontierSearch call: the packed move table, the
+    heuristic on packed states, the limits and the counters. With a tracer
+    the heuristic and the A* open list are timed, and each expansion's
+    child loop (including the inline goal comparison) counts as successors.
+    """
+    def __init__(self, problem, heuristic, limits, tracer):
+        start = problem.getStartState()
+        self.problem = problem
+        self.stateClass = start.stateClass
+        self.mask = start.geometry.mask
+        self.moves = _packedMoveTable(start.geometry)
+        if tracer is not None and heuristic is not None:
+            heuristic = tracer.heuristic(heuristic)
+        self.heuristic = heuristic
+        self.delta = heuristicDelta(heuristic, problem) if heuristic is not None else None
+        self.limits = limits
+        self.tracer = tracer
+        self.expanded = 0
+        self.max_fringe = 0
+
+    def h(self, packed, blank):
+        if self.heuristic is None:
+            return 0
+        return self.heuristic(self.stateClass.fromPacked(packed, blank), self.problem)
+
+    def childH(self, h, child, tile, swap, blank):
+        if self.heuristic is None:
+            return 0
+        if self.delta is not None:
+            return self.delta(h, tile, swap, blank)
+        return self.heuristic(self.stateClass.fromPacked(child, swap), self.problem)
+
+    def count(self, g, h, fringe, blank, used):
+        """
+        Records one expansion; raises _LimitReached when a limit is hit.
+        """
+        self.expanded += 1
+        self.problem.expanded_nodes += 1
+        if fringe > self.max_fringe:
+            self.max_fringe = fringe
+        if self.tracer is not None:
+            self.tracer.expand(g + h, g, h, fringe, 0)
+            # 'used' only holds moves that are legal from this blank.
+            self.tracer.generated += len(self.moves[blank]) - bin(used).count("1")
+        if self.limits is not None:
+            limit = self.limits.exceeded(self.expanded, fringe)
+            if limit is not None:
+                raise _LimitReached(limit, 0, g)
+
+    def layered(self, start, startBlank, target, maxDepth=None, relayDepth=None, offset=0,
+                bound=None):
+        """
+        Breadth-first frontier search from start, holding only the layer
+        being expanded and the next one (packed state -> [blank, used moves,
+        h, relay]). Children with offset + g + h > bound are pruned.
+
+        Returns (depth, relay) for the first layer holding target, where
+        relay is the (packed, blank) of the path's state at relayDepth (or
+        None), or None if no layer up to maxDepth holds it.
+        """
+        moves = self.moves
+        mask = self.mask
+        childH = self.childH
+        tracer = self.tracer
+        if start == target:
+            return 0, None
+        layer = {start: [startBlank, 0, self.h(start, startBlank), None]}
+        g = 0
+        while layer and (maxDepth is None or g < maxDepth):
+            g += 1
+            next_layer = {}
+            while layer:
+                # Popping shrinks the old layer as the new one grows.
+                packed, (blank, used, h, relay) = layer.popitem()
+                self.count(g - 1, h, len(layer) + len(next_layer) + 1, blank, used)
+                if tracer is not None:
+                    mark = tracer.begin()
+                for code, swap, swap_shift, blank_shift in moves[blank]:
+                    if used >> code & 1:
+                        continue
+                    tile = (packed >> swap_shift) & mask
+                    child = packed ^ (tile << swap_shift) ^ (tile << blank_shift)
+                    back = 1 << FRONTIER_OPPOSITE[code]
+                    entry = next_layer.get(child)
+                    if entry is not None:
+                        entry[1] |= back
+                        if tracer is not None:
+                            tracer.duplicates += 1
+                        continue
+                    child_h = childH(h, child, tile, swap, blank)
+                    if bound is not None and offset + g + child_h > bound:
+                        continue
+                    child_relay = (child, swap) if g == relayDepth else relay
+                    if child == target:
+                        return g, child_relay
+                    next_layer[child] = [swap, back, child_h, child_relay]
+                if tracer is not None:
+                    tracer.end("successors", mark)
+            layer = next_layer
+        return None
+
+    def bestFirst(self, start, startBlank, target, relayDepth=None):
+        """
+        A* frontier search: the open list holds [g, packed, blank, used
+        moves, h, relay] items and expanded nodes are dropped. Needs a
+        consistent heuristic, so that no dropped node would be improved.
+        Returns (cost, relay) as layered() does, or None.
+        """
+        moves = self.moves
+        mask = self.mask
+        childH = self.childH
+        tracer = self.tracer
+        frontier = util.IndexedPriorityQueue()
+        if tracer is not None:
+            frontier = _TracedQueue(frontier, tracer)
+        h0 = self.h(start, startBlank)
+        relay = (start, startBlank) if relayDepth == 0 else None
+        frontier.push(start, [0, start, startBlank, 0, h0, relay], h0)
+        while not frontier.isEmpty():
+            fringe = frontier.size()
+            g, packed, blank, used, h, relay = frontier.pop()
+            self.count(g, h, fringe, blank, used)
+            if packed == target:
+                return g, relay
+            child_g = g + 1
+            if tracer is not None:
+                mark = tracer.begin()
+            for code, swap, swap_shift, blank_shift in moves[blank]:
+                if used >> code & 1:
+                    continue
+                tile = (packed >> swap_shift) & mask
+                child = packed ^ (tile << swap_shift) ^ (tile << blank_shift)
+                back = 1 << FRONTIER_OPPOSITE[code]
+                child_relay = (child, swap) if child_g == relayDepth else relay
+                if child in frontier:
+                    item = frontier.item(child)
+                    item[3] |= back
+                    if child_g < item[0]:
+                        frontier.update(child, [child_g, child, swap, item[3], item[4], child_relay],
+                                        child_g + item[4])
+                    elif tracer is not None:
+                        tracer.duplicates += 1
+                    continue
+                child_h = childH(h, child, tile, swap, blank)
+                frontier.push(child, [child_g, child, swap, back, child_h, child_relay],
+                              child_g + child_h)
+            if tracer is not None:
+                tracer.end("successors", mark)
+        return None
+
+    def path(self, a, b, offset, depth, bound, relay=None, half=None):
+        """
+        Actions of a shortest path of length 'depth' from a to b (both
+        (packed, blank)), solved by divide and conquer: find the path's
+        middle state with a layered search, then solve each half.
+        """
+        if depth == 0:
+            return []
+        if depth == 1:
+            for code, swap, swap_shift, blank_shift in self.moves[a[1]]:
+                if swap == b[1]:
+                    return [COMPACT_MOVES[code - 1]]
+        if relay is None:
+            half = depth // 2
+            _, relay = self.layered(a[0], a[1], b[0], depth, half, offset, bound)
+        return (self.path(a, relay, offset, half, bound)
+                + self.path(relay, b, offset + half, depth - half, bound))
+
+def frontierSearch(problem, heuristic=None, maxNodes=None, maxTime=None, maxStates=None,
+                   tracer=None):
+    """
+    Frontier search (Korf) on a sliding puzzle: breadth-first when
+    heuristic is None, A* otherwise (the heuristic must be consistent).
+    Only open nodes are stored, each with a bitmask of the moves that lead
+    to neighbours already generated, so there is no closed list.
+
+    Nodes also carry their ancestor at a relay depth (h(start) / 2 for A*).
+    Once the goal is reached, the path through that middle state is solved
+    by the same search on each half, pruned by f <= the optimal cost, and so
+    on recursively. BFS does not know the depth in advance, so it finds the
+    middle with one more pass once the depth is known.
+    """
+    limits = _makeLimits(maxNodes, maxTime, maxStates)
+    start_time = time.time()
+    ctx = _FrontierSearch(problem, heuristic, limits, tracer)
+    start = problem.getStartState()
+    goal = problem.getGoalState()
+    try:
+        if heuristic is None:
+            found = ctx.layered(start.packed, start.blank, goal.packed)
+            relay_depth = None
+        else:
+            relay_depth = ctx.h(start.packed, start.blank) // 2 or None
+            found = ctx.bestFirst(start.packed, start.blank, goal.packed, relay_depth)
+        if found is None:
+            return _finish(problem, [], UNSOLVABLE, start_time, ctx.expanded,
+                           ctx.max_fringe, ctx.max_fringe)
+        depth, relay = found
+        bound = depth if heuristic is not None else None
+        actions = ctx.path((start.packed, start.blank), (goal.packed, goal.blank), 0, depth,
+                              bound, relay, relay_depth)
+    except _LimitReached as stop:
+        return _finish(problem, [], BUDGET_EXHAUSTED, start_time, ctx.expanded,
+                       ctx.max_fringe, ctx.max_fringe, stop.limit)
+    return _finish(problem, actions, SOLVED, start_time, ctx.expanded, ctx.max_fringe,
+                   ctx.max_fringe, optimal=True)
+
+#############################
+# /*=====End Change Task 27=====*/
+#############################
+
+#############################
+# /*=====Start Change Task 29=====*/
+#############################
+# Enhanced partial-expansion A* (EPEA*): a node only generates the
+# children whose f equals its stored f, then goes back on the open list
+# with the next f among its children.
+
+def partialExpansionAStarSearch(problem, heuristic=nullHeuristic, maxNodes=None, maxTime=None,
+                                maxStates=None, tracer=None):
+    """
+    EPEA*: the open list holds each node under a stored F, first its own f.
+    Expanding it generates only the children with f == F and re-queues the
+    node under the smallest child f above F, if any. Children with a
+    higher f are never put on the open list unless they are needed.
+
+    If the heuristic has operatorTableFor(geometry) (see
+    fifteenpuzzle.operatorTable), the f change of every move is read from
+    that per-tile table and only the qualifying children are created;
+    otherwise all children are scored and the others dropped (plain PEA*).
+    With an inconsistent heuristic a child can have a lower f than its
+    parent; the first expansion of a node also generates those, as A*
+    would. 'expanded' counts every partial expansion.
+    """
+    limits = _makeLimits(maxNodes, maxTime, maxStates)
+    start_time = time.time()
+    expanded = 0
+    start_state = problem.getStartState()
+    operatorTableFor = getattr(heuristic, "operatorTableFor", None)
+    osf = operatorTableFor(start_state.geometry) if operatorTableFor is not None else None
+    if tracer is not None:
+        heuristic = tracer.heuristic(heuristic)
+    successors = _successorsWithHeuristic(problem, heuristic)
+    visited = {}
+    start_h = heuristic(start_state, problem)
+    frontier = util.IndexedPriorityQueue()
+    isGoal = problem.isGoalState
+    if tracer is not None:
+        frontier, visited, isGoal, successors = tracer.instrument(frontier, visited, isGoal,
+                                                                  successors)
+    frontier.push(start_state, util.SearchNode(start_state, h=start_h), start_h)
+    if osf is not None:
+        geometry = start_state.geometry
+        bits = geometry.bits
+        mask = geometry.mask
+        fromPacked = start_state.stateClass.fromPacked
+    max_fringe = 0
+    max_stored = 0
+    best_node = None
+    max_f = start_h
+
+    while not frontier.isEmpty():
+        current_size = frontier.size()
+        if current_size > max_fringe:
+            max_fringe = current_size
+        stored = current_size + len(visited)
+        if stored > max_stored:
+            max_stored = stored
+        if limits is not None:
+            limit = limits.exceeded(expanded, stored)
+            if limit is not None:
+                partial = best_node.path() if best_node is not None else []
+                return _finish(problem, [], BUDGET_EXHAUSTED, start_time, expanded, max_fringe,
+                               max_stored, limit, partial, max_f)
+
+        stored_f = frontier.peekPriority()
+        node = frontier.pop()
+        state = node.state
+        cost_g = node.g
+        problem.expanded_nodes += 1
+        expanded += 1
+        max_f = stored_f
+        if best_node is None or node.h < best_node.h:
+            best_node = node
+
+        if isGoal(state):
+            return _finish(problem, node.path(), SOLVED, start_time, expanded, max_fringe, max_stored,
+                           optimal=True)
+
+        if (state in visited) and (cost_g > visited[state]):
+            if tracer is not None:
+                tracer.stale += 1
+            continue
+        if tracer is not None:
+            # Later partial expansions at the same g are not re-expansions.
+            tracer.expand(stored_f, cost_g, node.h, current_size, len(visited),
+                          state in visited and cost_g < visited[state])
+        visited[state] = cost_g
+        # The children's f must rise by 'wanted' to reach stored_f. The
+        # first expansion (wanted == 0) also takes children whose f drops.
+        wanted = stored_f - cost_g - node.h
+        first = wanted == 0
+        next_f = None
+        children = []
+        if osf is not None:
+            packed = state.packed
+            blank = state.blank
+            for move, swap, dfs in osf[blank]:
+                tile = (packed >> (bits * swap)) & mask
+                df = dfs[tile]
+                if df == wanted or (first and df < 0):
+                    child = fromPacked(packed ^ (tile << (bits * swap)) ^ (tile << (bits * blank)),
+                                       swap)
+                    children.append((child, move, 1, node.h + df - 1))
+                elif df > wanted and (next_f is None or df < next_f):
+                    next_f = df
+            if tracer is not None:
+                tracer.generated += len(children)
+        else:
+            for succ in successors(state, node.h):
+                df = succ[2] + succ[3] - node.h
+                if df == wanted or (first and df < 0):
+                    children.append(succ)
+                elif df > wanted and (next_f is None or df < next_f):
+                    next_f = df
+
+        for (succ, action, step_cost, succ_h) in children:
+            new_g = cost_g + step_cost
+            if (succ not in visited) or (new_g < visited[succ]):
+                frontier.update(succ, util.SearchNode(succ, node, action, new_g, succ_h),
+                                new_g + succ_h)
+            elif tracer is not None:
+                tracer.duplicates += 1
+        if next_f is not None:
+            # Back on the open list for its next batch of children.
+            frontier.update(state, node, cost_g + node.h + next_f)
+
+    return _finish(problem, [], UNSOLVABLE, start_time, expanded, max_fringe, max_stored)
+
+#############################
+# /*=====End Change Task 29=====*/
+#############################
+
 # Abbreviations
 bfs  = breadthFirstSearch
 dfs  = depthFirstSearch
 ucs  = uniformCostSearch
 astar= aStarSearch
+idastar = idaStarSearch
+bidirectional = bidirectionalSearch
+wastar = weightedAStarSearch
+arastar = anytimeAStarSearch
+smastar = smaStarSearch
+batchedastar = batchedAStarSearch
+compactbfs = compactBreadthFirstSearch
+frontiersearch = frontierSearch
+epeastar = partialExpansionAStarSearch
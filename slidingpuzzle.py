@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+slidingpuzzle.py
+
+Size-generic NxN sliding puzzle: the 8-puzzle (3x3), the 15-puzzle (4x4),
+the 24-puzzle (5x5) and larger. Tiles are 1..N*N-1 and the blank is 0; the
+goal has the tiles in row-major order with the blank in the bottom-right.
+
+Everything that depends on the board size is precomputed once per size in
+a PuzzleGeometry: the move table, the goal cell of every tile and the
+packed goal. A state is a single int holding one fixed-width field per
+cell, 4 bits up to the 15-puzzle and as many as the largest tile needs
+beyond. States of one size share a class whose 'geometry' attribute points
+at these tables, so a state costs no more memory than the 15-puzzle's.
+
+fifteenpuzzle.py specialises the classes here for the 4x4 board.
+"""
+
+import random
+import search
+
+OPPOSITE_MOVES = {'up': 'down', 'down': 'up', 'left': 'right', 'right': 'left'}
+
+
+class PuzzleGeometry:
+    """
+    Precomputed tables for the NxN board. Use geometryFor(size) to get the
+    shared instance of a size.
+    """
+
+    def __init__(self, size):
+        if size < 2:
+            raise ValueError("A sliding puzzle needs at least a 2x2 board.")
+        cells = size * size
+        self.size = size
+        self.cells = cells
+        self.bits = max(4, (cells - 1).bit_length())  # bits per packed cell
+        self.mask = (1 << self.bits) - 1
+
+        # moveTargets[blank]: the index of the tile that slides into the
+        # blank for each legal move.
+        self.moveTargets = []
+        for blank in range(cells):
+            r, c = divmod(blank, size)
+            targets = {}
+            if r > 0:
+                targets['up'] = blank - size
+            if r < size - 1:
+                targets['down'] = blank + size
+            if c > 0:
+                targets['left'] = blank - 1
+            if c < size - 1:
+                targets['right'] = blank + 1
+            self.moveTargets.append(targets)
+        self.legalMoves = [tuple(targets) for targets in self.moveTargets]
+
+        # goalIndex[tile]: the tile's goal cell (the blank's is the last cell).
+        self.goalTiles = list(range(1, cells)) + [0]
+        self.goalIndex = [cells - 1] + list(range(cells - 1))
+        self.goalRow = [idx // size for idx in self.goalIndex]
+        self.goalCol = [idx % size for idx in self.goalIndex]
+        self.goalBlank = cells - 1
+        self.goalPacked = self.pack(self.goalTiles)
+
+    def pack(self, tiles):
+        """
+        Packs a row-major tile list into one int.
+        """
+        bits = self.bits
+        packed = 0
+        for idx, val in enumerate(tiles):
+            packed |= val << (bits * idx)
+        return packed
+
+    def unpack(self, packed):
+        """
+        Inverse of pack.
+        """
+        bits = self.bits
+        mask = self.mask
+        return [(packed >> (bits * idx)) & mask for idx in range(self.cells)]
+
+    def tileTable(self, cost):
+        """
+        Builds table[tile][pos] = cost(tile, goal_r, goal_c, r, c) for every
+        tile (0 = blank) and position.
+        """
+        size = self.size
+        return [[cost(tile, self.goalRow[tile], self.goalCol[tile], pos // size, pos % size)
+                 for pos in range(self.cells)]
+                for tile in range(self.cells)]
+
+    def isSolvable(self, tiles):
+        """
+        Parity test. On an odd-width board the number of inversions (among
+        the tiles, row-major) must be even; on an even-width board the
+        inversions plus the blank's row must be odd, as in the goal.
+        """
+        order = [tile for tile in tiles if tile != 0]
+        inversions = sum(1 for i in range(len(order)) for j in range(i + 1, len(order))
+                         if order[i] > order[j])
+        if self.size % 2:
+            return inversions % 2 == 0
+        return (inversions + list(tiles).index(0) // self.size) % 2 == 1
+
+_GEOMETRIES = {}
+
+def geometryFor(size):
+    """
+    Returns the shared PuzzleGeometry of the NxN board, building it once.
+    """
+    geometry = _GEOMETRIES.get(size)
+    if geometry is None:
+        geometry = _GEOMETRIES[size] = PuzzleGeometry(size)
+    return geometry
+
+
+class SlidingPuzzleState:
+    """
+    Immutable NxN board. Not instantiated directly: puzzleClass(size) returns
+    the class for a size, with 'geometry' and 'size' set.
+
+    The packed int doubles as hash and equality key, and the blank index is
+    cached so moves never rescan the board.
+    """
+
+    __slots__ = ('packed', 'blank')
+    geometry = None
+    size = None
+    mutable = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Mutable boards snapshot to the immutable class they derive from.
+        if not cls.mutable:
+            cls.stateClass = cls
+
+    def __init__(self, numbers):
+        """
+        numbers: list or tuple of the N*N tiles in row-major order, 0 = blank.
+        """
+        geometry = self.geometry
+        if len(numbers) != geometry.cells:
+            raise ValueError(f"A {self.size}x{self.size} puzzle needs exactly "
+                             f"{geometry.cells} numbers (0..{geometry.cells - 1}).")
+        self.packed = geometry.pack(numbers)
+        self.blank = list(numbers).index(0)
+
+    @classmethod
+    def fromPacked(cls, packed, blank=None):
+        """
+        Builds a state directly from its packed int, skipping validation.
+        The blank index is located if not given.
+        """
+        state = cls.__new__(cls)
+        state.packed = packed
+        if blank is None:
+            bits = cls.geometry.bits
+            mask = cls.geometry.mask
+            blank = 0
+            while (packed >> (bits * blank)) & mask:
+                blank += 1
+        state.blank = blank
+        return state
+
+    @classmethod
+    def goal(cls):
+        return cls.stateClass.fromPacked(cls.geometry.goalPacked, cls.geometry.goalBlank)
+
+    def tiles(self):
+        """
+        Returns the tiles as a flat row-major list.
+        """
+        return self.geometry.unpack(self.packed)
+
+    def tileAt(self, idx):
+        """
+        Returns the tile at row-major index idx.
+        """
+        return (self.packed >> (self.geometry.bits * idx)) & self.geometry.mask
+
+    @property
+    def cells(self):
+        """
+        Compatibility view: the board as a list of row lists.
+        Built on demand; modifying it does not change the state.
+        """
+        flat = self.tiles()
+        return [flat[r * self.size:(r + 1) * self.size] for r in range(self.size)]
+
+    @property
+    def blankLocation(self):
+        return divmod(self.blank, self.size)
+
+    def isGoal(self):
+        """
+        Checks whether the puzzle is in the goal configuration.
+        """
+        return self.packed == self.geometry.goalPacked
+
+    def legalMoves(self):
+        """
+        Returns the legal moves among 'up', 'down', 'left', and 'right'.
+        """
+        return self.geometry.legalMoves[self.blank]
+
+    def result(self, move):
+        """
+        Returns a new state with the blank moved in the given direction.
+        """
+        geometry = self.geometry
+        swap_idx = geometry.moveTargets[self.blank].get(move)
+        if swap_idx is None:
+            raise ValueError("Invalid move: " + move)
+        # The blank field is 0, so XOR-ing the tile into both positions
+        # clears it at swap_idx and places it at the old blank index.
+        bits = geometry.bits
+        tile = (self.packed >> (bits * swap_idx)) & geometry.mask
+        packed = self.packed ^ (tile << (bits * swap_idx)) ^ (tile << (bits * self.blank))
+        return self.stateClass.fromPacked(packed, swap_idx)
+
+    def __eq__(self, other):
+        if not isinstance(other, SlidingPuzzleState):
+            return NotImplemented
+        return self.packed == other.packed and self.geometry is other.geometry
+
+    def __hash__(self):
+        return self.packed
+
+    def __str__(self):
+        width = len(str(self.geometry.cells - 1))
+        lines = []
+        lines.append("-" * ((width + 2) * self.size + 3))
+        for row in self.cells:
+            row_str = []
+            for val in row:
+                if val == 0:
+                    row_str.append(" " * width)
+                else:
+                    row_str.append(f"{val:{width}d}")
+            lines.append("| " + " ".join(row_str) + " |")
+        lines.append("-" * ((width + 2) * self.size + 3))
+        return "\n".join(lines)
+
+class SlidingPuzzleBoard(SlidingPuzzleState):
+    """
+    Mutable board for depth-first searches: apply() and undo() slide a tile
+    in place, so a whole search tree can be walked with a single object.
+    Do not use it as a dict key while it is being changed.
+    """
+
+    __slots__ = ()
+    mutable = True
+
+    def apply(self, move):
+        """
+        Moves the blank in the given direction in place and returns the tile
+        that slid into the old blank position.
+        """
+        geometry = self.geometry
+        swap_idx = geometry.moveTargets[self.blank][move]
+        bits = geometry.bits
+        tile = (self.packed >> (bits * swap_idx)) & geometry.mask
+        self.packed ^= (tile << (bits * swap_idx)) ^ (tile << (bits * self.blank))
+        self.blank = swap_idx
+        return tile
+
+    def undo(self, move):
+        """
+        Reverts apply(move).
+        """
+        self.apply(OPPOSITE_MOVES[move])
+
+    def freeze(self):
+        """
+        Returns an immutable snapshot of the board.
+        """
+        return self.stateClass.fromPacked(self.packed, self.blank)
+
+_STATE_CLASSES = {}
+
+def registerPuzzleClass(cls, boardClass):
+    """
+    Makes cls (and its mutable boardClass) the classes puzzleClass(size)
+    returns for their size.
+    """
+    cls.boardClass = boardClass
+    _STATE_CLASSES[cls.size] = cls
+
+def puzzleClass(size):
+    """
+    Returns the immutable state class of the NxN puzzle. Its boardClass
+    attribute is the matching mutable board.
+    """
+    cls = _STATE_CLASSES.get(size)
+    if cls is None:
+        geometry = geometryFor(size)
+        name = f"Puzzle{size}x{size}"
+        cls = type(name + "State", (SlidingPuzzleState,),
+                   {"__slots__": (), "geometry": geometry, "size": size})
+        board = type(name + "Board", (SlidingPuzzleBoard, cls), {"__slots__": ()})
+        registerPuzzleClass(cls, board)
+    return cls
+
+def puzzleState(tiles):
+    """
+    Builds a state from a row-major tile list; the size follows from its
+    length (9, 16, 25, ...).
+    """
+    size = int(round(len(tiles) ** 0.5))
+    if size * size != len(tiles):
+        raise ValueError(f"{len(tiles)} tiles do not fill a square board.")
+    return puzzleClass(size)(tiles)
+
+def randomWalkPuzzle(size, moves, rng=random):
+    """
+    Applies 'moves' random moves to the NxN goal, never undoing the previous
+    move. The optimal distance is at most 'moves' and has the same parity.
+    """
+    puzzle = puzzleClass(size).goal()
+    previous = None
+    for _ in range(moves):
+        possible = [move for move in puzzle.legalMoves() if move != OPPOSITE_MOVES.get(previous)]
+        previous = rng.choice(possible)
+        puzzle = puzzle.result(previous)
+    return puzzle
+
+
+class SlidingPuzzleSearchProblem(search.SearchProblem):
+    """
+    Wraps a sliding puzzle state of any size into a search problem.
+    Also maintains counters for expanded nodes and maximum fringe size.
+    """
+    def __init__(self, puzzleState):
+        self.startState = puzzleState
+        self.expanded_nodes = 0
+        self.max_fringe = 0
+
+    def getStartState(self):
+        return self.startState
+
+    def isGoalState(self, state):
+        return state.isGoal()
+
+    def getSuccessors(self, state):
+        succs = []
+        for move in state.legalMoves():
+            next_state = state.result(move)
+            succs.append((next_state, move, 1))  # Each move costs 1
+        return succs
+
+    def getSuccessorsWithHeuristic(self, state, h, delta):
+        """
+        Like getSuccessors, but returns (succ, action, cost, succ_h) tuples,
+        where succ_h is derived from the parent's h by a heuristic delta.
+        """
+        succs = []
+        geometry = state.geometry
+        bits = geometry.bits
+        mask = geometry.mask
+        fromPacked = state.stateClass.fromPacked
+        packed = state.packed
+        blank = state.blank
+        for move, swap_idx in geometry.moveTargets[blank].items():
+            tile = (packed >> (bits * swap_idx)) & mask
+            next_state = fromPacked(
+                packed ^ (tile << (bits * swap_idx)) ^ (tile << (bits * blank)), swap_idx)
+            succs.append((next_state, move, 1, delta(h, tile, swap_idx, blank)))
+        return succs
+
+    def getCostOfActions(self, actions):
+        return len(actions)
+
+    def getMutableStartState(self):
+        return self.startState.boardClass.fromPacked(self.startState.packed, self.startState.blank)
+
+    def inverseAction(self, action):
+        return OPPOSITE_MOVES[action]
+
+    def getGoalState(self):
+        return self.startState.goal()
+
+    def getPredecessors(self, state):
+        # Every move can be undone, so the predecessors are the successors,
+        # each reached back by the opposite move.
+        preds = []
+        for move in state.legalMoves():
+            preds.append((state.result(move), OPPOSITE_MOVES[move], 1))
+        return preds
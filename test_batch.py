@@ -0,0 +1,20 @@
+"""
+Checks for batch.py: run with python -m pytest.
+"""
+
+import time
+
+import batch
+
+
+def _ignoresLimits(problem, **limits):
+    while True:
+        time.sleep(0.01)
+
+
+def test_runjob_cuts_off_a_search_that_ignores_its_time_limit():
+    tiles = list(range(1, 16)) + [0]
+    start = time.time()
+    record = batch.runJob(_ignoresLimits, "stuck", 1, tiles, timeout=0.1)
+    assert record["status"] == batch.STATUS_TIMEOUT
+    assert time.time() - start < 0.1 * 2 + batch.HARD_TIMEOUT_GRACE + 1
@@ -0,0 +1,65 @@
+"""
+Checks for cache.py: run with python -m pytest.
+"""
+
+import search
+from cache import SolutionCache, cachedSearch
+from fifteenpuzzle import (
+    FifteenPuzzleSearchProblem,
+    FifteenPuzzleState,
+    h3_manhattanDistance,
+    readScenarioFile,
+)
+
+
+def _solve(state):
+    return search.aStarSearch(FifteenPuzzleSearchProblem(state), h3_manhattanDistance)
+
+
+def test_save_and_load_keep_paths_and_lru_order(tmp_path):
+    filename = str(tmp_path / "solutions.bin")
+    states = list(readScenarioFile("scenarios.csv"))[:3]
+    cache = SolutionCache(filename)
+    for state in states:
+        cache.storePath(state, _solve(state))
+    cache.lookup(states[0])
+    cache.save()
+
+    loaded = SolutionCache(filename)
+    assert list(loaded.entries.items()) == list(cache.entries.items())
+    for state in states:
+        assert loaded.lookup(state) == list(_solve(state))
+    # Every state along a stored path has the rest of the path.
+    actions = loaded.lookup(states[1])
+    middle = states[1]
+    for action in actions[:5]:
+        middle = middle.result(action)
+    assert loaded.distance(middle) == len(actions) - 5
+    assert loaded.distance(FifteenPuzzleState.goal()) == 0
+
+
+def test_lru_eviction_drops_the_least_recently_used():
+    goal = FifteenPuzzleState.goal()
+    first = goal.result("up")
+    second = goal.result("left")
+    third = first.result("left")
+    cache = SolutionCache(maxEntries=3)
+    cache.storePath(first, ["down"])   # first, goal
+    cache.storePath(second, ["right"])  # second, goal
+    assert len(cache) == 3
+    cache.lookup(first)
+    cache.storePath(third, ["right", "down"])  # third, first, goal
+    assert len(cache) == 3
+    assert second not in cache
+    assert first in cache and third in cache and goal in cache
+    assert cache.hits == 1 and cache.misses == 0
+
+
+def test_cached_search_answers_repeats_from_the_cache():
+    cache = SolutionCache()
+    state = list(readScenarioFile("scenarios.csv"))[0]
+    run = cachedSearch(search.aStarSearch, cache)
+    first = run(FifteenPuzzleSearchProblem(state), h3_manhattanDistance)
+    again = run(FifteenPuzzleSearchProblem(state), h3_manhattanDistance)
+    assert list(again) == list(first)
+    assert getattr(again, "cached", False) and not getattr(first, "cached", False)
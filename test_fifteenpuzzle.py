@@ -0,0 +1,42 @@
+"""
+Checks for fifteenpuzzle.py: run with python -m pytest.
+"""
+
+import math
+import random
+
+from fifteenpuzzle import (
+    FifteenPuzzleState,
+    isSolvable,
+    iterRandomSolvablePuzzles,
+    rankState,
+    readScenarioFile,
+    unrankState,
+    writeScenarioFile,
+)
+
+
+def test_rank_unrank_round_trip():
+    rng = random.Random(1)
+    assert rankState(unrankState(0)) == 0
+    assert rankState(unrankState(math.factorial(16) - 1)) == math.factorial(16) - 1
+    for _ in range(200):
+        rank = rng.randrange(math.factorial(16))
+        state = unrankState(rank)
+        assert rankState(state) == rank
+        assert unrankState(rankState(state)) == state
+
+
+def test_random_solvable_puzzles_are_solvable_and_seeded():
+    states = list(iterRandomSolvablePuzzles(200, seed=7))
+    assert all(isSolvable(state.tiles()) for state in states)
+    assert states == list(iterRandomSolvablePuzzles(200, seed=7))
+    assert len(set(states)) == 200
+
+
+def test_scenario_files_round_trip(tmp_path):
+    states = list(iterRandomSolvablePuzzles(50, seed=3)) + [FifteenPuzzleState.goal()]
+    for name in ("boards.bin", "boards.csv"):
+        filename = str(tmp_path / name)
+        writeScenarioFile(filename, states)
+        assert list(readScenarioFile(filename)) == states
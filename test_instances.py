@@ -0,0 +1,19 @@
+"""
+Checks for the bundled instance sets: run with python -m pytest.
+"""
+
+from benchmark import KORF_FILE, loadInstanceSet
+from fifteenpuzzle import isSolvable, h3_manhattanDistance
+
+
+def test_korf100_instances_are_solvable():
+    states = loadInstanceSet("korf100")
+    with open(KORF_FILE) as f:
+        lengths = [int(line.split()[-1]) for line in f if line.strip() and not line.startswith("#")]
+    assert len(states) == len(lengths) == 100
+    assert sum(lengths) == 5305
+    for state, length in zip(states, lengths):
+        assert isSolvable(state.tiles())
+        # Every move changes the Manhattan distance by one.
+        h = h3_manhattanDistance(state)
+        assert h <= length and (length - h) % 2 == 0
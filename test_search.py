@@ -0,0 +1,140 @@
+"""
+Checks for search.py: run with python -m pytest.
+"""
+
+import search
+from fsm import defaultFsm
+from slidingpuzzle import SlidingPuzzleSearchProblem, puzzleState
+from fifteenpuzzle import (
+    FifteenPuzzleSearchProblem,
+    readScenarioFile,
+    h1_misplacedTiles,
+    h3_manhattanDistance,
+    h4_rowColDifference,
+    h5_linearConflict,
+    h6_walkingDistance,
+)
+
+
+def test_smastar_depths_match_astar_under_small_caps():
+    for state in readScenarioFile("scenarios.csv"):
+        depth = len(search.aStarSearch(FifteenPuzzleSearchProblem(state), h3_manhattanDistance))
+        for cap in (100, 200, 500):
+            result = search.smaStarSearch(FifteenPuzzleSearchProblem(state), h3_manhattanDistance,
+                                          maxStates=cap)
+            assert result.status == search.SOLVED
+            assert len(result) == depth, (state, cap)
+
+
+def test_idastar_with_fsm_keeps_optimal_depths():
+    fsm = defaultFsm()
+    for state in readScenarioFile("scenarios.csv"):
+        depth = len(search.aStarSearch(FifteenPuzzleSearchProblem(state), h3_manhattanDistance))
+        result = search.idaStarSearch(FifteenPuzzleSearchProblem(state), h3_manhattanDistance, fsm=fsm)
+        assert len(result) == depth, state
+
+
+def test_epeastar_depths_match_astar():
+    # h1 counts the blank, so it is inconsistent; h5 and h6 have no
+    # operator table and take the plain PEA* path.
+    for heuristic in (h1_misplacedTiles, h3_manhattanDistance, h4_rowColDifference,
+                      h5_linearConflict, h6_walkingDistance):
+        for state in readScenarioFile("scenarios.csv"):
+            depth = len(search.aStarSearch(FifteenPuzzleSearchProblem(state), heuristic))
+            if heuristic is h1_misplacedTiles and depth > 20:
+                continue
+            result = search.partialExpansionAStarSearch(FifteenPuzzleSearchProblem(state), heuristic)
+            assert result.status == search.SOLVED
+            assert len(result) == depth, (heuristic.__name__, state)
+
+
+def test_tracer_breaks_down_memory_light_searches():
+    state = list(readScenarioFile("scenarios.csv"))[2]
+    runs = (
+        lambda tracer: search.idaStarSearch(FifteenPuzzleSearchProblem(state), h3_manhattanDistance,
+                                            tracer=tracer),
+        lambda tracer: search.frontierSearch(FifteenPuzzleSearchProblem(state), tracer=tracer),
+        lambda tracer: search.frontierSearch(FifteenPuzzleSearchProblem(state),
+                                             h3_manhattanDistance, tracer=tracer),
+        lambda tracer: search.compactBreadthFirstSearch(FifteenPuzzleSearchProblem(state),
+                                                        tracer=tracer),
+    )
+    for run in runs:
+        tracer = search.SearchTracer()
+        assert run(tracer).status == search.SOLVED
+        report = tracer.report()
+        assert report["generated"] >= report["expanded"] > 0
+        assert report["times"]["successors"] > 0
+
+
+def test_idastar_depths_match_astar_and_reach_the_goal():
+    for start in readScenarioFile("scenarios.csv"):
+        problem = FifteenPuzzleSearchProblem(start)
+        depth = len(search.aStarSearch(FifteenPuzzleSearchProblem(start), h3_manhattanDistance))
+        result = search.idaStarSearch(problem, h3_manhattanDistance)
+        assert result.status == search.SOLVED and len(result) == depth
+        # Make/unmake works on a copy: the problem's start state is unchanged.
+        assert problem.getStartState() == start
+        state = start
+        for action in result:
+            state = state.result(action)
+        assert state.isGoal()
+
+
+def test_weighted_and_anytime_astar_respect_their_bounds():
+    for state in readScenarioFile("scenarios.csv"):
+        optimal = len(search.aStarSearch(FifteenPuzzleSearchProblem(state), h3_manhattanDistance))
+        weighted = search.weightedAStarSearch(FifteenPuzzleSearchProblem(state),
+                                              h3_manhattanDistance, weight=2.0)
+        assert weighted.status == search.SOLVED and optimal <= len(weighted) <= 2 * optimal
+
+        result = search.anytimeAStarSearch(FifteenPuzzleSearchProblem(state), h3_manhattanDistance)
+        assert result.status == search.SOLVED and len(result) == optimal
+        assert result.suboptimality == 1 and result.bound == optimal
+        costs = [cost for _, cost, _, _ in result.solutions]
+        assert costs == sorted(set(costs), reverse=True)
+        for _, cost, suboptimality, actions in result.solutions:
+            assert len(actions) == cost <= suboptimality * optimal + 1e-9
+
+        cut = search.anytimeAStarSearch(FifteenPuzzleSearchProblem(state), h3_manhattanDistance,
+                                        maxNodes=20)
+        assert cut.bound <= optimal
+        if cut.status == search.SOLVED:
+            assert optimal <= len(cut) <= cut.suboptimality * optimal + 1e-9
+
+
+def _reachesGoal(state, actions):
+    for action in actions:
+        state = state.result(action)
+    return state.isGoal()
+
+
+def test_compact_bfs_depths_and_memory_limit():
+    for state in readScenarioFile("scenarios.csv"):
+        depth = len(search.aStarSearch(FifteenPuzzleSearchProblem(state), h3_manhattanDistance))
+        if depth > 14:
+            continue
+        result = search.compactBreadthFirstSearch(FifteenPuzzleSearchProblem(state))
+        assert result.status == search.SOLVED and len(result) == depth
+        assert _reachesGoal(state, result)
+    result = search.compactBreadthFirstSearch(FifteenPuzzleSearchProblem(state), maxBytes=2**16)
+    assert result.status == search.BUDGET_EXHAUSTED and result.limit == "memory"
+    # The unsolvable half of the 8-puzzle: every reachable state is stored once.
+    result = search.compactBreadthFirstSearch(
+        SlidingPuzzleSearchProblem(puzzleState([2, 1, 3, 4, 5, 6, 7, 8, 0])))
+    assert result.status == search.UNSOLVABLE and result.stored == 181440
+
+
+def test_frontier_search_depths_match_astar():
+    for state in readScenarioFile("scenarios.csv"):
+        depth = len(search.aStarSearch(FifteenPuzzleSearchProblem(state), h3_manhattanDistance))
+        result = search.frontierSearch(FifteenPuzzleSearchProblem(state), h3_manhattanDistance)
+        assert result.status == search.SOLVED and len(result) == depth
+        assert _reachesGoal(state, result)
+        if depth <= 14:
+            result = search.frontierSearch(FifteenPuzzleSearchProblem(state))
+            assert result.status == search.SOLVED and len(result) == depth
+            assert _reachesGoal(state, result)
+    # Without a closed list, BFS still ends once the whole component is seen.
+    result = search.frontierSearch(SlidingPuzzleSearchProblem(puzzleState([2, 1, 3, 4, 5, 6, 7, 8, 0])))
+    assert result.status == search.UNSOLVABLE and result.expanded == 181440
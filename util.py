@@ -7,6 +7,8 @@ Data structures used by search.py
 
 import heapq
 import sys
+from array import array
+from collections import deque
 
 class Stack:
     def __init__(self):
@@ -26,14 +28,14 @@ class Stack:
 
 class Queue:
     def __init__(self):
-        self.list = []
+        self.list = deque()
 
     def push(self, item):
-        # front is the end of the list
-        self.list.insert(0, item)
+        # O(1) at both ends, unlike list.insert(0, item)
+        self.list.append(item)
 
     def pop(self):
-        return self.list.pop()
+        return self.list.popleft()
 
     def isEmpty(self):
         return len(self.list) == 0
@@ -74,6 +76,268 @@ class PriorityQueue:
                 return
         self.push(item, priority)
 
+class IndexedPriorityQueue:
+    """
+    Priority queue keyed by state, used as the A*/UCS open list.
+
+    Each key has at most one live entry. update() performs a decrease-key by
+    pushing a fresh entry and leaving the old one behind as stale; pop() skips
+    stale entries. Push, pop and decrease-key are O(log n), membership O(1).
+    """
+    def __init__(self):
+        self.heap = []
+        self.entries = {}  # key -> live (priority, count, key, item) entry
+        self.count = 0
+
+    def push(self, key, item, priority):
+        entry = (priority, self.count, key, item)
+        self.count += 1
+        self.entries[key] = entry
+        heapq.heappush(self.heap, entry)
+
+    def pop(self):
+        heap = self.heap
+        entries = self.entries
+        while heap:
+            entry = heapq.heappop(heap)
+            if entries.get(entry[2]) is entry:
+                del entries[entry[2]]
+                return entry[3]
+        raise IndexError("pop from an empty priority queue")
+
+    def isEmpty(self):
+        return len(self.entries) == 0
+
+    def size(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def priority(self, key):
+        """
+        Returns the current priority of key (KeyError if not queued).
+        """
+        return self.entries[key][0]
+
+    def item(self, key):
+        """
+        Returns the item queued under key (KeyError if not queued).
+        """
+        return self.entries[key][3]
+
+    def peekPriority(self):
+        """
+        Returns the lowest queued priority without popping.
+        """
+        heap = self.heap
+        while heap and self.entries.get(heap[0][2]) is not heap[0]:
+            heapq.heappop(heap)
+        if not heap:
+            raise IndexError("peek into an empty priority queue")
+        return heap[0][0]
+
+    def remove(self, key):
+        """
+        Drops key from the queue; its heap entry becomes stale.
+        """
+        del self.entries[key]
+
+    def update(self, key, item, priority):
+        """
+        If key is queued with a higher priority, lower it to priority and
+        replace its item. If it is not queued, push it. Otherwise do nothing.
+        """
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] <= priority:
+            return
+        self.push(key, item, priority)
+        # Drop stale entries once they outnumber the live ones.
+        if len(self.heap) > 2 * len(self.entries) + 1024:
+            self.heap = list(self.entries.values())
+            heapq.heapify(self.heap)
+
+class BucketPriorityQueue:
+    """
+    Open list for small non-negative integer priorities (e.g. A* f-values
+    on the 15-puzzle): one bucket per priority, LIFO within a bucket so the
+    most recently generated (deepest) node of the lowest f is popped first.
+
+    Same interface as IndexedPriorityQueue. Decrease-key leaves the old
+    entry behind as stale and pop() skips it. Push is O(1) and pop O(1)
+    amortised, since the lowest non-empty bucket only moves up between
+    pushes of smaller priorities.
+    """
+    def __init__(self):
+        self.buckets = []
+        self.entries = {}  # key -> live (priority, key, item) entry
+        self.minimum = 0
+
+    def push(self, key, item, priority):
+        entry = (priority, key, item)
+        self.entries[key] = entry
+        buckets = self.buckets
+        while len(buckets) <= priority:
+            buckets.append([])
+        buckets[priority].append(entry)
+        if priority < self.minimum:
+            self.minimum = priority
+
+    def pop(self):
+        buckets = self.buckets
+        entries = self.entries
+        while self.minimum < len(buckets):
+            bucket = buckets[self.minimum]
+            while bucket:
+                entry = bucket.pop()
+                if entries.get(entry[1]) is entry:
+                    del entries[entry[1]]
+                    return entry[2]
+            self.minimum += 1
+        raise IndexError("pop from an empty priority queue")
+
+    def isEmpty(self):
+        return len(self.entries) == 0
+
+    def size(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def priority(self, key):
+        """
+        Returns the current priority of key (KeyError if not queued).
+        """
+        return self.entries[key][0]
+
+    def update(self, key, item, priority):
+        """
+        If key is queued with a higher priority, lower it to priority and
+        replace its item. If it is not queued, push it. Otherwise do nothing.
+        """
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] <= priority:
+            return
+        self.push(key, item, priority)
+
+class PackedStateSet:
+    """
+    Hash set of packed states (non-zero ints below 2**64), each with a
+    one-byte value (e.g. the move that reached it). Keys live in an
+    array('Q') and values in a bytearray, open addressing with linear
+    probing, so a slot costs 9 bytes instead of a Python object per state.
+    The table doubles when 3/4 full, up to maxSlots slots; past that add()
+    raises MemoryError.
+    """
+    MULTIPLIER = 0x9E3779B97F4A7C15  # Fibonacci hashing
+
+    def __init__(self, capacity=1024, maxSlots=None):
+        self.maxSlots = maxSlots
+        self.count = 0
+        self._allocate(max(16, 1 << (capacity * 4 // 3 - 1).bit_length()))
+
+    @classmethod
+    def forBudget(cls, nbytes):
+        """
+        A set that grows as far as it can while its tables, including the
+        old and new tables during a resize, fit in nbytes.
+        """
+        slots = 16
+        while 2 * slots * 9 * 3 // 2 <= nbytes:
+            slots *= 2
+        return cls(maxSlots=slots)
+
+    def _allocate(self, slots):
+        self.slots = slots
+        self.shift = 64 - (slots.bit_length() - 1)
+        self.keys = array('Q', bytes(8 * slots))
+        self.values = bytearray(slots)
+        self.capacity = slots * 3 // 4
+
+    def _grow(self):
+        if self.maxSlots is not None and 2 * self.slots > self.maxSlots:
+            raise MemoryError("PackedStateSet is full")
+        keys = self.keys
+        values = self.values
+        self._allocate(2 * self.slots)
+        new_keys = self.keys
+        new_values = self.values
+        for idx in range(len(keys)):
+            key = keys[idx]
+            if key:
+                slot = self._slot(key)
+                new_keys[slot] = key
+                new_values[slot] = values[idx]
+
+    def _slot(self, key):
+        keys = self.keys
+        mask = self.slots - 1
+        idx = ((key * self.MULTIPLIER) & 0xFFFFFFFFFFFFFFFF) >> self.shift
+        while keys[idx] != key and keys[idx] != 0:
+            idx = (idx + 1) & mask
+        return idx
+
+    def add(self, key, value=0):
+        """
+        Adds key with value; returns False (and keeps the old value) if key
+        was already present.
+        """
+        idx = self._slot(key)
+        if self.keys[idx] == key:
+            return False
+        if self.count >= self.capacity:
+            self._grow()
+            idx = self._slot(key)
+        self.keys[idx] = key
+        self.values[idx] = value
+        self.count += 1
+        return True
+
+    def get(self, key, default=None):
+        idx = self._slot(key)
+        return self.values[idx] if self.keys[idx] == key else default
+
+    def __contains__(self, key):
+        return self.keys[self._slot(key)] == key
+
+    def __len__(self):
+        return self.count
+
+    def nbytes(self):
+        """
+        Bytes held by the key and value tables.
+        """
+        return self.slots * 9
+
+class SearchNode:
+    """
+    Search tree node: a state, the node it was generated from, the action
+    that led here and the path cost g (plus the heuristic value h when the
+    search tracks it). Nodes share their ancestors, so generating a child
+    is O(1); the action list is only built by path() once a goal is found.
+    """
+    __slots__ = ('state', 'parent', 'action', 'g', 'h')
+
+    def __init__(self, state, parent=None, action=None, g=0, h=0):
+        self.state = state
+        self.parent = parent
+        self.action = action
+        self.g = g
+        self.h = h
+
+    def path(self):
+        """
+        Returns the list of actions from the root to this node.
+        """
+        actions = []
+        node = self
+        while node.parent is not None:
+            actions.append(node.action)
+            node = node.parent
+        actions.reverse()
+        return actions
+
 def raiseNotDefined():
     print("Method not implemented.")
     sys.exit(1)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+vectorheuristics.py
+
+Batch evaluation of h1..h5 with NumPy, for scoring large numbers of boards
+offline (training data, instance hardness estimates) and for searches that
+score all children of a group of frontier nodes in one call.
+
+A batch of boards is an (N, cells) uint8 array, one row-major board per
+row with the blank as 0, e.g. (N, 16) for the 15-puzzle. Every heuristic
+is a lookup in the per-size tables the scalar heuristics in fifteenpuzzle.py
+use (HeuristicTables), indexed by tile and position and summed per row, so
+the vectors match the scalar values exactly.
+
+NumPy is optional. benchmark.py imports this module at top level; the
+import works without NumPy because np is then None, and only creating a
+BatchHeuristics (or calling the array helpers) needs it: BatchHeuristics
+raises ImportError when NumPy is missing.
+"""
+
+import time
+from slidingpuzzle import geometryFor, puzzleClass
+from fifteenpuzzle import (
+    heuristicTables,
+    readScenarioFile,
+    h1_misplacedTiles,
+    h2_euclideanDistance,
+    h3_manhattanDistance,
+    h4_rowColDifference,
+    h5_linearConflict
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MOVES = ('up', 'down', 'left', 'right')
+HEURISTIC_NAMES = ('h1', 'h2', 'h3', 'h4', 'h5')
+
+
+def statesToArray(states, size=4):
+    """
+    Returns the boards of 'states' as an (N, size*size) uint8 array.
+    """
+    geometry = geometryFor(size)
+    if geometry.bits * geometry.cells <= 64:
+        # Unpack all packed ints at once.
+        packed = np.fromiter((state.packed for state in states), dtype=np.uint64)
+        shifts = (geometry.bits * np.arange(geometry.cells)).astype(np.uint64)
+        return ((packed[:, None] >> shifts) & np.uint64(geometry.mask)).astype(np.uint8)
+    return np.array([state.tiles() for state in states], dtype=np.uint8).reshape(-1, geometry.cells)
+
+def arrayToStates(boards, size=4):
+    """
+    Inverse of statesToArray: a list of states of the NxN puzzle.
+    """
+    cls = puzzleClass(size)
+    blanks = np.argmin(boards, axis=1)
+    geometry = cls.geometry
+    if geometry.bits * geometry.cells <= 64:
+        shifts = (geometry.bits * np.arange(geometry.cells)).astype(np.uint64)
+        packed = np.bitwise_or.reduce(boards.astype(np.uint64) << shifts, axis=1)
+        return [cls.fromPacked(int(p), int(b)) for p, b in zip(packed, blanks)]
+    return [cls.fromPacked(geometry.pack(row), int(b)) for row, b in zip(boards.tolist(), blanks)]
+
+
+class BatchHeuristics:
+    """
+    Vectorised h1..h5 for one board size. Each hN(boards) takes an
+    (N, cells) array and returns a length-N vector; evaluate() returns all
+    five.
+
+    An instance is also a heuristic for the searches: calling it scores one
+    state with the heuristic named by 'heuristic', and batchSuccessors() is
+    the batched expansion search.batchedAStarSearch uses.
+    """
+
+    def __init__(self, size=4, heuristic="h5"):
+        if np is None:
+            raise ImportError("vectorheuristics needs NumPy (pip install numpy).")
+        if heuristic not in HEURISTIC_NAMES:
+            raise ValueError("Unknown heuristic: " + str(heuristic))
+        geometry = geometryFor(size)
+        tables = heuristicTables(geometry)
+        self.size = size
+        self.geometry = geometry
+        self.heuristic = heuristic
+        self.positions = np.arange(geometry.cells)
+
+        # table[tile, pos], as in the scalar heuristics.
+        self.misplaced = np.array(tables.misplaced, dtype=np.int16)
+        self.manhattan = np.array(tables.manhattan, dtype=np.int16)
+        self.rowCol = np.array(tables.rowCol, dtype=np.int16)
+        self.rowLineKey = np.array(tables.rowLineKey, dtype=np.int32)
+        self.colLineKey = np.array(tables.colLineKey, dtype=np.int32)
+        self.lineConflict = np.array(tables.lineConflict, dtype=np.int16)
+
+        # Goal coordinates per tile and coordinates per position, for h2.
+        self.goalRow = np.array(geometry.goalRow, dtype=np.float64)
+        self.goalCol = np.array(geometry.goalCol, dtype=np.float64)
+        self.posRow = (self.positions // size).astype(np.float64)
+        self.posCol = (self.positions % size).astype(np.float64)
+
+        # moveTargets[blank, move]: the cell that slides into the blank,
+        # or -1 if the move is illegal. Moves are in MOVES order.
+        self.moveTargets = np.full((geometry.cells, len(MOVES)), -1, dtype=np.int64)
+        for blank, targets in enumerate(geometry.moveTargets):
+            for move, target in targets.items():
+                self.moveTargets[blank, MOVES.index(move)] = target
+
+    def _tableSum(self, table, boards):
+        return table[boards, self.positions].sum(axis=1, dtype=np.int32)
+
+    def h1(self, boards):
+        return self._tableSum(self.misplaced, boards)
+
+    def h2(self, boards):
+        tiles = boards.astype(np.intp)
+        dr = self.posRow - self.goalRow[tiles]
+        dc = self.posCol - self.goalCol[tiles]
+        return np.where(tiles != 0, np.sqrt(dr * dr + dc * dc), 0.0).sum(axis=1)
+
+    def h3(self, boards):
+        return self._tableSum(self.manhattan, boards)
+
+    def h4(self, boards):
+        return self._tableSum(self.rowCol, boards)
+
+    def h5(self, boards):
+        size = self.size
+        n = len(boards)
+        # Sum each line's per-cell key digits, then look the keys up.
+        row_keys = self.rowLineKey[boards, self.positions].reshape(n, size, size).sum(axis=2)
+        col_keys = self.colLineKey[boards, self.positions].reshape(n, size, size).sum(axis=1)
+        conflicts = (self.lineConflict[row_keys].sum(axis=1, dtype=np.int32)
+                     + self.lineConflict[col_keys].sum(axis=1, dtype=np.int32))
+        return self.h3(boards) + conflicts
+
+    def evaluate(self, boards):
+        """
+        Returns {"h1": vector, ..., "h5": vector} for an (N, cells) array.
+        """
+        return {name: getattr(self, name)(boards) for name in HEURISTIC_NAMES}
+
+    def expand(self, boards, blanks=None):
+        """
+        Generates every child of every board. Returns (children, parents,
+        moves): the child boards, the row of each child's parent in
+        'boards', and the index in MOVES of the move that made it.
+        """
+        if blanks is None:
+            blanks = np.argmin(boards, axis=1)
+        targets = self.moveTargets[blanks]
+        parents, moves = np.nonzero(targets >= 0)
+        swap = targets[parents, moves]
+        children = boards[parents]
+        rows = np.arange(len(parents))
+        children[rows, blanks[parents]] = children[rows, swap]
+        children[rows, swap] = 0
+        return children, parents, moves
+
+    def __call__(self, state, problem=None):
+        boards = statesToArray([state], self.size)
+        return getattr(self, self.heuristic)(boards)[0].item()
+
+    def batchSuccessors(self, states, hs=None):
+        """
+        Expands a group of states in one call: for each state the list of
+        (succ, action, cost, succ_h) tuples, as search expects.
+        """
+        boards = statesToArray(states, self.size)
+        blanks = np.fromiter((state.blank for state in states), dtype=np.int64, count=len(states))
+        children, parents, moves = self.expand(boards, blanks)
+        scores = getattr(self, self.heuristic)(children).tolist()
+        succs = [[] for _ in states]
+        for child, parent, move, h in zip(arrayToStates(children, self.size),
+                                          parents.tolist(), moves.tolist(), scores):
+            succs[parent].append((child, MOVES[move], 1, h))
+        return succs
+
+
+def demoTest(filename="scenarios.csv", copies=1000):
+    """
+    Scores the scenarios 'copies' times over with the batch API and with the
+    scalar heuristics, checks they agree and prints both throughputs.
+    """
+    states = list(readScenarioFile(filename)) * copies
+    batch = BatchHeuristics()
+    start = time.perf_counter()
+    boards = statesToArray(states)
+    vectors = batch.evaluate(boards)
+    batch_time = time.perf_counter() - start
+    scalar = [h1_misplacedTiles, h2_euclideanDistance, h3_manhattanDistance,
+              h4_rowColDifference, h5_linearConflict]
+    start = time.perf_counter()
+    values = [[h(state) for state in states] for h in scalar]
+    scalar_time = time.perf_counter() - start
+    for name, expected in zip(HEURISTIC_NAMES, values):
+        assert np.allclose(vectors[name], expected), name
+    print(f"{len(states)} boards x 5 heuristics: batch {batch_time:.3f}s, "
+          f"scalar {scalar_time:.3f}s ({scalar_time / batch_time:.0f}x)")
+
+if __name__ == "__main__":
+    demoTest()